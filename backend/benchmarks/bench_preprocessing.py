@@ -0,0 +1,54 @@
+"""Compara clean_text/preprocess + token_pattern do sklearn com o tokenize de passada única.
+
+Uso (a partir de backend/):  python -m benchmarks.bench_preprocessing
+"""
+import re
+import timeit
+
+from benchmarks.corpus import EDGE_CASES, SENTENCES, make_corpus
+from benchmarks.harness import save_results
+from src.adapters.nlp.preprocessing import preprocess, tokenize
+
+# token_pattern padrão do TfidfVectorizer, aplicado ao texto já pré-processado
+_SKLEARN_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+
+def legacy_tokenize(text: str) -> list[str]:
+    return _SKLEARN_TOKEN_RE.findall(preprocess(text))
+
+
+def check_equivalence(texts: list[str]) -> None:
+    for t in texts:
+        expected, got = legacy_tokenize(t), tokenize(t)
+        assert got == expected, f"divergência em {t!r}: {got} != {expected}"
+
+
+def bench(label: str, texts: list[str], number: int) -> dict:
+    old = min(timeit.repeat(lambda: [legacy_tokenize(t) for t in texts], number=number, repeat=15))
+    new = min(timeit.repeat(lambda: [tokenize(t) for t in texts], number=number, repeat=15))
+    per_doc = number * len(texts)
+    row = {
+        "name": label,
+        "chars_per_doc": sum(map(len, texts)) // len(texts),
+        "legacy_us": old / per_doc * 1e6,
+        "tokenize_us": new / per_doc * 1e6,
+        "speedup": old / new,
+    }
+    print(
+        f"{row['name']:<8} {row['chars_per_doc']:>9} chars  "
+        f"legado {row['legacy_us']:>9.1f} µs  tokenize {row['tokenize_us']:>9.1f} µs  "
+        f"{row['speedup']:.2f}x"
+    )
+    return row
+
+
+def main() -> list[dict]:
+    short = make_corpus(200, 2)
+    long = make_corpus(10, 800)  # ~100 KB, equivalente a um PDF de várias páginas
+    check_equivalence(EDGE_CASES + SENTENCES + short + long)
+    print("equivalência OK")
+    return [bench("curto", short, 20), bench("longo", long, 2)]
+
+
+if __name__ == "__main__":
+    print(f"resultados em {save_results('preprocessing', main())}")
@@ -0,0 +1,36 @@
+"""Compara duas execuções salvas em JSON.
+
+Uso:  python -m benchmarks.compare benchmarks/results/micro-A.json benchmarks/results/micro-B.json
+"""
+import json
+import sys
+
+
+def _flatten(prefix: str, value, out: dict[str, float]) -> None:
+    if isinstance(value, dict):
+        for k, v in value.items():
+            _flatten(f"{prefix}.{k}" if prefix else str(k), v, out)
+    elif isinstance(value, list):
+        for item in value:
+            # linhas de tabela são identificadas pelo campo "name"
+            key = item.get("name") if isinstance(item, dict) else None
+            if key is not None:
+                _flatten(f"{prefix}.{key}" if prefix else key, item, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = float(value)
+
+
+def main(before_path: str, after_path: str) -> None:
+    before, after = {}, {}
+    _flatten("", json.load(open(before_path, encoding="utf-8"))["results"], before)
+    _flatten("", json.load(open(after_path, encoding="utf-8"))["results"], after)
+    for key in sorted(before.keys() & after.keys()):
+        a, b = before[key], after[key]
+        change = (b - a) / a * 100 if a else 0.0
+        print(f"{key:<70} {a:>12.2f} -> {b:>12.2f}  {change:+7.1f}%")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    main(sys.argv[1], sys.argv[2])
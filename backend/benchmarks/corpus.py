@@ -0,0 +1,94 @@
+"""Corpora sintéticos PT-BR para os benchmarks."""
+import random
+
+SENTENCES = [
+    "Preciso de atualização do chamado 48213 aberto na semana passada.",
+    "Poderiam resetar minha senha? Não consigo acessar o internet banking.",
+    "Segue em anexo o relatório solicitado, conforme combinado na reunião.",
+    "O boleto da fatura de março não chegou no meu email cadastrado.",
+    "Estou enfrentando ERRO 500 ao tentar fazer PIX pelo aplicativo!",
+    "Quando sai a 2ª via da fatura? Preciso pagar até sexta-feira.",
+    "Acesse https://portal.exemplo.com.br/chamados?id=123 para detalhes.",
+    "Mais informações em www.exemplo.com.br/ajuda ou pelo e-mail suporte@exemplo.com.",
+    "Bom dia pessoal, feliz aniversário para a Ana!",
+    "Obrigado pela atenção, vocês são demais.",
+    "Valor: R$ 1.234,56 — vencimento 10/04/2025; contrato nº 998877.",
+    "Atenciosamente,\nJoão da Silva\nGerente Financeiro\tRamal 2231",
+    "Olá,\r\nO sistema está lento hoje... alguém pode verificar?",
+    "ÀS VEZES O LOGIN FALHA E APARECE A MENSAGEM \"SESSÃO EXPIRADA\".",
+    "Vamos tomar um café depois da apresentação? 😊",
+]
+
+EDGE_CASES = [
+    "",
+    "   ",
+    "a",
+    "http",
+    "http ",
+    "www.",
+    "www.x",
+    "abchttp://x def",
+    "awww.exemplo.com fim",
+    "xhttpyhttp://z resto",
+    "HTTP://MAIUSCULO.COM continua",
+    "não, isso é ótimo!",
+    "a.b c.d ab.cd ef,,gh!?ij",
+    "e-mail: fulano@empresa.com.br",
+    "tabs\taqui\te\nquebras\r\nde linha",
+    " espaço não separável",
+    "×÷ ÀÉÎÕÜ ÿþ ª º ß",
+    "1 22 333 4.5 66,7",
+]
+
+
+def make_email(rng: random.Random, n_sentences: int) -> str:
+    return " ".join(rng.choice(SENTENCES) for _ in range(n_sentences))
+
+
+def make_corpus(n: int, n_sentences: int, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    return [make_email(rng, n_sentences) for _ in range(n)]
+
+
+# tamanhos usados pelos micro-benchmarks: nº de frases por email
+SIZES = {"curto": 2, "medio": 20, "longo": 400}
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(n_pages: int, lines_per_page: int = 40, seed: int = 7) -> bytes:
+    """PDF mínimo (Helvetica, WinAnsi) com texto extraível, sem dependências extras."""
+    rng = random.Random(seed)
+    objects: list[bytes] = []
+    page_ids = [3 + 2 * i for i in range(n_pages)]
+    font_id = 3 + 2 * n_pages
+
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {n_pages} >>".encode())
+    for pid in page_ids:
+        lines = [
+            _pdf_escape(rng.choice(SENTENCES).replace("\n", " ").replace("\r", " "))
+            for _ in range(lines_per_page)
+        ]
+        body = "BT /F1 9 Tf 12 TL 40 800 Td " + " ".join(f"({ln}) '" for ln in lines) + " ET"
+        stream = body.encode("cp1252", errors="replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {pid + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{off:010d} 00000 n \n".encode() for off in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
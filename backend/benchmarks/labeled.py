@@ -0,0 +1,67 @@
+"""Conjunto rotulado (categoria + subtipo) para avaliar classificadores; fora dos dados de treino."""
+from src.core.enums.category import Category
+
+P, I = Category.PRODUTIVO, Category.IMPRODUTIVO
+
+LABELED_BENCH = [
+    ("Bom dia, poderiam informar o status do meu chamado 4821? Já faz uma semana.", P, "status"),
+    ("Olá, há alguma atualização sobre a minha solicitação de estorno?", P, "status"),
+    ("Abri um ticket ontem e até agora ninguém respondeu, qual o andamento?", P, "status"),
+    ("Gostaria de acompanhar o protocolo 99812 aberto na central.", P, "status"),
+    ("A portabilidade do salário ainda não foi concluída, qual a previsão?", P, "status"),
+    ("Vocês têm retorno sobre o pedido de revisão do contrato?", P, "status"),
+    ("Prezados, aguardo posição sobre o chamado de troca de titularidade.", P, "status"),
+    ("Qual o prazo para análise da minha proposta de crédito?", P, "status"),
+    ("Esqueci minha senha do internet banking e preciso redefinir.", P, "senha"),
+    ("Não consigo entrar no aplicativo, aparece senha inválida.", P, "senha"),
+    ("Meu acesso foi bloqueado depois de errar a senha três vezes.", P, "senha"),
+    ("Preciso de um reset do login do portal do cliente.", P, "senha"),
+    ("O código de verificação não chega e não consigo acessar a conta.", P, "senha"),
+    ("Como cadastro uma nova senha eletrônica?", P, "senha"),
+    ("Perdi o celular com o token e não consigo logar.", P, "senha"),
+    ("A segunda via do boleto veio com valor errado.", P, "fatura"),
+    ("Gostaria de contestar uma tarifa cobrada indevidamente na fatura.", P, "fatura"),
+    ("O pagamento da fatura de março não foi reconhecido.", P, "fatura"),
+    ("Fui cobrado em duplicidade na compra do dia 12.", P, "fatura"),
+    ("Preciso do boleto atualizado para pagar amanhã.", P, "fatura"),
+    ("Solicito o cancelamento do débito automático da fatura.", P, "fatura"),
+    ("O PIX que enviei ontem foi debitado mas não caiu na conta.", P, "fatura"),
+    ("Segue anexo o comprovante de pagamento da fatura.", P, "anexo"),
+    ("Envio em anexo a documentação pedida para o cadastro.", P, "anexo"),
+    ("Conforme solicitado, segue o arquivo com os extratos.", P, "anexo"),
+    ("Anexo a este email o contrato social atualizado.", P, "anexo"),
+    ("Segue o relatório trimestral para conferência.", P, "anexo"),
+    ("Estou enviando os documentos digitalizados em anexo.", P, "anexo"),
+    ("O sistema apresenta erro 500 ao gerar o relatório.", P, "erro"),
+    ("O aplicativo trava sempre que tento abrir o extrato.", P, "erro"),
+    ("Está dando falha ao concluir a transferência pelo site.", P, "erro"),
+    ("Encontrei um bug na tela de investimentos.", P, "erro"),
+    ("O site está muito lento e cai a conexão.", P, "erro"),
+    ("Depois da atualização o app não abre mais.", P, "erro"),
+    ("Preciso de orientação para abrir uma conta PJ.", P, "geral"),
+    ("Quero solicitar o aumento do limite do cartão.", P, "geral"),
+    ("Podem me enviar informações sobre o seguro residencial?", P, "geral"),
+    ("Gostaria de falar com meu gerente sobre investimentos.", P, "geral"),
+    ("Como faço para solicitar um cartão adicional?", P, "geral"),
+    ("Preciso atualizar meu endereço cadastrado.", P, "geral"),
+    ("Qual a taxa de juros do empréstimo consignado?", P, "geral"),
+    ("vocês são uns incompetentes, que lixo de atendimento", I, "toxico"),
+    ("empresa ridícula, nunca resolvem nada", I, "toxico"),
+    ("odeio esse banco, serviço horrível", I, "toxico"),
+    ("seus idiotas, devolvam meu dinheiro", I, "toxico"),
+    ("que vergonha de empresa, atendimento porcaria", I, "toxico"),
+    ("Feliz ano novo a toda a equipe!", I, "improdutivo"),
+    ("Obrigado pela atenção de sempre, até mais.", I, "improdutivo"),
+    ("Parabéns pelo aniversário da empresa.", I, "improdutivo"),
+    ("Alguém vai ao happy hour na sexta?", I, "improdutivo"),
+    ("Bom fim de semana para todos.", I, "improdutivo"),
+    ("Adorei o bolo de ontem na copa.", I, "improdutivo"),
+    ("Boas festas e um próspero ano novo.", I, "improdutivo"),
+    ("Muito obrigada pelo carinho.", I, "improdutivo"),
+    ("Vi as fotos da viagem, ficaram lindas.", I, "improdutivo"),
+    ("Bom dia, pessoal! Tudo certo por aí?", I, "improdutivo"),
+    ("Parabéns ao time pela conquista do prêmio.", I, "improdutivo"),
+    ("Até amanhã, pessoal.", I, "improdutivo"),
+    ("Que jogo incrível ontem, hein!", I, "improdutivo"),
+    ("Feliz dia dos pais a todos.", I, "improdutivo"),
+]
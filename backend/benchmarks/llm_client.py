@@ -0,0 +1,72 @@
+"""Cliente do provedor de LLM contra o FakeProvider (offline): coalescing, limite de
+concorrência, retries, circuit breaker com fallback para templates e respostas em lote.
+
+Uso (a partir de backend/):  python -m benchmarks.llm_client [--latency-ms 50]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.corpus import make_corpus
+from benchmarks.harness import save_results
+from src.adapters.observability.log import configure_logging
+from src.adapters.reply.client import CircuitBreaker, ProviderClient
+from src.adapters.reply.fake_provider import FakeProvider
+from src.adapters.reply.llm_reply import FallbackReplyGenerator, LLMReplyGenerator
+
+
+async def _burst(gen, items: list[tuple[str, str]]) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(gen.agenerate(cat, text) for cat, text in items))
+    return time.perf_counter() - start
+
+
+def scenario(
+    name: str, latency_ms: float, items, failure_rate: float = 0.0,
+    batch_items: int = 1, item_latency_ms: float = 0.0, drop_rate: float = 0.0, **client_kw,
+) -> dict:
+    provider = FakeProvider(
+        latency_ms=latency_ms, failure_rate=failure_rate, seed=0, item_latency_ms=item_latency_ms, drop_rate=drop_rate,
+    )
+    client = ProviderClient(provider, **client_kw)
+    gen = FallbackReplyGenerator(LLMReplyGenerator(client, batch_max_items=batch_items))
+    elapsed = asyncio.run(_burst(gen, items))
+    client.close()
+    row = {"name": name, "requests": len(items), "elapsed_s": elapsed, "provider_calls": provider.calls,
+           **gen.stats()}
+    print(
+        f"{name:<24} {len(items):>5} req  {elapsed * 1000:>8.1f} ms  chamadas ao provedor {provider.calls:>5}  "
+        f"coalescidas {row['coalesced']:>5}  fallbacks {row['fallbacks']:>4}  "
+        f"circuito {row['breaker']['state']}"
+        + (f"  lote médio {row['batch']['mean_batch']:>4.1f}  refeitos {row['batch']['retried_items']}" if "batch" in row else "")
+    )
+    return row
+
+
+def run(latency_ms: float) -> list[dict]:
+    texts = make_corpus(200, 4)
+    same = [("Produtivo", texts[0])] * 200
+    distinct = [("Produtivo", t) for t in texts]
+    fast_backoff = {"backoff_base": 0.01, "backoff_max": 0.05}
+    return [
+        scenario("identicos", latency_ms, same, max_concurrency=8),
+        scenario("distintos-c8", latency_ms, distinct, max_concurrency=8),
+        scenario("distintos-c32", latency_ms, distinct, max_concurrency=32),
+        scenario("falhas-30%", latency_ms, distinct, failure_rate=0.3, retries=2, max_concurrency=32,
+                 breaker=CircuitBreaker(failure_threshold=1000), **fast_backoff),
+        scenario("provedor-fora", latency_ms, distinct, failure_rate=1.0, retries=2, max_concurrency=32,
+                 breaker=CircuitBreaker(failure_threshold=5, reset_seconds=60), **fast_backoff),
+        # lote: cada email a mais na resposta custa item_latency_ms (tokens de saída)
+        scenario("lote-8-c8", latency_ms, distinct, max_concurrency=8, batch_items=8, item_latency_ms=latency_ms / 4),
+        scenario("lote-8-perdas-10%", latency_ms, distinct, max_concurrency=8, batch_items=8,
+                 item_latency_ms=latency_ms / 4, drop_rate=0.1),
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    configure_logging()
+    rows = run(args.latency_ms)
+    print("resultados em", save_results("llm_client", {"params": vars(args), "runs": rows}))
@@ -0,0 +1,103 @@
+"""Gerador de carga in-process contra create_app(), com gerador de respostas offline.
+
+Uso (a partir de backend/):
+    python -m benchmarks.load --requests 2000 --concurrency 1 16 64 --reply-latency-ms 0
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+import httpx
+
+from benchmarks.corpus import SIZES, make_corpus
+from benchmarks.harness import latency_summary, save_results
+
+
+class StubReplyGenerator:
+    """Substitui o LLM: resposta fixa após uma latência simulada (sem rede)."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+
+    def generate(self, category: str, original_text: str) -> str:
+        time.sleep(self.latency)
+        return f"Resposta simulada ({category})."
+
+    async def agenerate(self, category: str, original_text: str) -> str:
+        await asyncio.sleep(self.latency)
+        return f"Resposta simulada ({category})."
+
+
+def build_app(reply_latency_ms: float):
+    # o provedor é escolhido na criação do app; o stub substitui o gerador em seguida
+    os.environ.setdefault("AI_PROVIDER", "template")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")  # um único cliente gera toda a carga
+    # o corpus repete textos: com o cache, a maior parte da carga nem chegaria ao modelo
+    os.environ.setdefault("RESULT_CACHE_ENABLED", "false")
+    from src.interfaces.api.app_factory import create_app
+
+    app = create_app(load_mode="eager")
+    app.state.uc.reply = StubReplyGenerator(reply_latency_ms)
+    return app
+
+
+async def drive(app, texts: list[str], n_requests: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(n_requests))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker(rng: random.Random) -> None:
+            nonlocal errors
+            for _ in counter:
+                start = time.perf_counter()
+                r = await client.post("/api/process_email", data={"text": rng.choice(texts)})
+                latencies.append(time.perf_counter() - start)
+                if r.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(random.Random(i)) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "name": f"c{concurrency}",
+        "concurrency": concurrency,
+        "requests": n_requests,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": n_requests / elapsed,
+        **latency_summary(latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--size", choices=list(SIZES), default="curto")
+    parser.add_argument("--reply-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    app = build_app(args.reply_latency_ms)
+    texts = make_corpus(64, SIZES[args.size])
+    rows = []
+    for c in args.concurrency:
+        row = asyncio.run(drive(app, texts, args.requests, c))
+        rows.append(row)
+        print(
+            f"concorrência {c:>4}: {row['throughput_rps']:>8.1f} req/s  "
+            f"p50 {row['p50_ms']:>7.2f} ms  p95 {row['p95_ms']:>7.2f} ms  "
+            f"p99 {row['p99_ms']:>7.2f} ms  erros {row['errors']}"
+        )
+    params = {"size": args.size, "reply_latency_ms": args.reply_latency_ms}
+    print(f"resultados em {save_results('load', {'params': params, 'runs': rows})}")
+
+
+if __name__ == "__main__":
+    main()
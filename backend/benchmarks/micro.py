@@ -0,0 +1,66 @@
+"""Micro-benchmarks das funções do caminho quente, sobre corpora PT-BR de vários tamanhos.
+
+Uso (a partir de backend/):  python -m benchmarks.micro [--quick]
+"""
+import argparse
+import tempfile
+
+from benchmarks.corpus import SIZES, make_corpus, make_pdf
+from benchmarks.harness import save_results, time_per_call
+from src.adapters.nlp.preprocessing import clean_text, is_toxic, preprocess, tokenize
+from src.adapters.nlp.sklearn_classifier import SklearnEmailClassifier
+from src.adapters.persistence.local_model_store import LocalModelStore
+from src.adapters.reply.templates import detect_subtype
+from src.core.entities.email import Email
+from src.interfaces.api.routes.email_routes import _read_pdf_bytes
+
+PDF_PAGES = (1, 10, 50)
+
+
+def _row(name: str, size: str, chars: int, fn, min_time: float) -> dict:
+    row = {"name": f"{name}[{size}]", "function": name, "size": size, "chars": chars}
+    row.update(time_per_call(fn, min_time=min_time))
+    print(f"{row['name']:<40} {chars:>8} chars  {row['best_us']:>12.1f} µs")
+    return row
+
+
+def run(quick: bool = False) -> list[dict]:
+    min_time = 0.05 if quick else 0.3
+    classifier = SklearnEmailClassifier(LocalModelStore(tempfile.mkdtemp()))
+    rows: list[dict] = []
+
+    for size, n_sentences in SIZES.items():
+        texts = make_corpus(16, n_sentences)
+        chars = sum(map(len, texts)) // len(texts)
+        it = iter(range(1 << 62))
+
+        def pick() -> str:
+            return texts[next(it) % len(texts)]
+
+        rows.append(_row("clean_text", size, chars, lambda: clean_text(pick()), min_time))
+        rows.append(_row("preprocess", size, chars, lambda: preprocess(pick()), min_time))
+        rows.append(_row("tokenize", size, chars, lambda: tokenize(pick()), min_time))
+        rows.append(_row("is_toxic", size, chars, lambda: is_toxic(pick()), min_time))
+        rows.append(_row("detect_subtype", size, chars, lambda: detect_subtype(pick()), min_time))
+        rows.append(_row(
+            "SklearnEmailClassifier.predict", size, chars,
+            lambda: classifier.predict(Email(text=pick())), min_time,
+        ))
+
+    for pages in PDF_PAGES:
+        data = make_pdf(pages)
+        rows.append(_row("_read_pdf_bytes", f"{pages}p", len(data), lambda: _read_pdf_bytes(data), min_time))
+
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="rodadas curtas (fumaça)")
+    args = parser.parse_args()
+    rows = run(quick=args.quick)
+    print(f"resultados em {save_results('micro', rows)}")
+
+
+if __name__ == "__main__":
+    main()
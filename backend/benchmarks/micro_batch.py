@@ -0,0 +1,70 @@
+"""Vazão por worker de /api/process_email com e sem micro-batching, por nível de concorrência.
+
+Sobe o create_app() in-process (respostas por template, sem cache de resultados) e varia
+MICRO_BATCH_MAX_ITEMS / MICRO_BATCH_MAX_WAIT_MS trocando o MicroBatcher do use case.
+
+Uso (a partir de backend/):  python -m benchmarks.micro_batch [--requests 2000]
+"""
+import argparse
+import asyncio
+import os
+
+from benchmarks.corpus import SIZES, make_corpus
+from benchmarks.harness import environment, save_results
+
+CONFIGS = [("desligado", 1, 0.0), ("64 itens / 0 ms", 64, 0.0), ("64 itens / 2 ms", 64, 2.0), ("64 itens / 5 ms", 64, 5.0)]
+
+
+def build_app():
+    os.environ.setdefault("AI_PROVIDER", "template")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("JOBS_ENABLED", "false")
+    # textos repetidos sairiam do cache sem passar pelo modelo
+    os.environ.setdefault("RESULT_CACHE_ENABLED", "false")
+    from src.interfaces.api.app_factory import create_app
+
+    return create_app(load_mode="eager")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 128])
+    parser.add_argument("--size", choices=list(SIZES), default="curto")
+    args = parser.parse_args()
+
+    app = build_app()
+    # importados depois de build_app: settings lê o ambiente ajustado acima
+    from benchmarks.load import drive
+    from src.adapters.runtime.micro_batch import MicroBatcher
+
+    uc = app.state.uc
+    texts = make_corpus(512, SIZES[args.size])
+
+    async def run_all() -> list[dict]:
+        # um único event loop: os semáforos de estágio ficam presos ao loop em que esperaram
+        rows = []
+        for name, max_items, max_wait_ms in CONFIGS:
+            for c in args.concurrency:
+                uc.batcher = None
+                if max_items > 1:
+                    uc.batcher = MicroBatcher(uc._classify_items, uc._run_ml, max_items=max_items, max_wait_ms=max_wait_ms)
+                row = await drive(app, texts, args.requests, c)
+                row.update(config=name, batching=uc.batcher.stats() if uc.batcher else None)
+                rows.append(row)
+                mean_batch = row["batching"]["mean_batch"] if row["batching"] else 1.0
+                print(
+                    f"{name:<18} c={c:>4}: {row['throughput_rps']:>8.1f} req/s  "
+                    f"p50 {row['p50_ms']:>7.2f} ms  p99 {row['p99_ms']:>7.2f} ms  "
+                    f"lote médio {mean_batch:>5.1f}  erros {row['errors']}"
+                )
+        return rows
+
+    rows = asyncio.run(run_all())
+    params = {"size": args.size, "requests": args.requests}
+    print(f"resultados em {save_results('micro_batch', {'env': environment(), 'params': params, 'runs': rows})}")
+
+
+if __name__ == "__main__":
+    main()
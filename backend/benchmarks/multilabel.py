@@ -0,0 +1,89 @@
+"""Categoria + subtipo: caminho atual em dois passos vs classificador multi-rótulo.
+
+Dois passos: regra de toxicidade + SklearnEmailClassifier (categoria) + varredura de
+palavras-chave para o subtipo. Multi-rótulo: regra de toxicidade + uma vetorização com
+as duas cabeças. Reporta acurácia no conjunto rotulado e latência por email.
+
+Uso (a partir de backend/):  python -m benchmarks.multilabel [--quick]
+"""
+import argparse
+import tempfile
+
+from benchmarks.harness import environment, save_results, time_per_call
+from benchmarks.labeled import LABELED_BENCH
+from src.adapters.nlp.keywords import scan_keywords
+from src.adapters.nlp.multilabel_classifier import MultiLabelEmailClassifier
+from src.adapters.nlp.sklearn_classifier import SklearnEmailClassifier
+from src.adapters.persistence.local_model_store import LocalModelStore
+from src.adapters.reply.templates import reply_subtype
+from src.core.entities.email import Email
+from src.core.enums.category import Category
+
+
+def two_step(classifier: SklearnEmailClassifier):
+    def run(text: str) -> tuple[str, str]:
+        matches = scan_keywords(text)
+        if matches.has("toxic"):
+            return Category.IMPRODUTIVO.value, "toxico"
+        category, _ = classifier.predict(Email(text=text))
+        return category.value, reply_subtype(category.value, matches)
+    return run
+
+
+def multilabel(classifier: MultiLabelEmailClassifier, rule: bool = True):
+    def run(text: str) -> tuple[str, str]:
+        if rule and scan_keywords(text).has("toxic"):
+            return Category.IMPRODUTIVO.value, "toxico"
+        pred = classifier.predict(Email(text=text))
+        return pred[0].value, pred.subtype
+    return run
+
+
+def evaluate(name: str, fn, min_time: float) -> dict:
+    hits_cat = hits_sub = hits_both = 0
+    for text, category, subtype in LABELED_BENCH:
+        cat, sub = fn(text)
+        hits_cat += cat == category.value
+        hits_sub += sub == subtype
+        hits_both += cat == category.value and sub == subtype
+    n = len(LABELED_BENCH)
+    it = iter(range(1 << 62))
+    timing = time_per_call(lambda: fn(LABELED_BENCH[next(it) % n][0]), min_time=min_time)
+    row = {
+        "name": name,
+        "category_accuracy": hits_cat / n,
+        "subtype_accuracy": hits_sub / n,
+        "joint_accuracy": hits_both / n,
+        "us_per_email": timing["best_us"],
+    }
+    print(
+        f"{name:<28} categoria {row['category_accuracy']:.3f}  subtipo {row['subtype_accuracy']:.3f}"
+        f"  ambos {row['joint_accuracy']:.3f}  {row['us_per_email']:>8.1f} µs/email"
+    )
+    return row
+
+
+def run(quick: bool = False) -> dict:
+    min_time = 0.05 if quick else 0.3
+    store = LocalModelStore(tempfile.mkdtemp())
+    binary = SklearnEmailClassifier(store)
+    multi = MultiLabelEmailClassifier(store)
+    print(f"{len(LABELED_BENCH)} emails rotulados")
+    rows = [
+        evaluate("dois passos (atual)", two_step(binary), min_time),
+        evaluate("multi-rótulo + regra", multilabel(multi), min_time),
+        evaluate("multi-rótulo (só modelo)", multilabel(multi, rule=False), min_time),
+    ]
+    return {"env": environment(), "n": len(LABELED_BENCH), "rows": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="rodadas curtas (fumaça)")
+    args = parser.parse_args()
+    results = run(quick=args.quick)
+    print(f"resultados em {save_results('multilabel', results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Latência por chamada do classificador TF-IDF + NB: Pipeline do sklearn vs CompiledNB.
+
+Confere também que as probabilidades são idênticas às de predict_proba.
+
+Uso (a partir de backend/):  python -m benchmarks.predictor [--quick]
+"""
+import argparse
+import tempfile
+
+import numpy as np
+
+from benchmarks.corpus import EDGE_CASES, SIZES, make_corpus
+from benchmarks.harness import environment, save_results, time_per_call
+from src.adapters.nlp.holdout import HOLDOUT
+from src.adapters.nlp.sklearn_classifier import SEED, SklearnEmailClassifier
+from src.adapters.persistence.local_model_store import LocalModelStore
+from src.core.entities.email import Email
+
+BATCH = 64
+
+
+def check_equal(classifier: SklearnEmailClassifier, texts: list[str]) -> float:
+    ref = classifier.pipe.predict_proba(texts)
+    got = classifier.compiled.predict_proba(classifier.compiled.transform(texts))
+    diff = float(np.abs(ref - got).max())
+    print(f"{len(texts)} textos, maior diferença |Pipeline - CompiledNB| = {diff:.3g}")
+    return diff
+
+
+def run(quick: bool = False) -> dict:
+    min_time = 0.05 if quick else 0.3
+    classifier = SklearnEmailClassifier(LocalModelStore(tempfile.mkdtemp()))
+    pipe, compiled = classifier.pipe, classifier.compiled
+
+    texts = [t for t, _ in SEED + HOLDOUT] + EDGE_CASES
+    for n_sentences in SIZES.values():
+        texts += make_corpus(16, n_sentences)
+    max_diff = check_equal(classifier, texts)
+
+    rows = []
+    print(f"{'caso':<24} {'Pipeline µs':>12} {'CompiledNB µs':>14} {'ganho':>7}")
+    for size, n_sentences in SIZES.items():
+        corpus = make_corpus(16, n_sentences)
+        batch = make_corpus(BATCH, n_sentences)
+        it = iter(range(1 << 62))
+
+        def pick() -> str:
+            return corpus[next(it) % len(corpus)]
+
+        cases = {
+            f"1 email[{size}]": (
+                lambda: pipe.predict_proba([pick()]),
+                lambda: compiled.predict_proba([compiled.transform_one(pick())]),
+            ),
+            f"lote {BATCH}[{size}]": (
+                lambda: pipe.predict_proba(batch),
+                lambda: compiled.predict_proba(compiled.transform(batch)),
+            ),
+        }
+        for name, (slow, fast) in cases.items():
+            a = time_per_call(slow, min_time=min_time)["best_us"]
+            b = time_per_call(fast, min_time=min_time)["best_us"]
+            rows.append({"name": name, "pipeline_us": a, "compiled_us": b, "speedup": a / b})
+            print(f"{name:<24} {a:>12.1f} {b:>14.1f} {a / b:>6.1f}x")
+
+    # chamada completa do adaptador (inclui Email, argmax e stage_timer)
+    email = Email(text=make_corpus(1, SIZES["curto"])[0])
+    full = time_per_call(lambda: classifier.predict(email), min_time=min_time)["best_us"]
+    print(f"SklearnEmailClassifier.predict (caminho rápido): {full:.1f} µs")
+    return {"env": environment(), "max_abs_diff": max_diff, "predict_us": full, "rows": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="rodadas curtas (fumaça)")
+    args = parser.parse_args()
+    results = run(quick=args.quick)
+    print(f"resultados em {save_results('predictor', results)}")
+
+
+if __name__ == "__main__":
+    main()
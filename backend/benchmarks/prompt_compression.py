@@ -0,0 +1,80 @@
+"""Compressão extrativa do prompt vs corte em N caracteres, em emails longos sintéticos.
+
+Cada email traz um pedido rotulado (benchmarks.labeled) no meio de texto de preenchimento,
+com ou sem histórico citado e assinatura. Mede tamanho enviado ao LLM, tempo de CPU por
+chamada e em quantos casos o pedido sobrevive ao corte.
+
+Uso (a partir de backend/):  python -m benchmarks.prompt_compression [--emails 200]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.corpus import SENTENCES
+from benchmarks.harness import environment, save_results
+from benchmarks.labeled import LABELED_BENCH
+
+SIGNATURE = "\n\nAtenciosamente,\nMaria Souza\nAnalista Financeira\n(11) 4000-0000\n"
+HISTORY = "\n\nEm seg., 12 de mai. de 2025 às 10:00, Suporte <suporte@exemplo.com> escreveu:\n"
+
+
+def make_case(rng: random.Random, kind: str) -> tuple[str, str]:
+    """(email, frase do pedido)."""
+    request = rng.choice(LABELED_BENCH)[0]
+    filler = [rng.choice(SENTENCES).replace("\n", " ") for _ in range(rng.randint(20, 60))]
+    if kind == "thread":
+        # resposta curta no topo, conversa anterior citada embaixo
+        body = f"Olá, tudo bem?\n{request}\n" + SIGNATURE + HISTORY
+        return body + "\n".join(f"> {s}" for s in filler), request
+    filler.insert(rng.randrange(len(filler)), request)  # pdf: pedido em qualquer posição
+    return " ".join(filler), request
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--emails", type=int, default=200)
+    parser.add_argument("--tokens", type=int, default=None)
+    args = parser.parse_args()
+
+    from src.adapters.nlp.prompt_compression import CHARS_PER_TOKEN, PromptCompressor
+    from src.adapters.nlp.sklearn_classifier import SklearnEmailClassifier
+    from src.adapters.persistence.local_model_store import LocalModelStore
+    from src.config.settings import settings
+
+    tokens = args.tokens or settings.PROMPT_REPLY_TOKENS
+    compressor = PromptCompressor(SklearnEmailClassifier(LocalModelStore()))
+    rng = random.Random(13)
+    rows = []
+    for kind in ("thread", "pdf"):
+        cases = [make_case(rng, kind) for _ in range(args.emails)]
+        for name, fn in (
+            ("corte", lambda t: t[:tokens * CHARS_PER_TOKEN]),
+            ("compressão", lambda t: compressor.compress(t, tokens)),
+        ):
+            start = time.thread_time()
+            outs = [fn(text) for text, _ in cases]
+            cpu = time.thread_time() - start
+            chars_in = sum(len(t) for t, _ in cases)
+            chars_out = sum(len(o) for o in outs)
+            kept = sum(req in out for (_, req), out in zip(cases, outs))
+            row = {
+                "kind": kind,
+                "method": name,
+                "emails": len(cases),
+                "chars_in_mean": chars_in / len(cases),
+                "chars_out_mean": chars_out / len(cases),
+                "ratio": chars_out / chars_in,
+                "cpu_us_per_call": cpu * 1e6 / len(cases),
+                "request_kept": kept / len(cases),
+            }
+            rows.append(row)
+            print(
+                f"{kind:<7} {name:<11} entrada {row['chars_in_mean']:>6.0f} chars  saída {row['chars_out_mean']:>5.0f} chars  "
+                f"razão {row['ratio']:.3f}  CPU {row['cpu_us_per_call']:>6.1f} µs  pedido mantido {row['request_kept']:.0%}"
+            )
+    params = {"emails": args.emails, "tokens": tokens}
+    print(f"resultados em {save_results('prompt_compression', {'env': environment(), 'params': params, 'runs': rows})}")
+
+
+if __name__ == "__main__":
+    main()
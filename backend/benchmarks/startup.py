@@ -0,0 +1,89 @@
+"""Cold start: tempo até /health responder, até /ready, e os imports mais caros.
+
+Cada medição roda num subprocesso novo (sem módulos em cache).
+Uso (a partir de backend/):  python -m benchmarks.startup [--runs N]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.harness import latency_summary, save_results
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_CHILD = r"""
+import json, time
+t0 = time.perf_counter()
+from src.interfaces.api.app_factory import create_app
+t_import = time.perf_counter()
+app = create_app()
+t_app = time.perf_counter()
+app.state.loaded.wait()
+t_ready = time.perf_counter()
+print(json.dumps({
+    "import_s": t_import - t0,
+    "create_app_s": t_app - t0,
+    "ready_s": t_ready - t0,
+    "error": app.state.load_error,
+    "profile": app.state.startup.report(),
+}))
+"""
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _env() -> dict:
+    env = dict(os.environ, PYTHONPATH=str(BACKEND_DIR), LOG_LEVEL="WARNING")
+    env.setdefault("AI_PROVIDER", "template")
+    return env
+
+
+def cold_start() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD], cwd=BACKEND_DIR, env=_env(),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def top_imports(limit: int = 15) -> list[dict]:
+    """Módulos de topo com maior tempo cumulativo segundo `python -X importtime`."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD], cwd=BACKEND_DIR, env=_env(),
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m and len(m.group(3)) <= 1:
+            rows.append({"module": m.group(4), "cumulative_ms": int(m.group(2)) / 1000})
+    rows.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+    return rows[:limit]
+
+
+def run(runs: int = 5) -> dict:
+    samples = [cold_start() for _ in range(runs)]
+    result = {
+        "runs": runs,
+        "ai_provider": _env()["AI_PROVIDER"],
+        "create_app": latency_summary([s["create_app_s"] for s in samples]),
+        "ready": latency_summary([s["ready_s"] for s in samples]),
+        "last_profile": samples[-1]["profile"],
+        "top_imports": top_imports(),
+    }
+    print(f"create_app (até /health): p50 {result['create_app']['p50_ms']:.0f} ms")
+    print(f"modelo pronto (/ready):   p50 {result['ready']['p50_ms']:.0f} ms")
+    for row in result["top_imports"]:
+        print(f"  {row['cumulative_ms']:>8.1f} ms  {row['module']}")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    print("resultados em", save_results("startup", run(args.runs)))
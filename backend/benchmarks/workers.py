@@ -0,0 +1,162 @@
+"""Escalabilidade multi-processo: vazão e memória por worker, de 1 a N workers (gunicorn
+--preload) contra o processo único atual (uvicorn --factory). Servidores reais via HTTP.
+
+Uso (a partir de backend/):
+    python -m benchmarks.workers --workers 1 2 4 --requests 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.corpus import SIZES, make_corpus
+from benchmarks.harness import latency_summary, save_results
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _children(pid: int) -> list[int]:
+    try:
+        return [int(p) for p in Path(f"/proc/{pid}/task/{pid}/children").read_text().split()]
+    except OSError:
+        return []
+
+
+def _smaps(pid: int) -> dict[str, float]:
+    """Rss, Pss e memória privada (MiB) via /proc/<pid>/smaps_rollup (Linux)."""
+    fields = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        key, value = line.split(":", 1)
+        fields[key] = int(value.split()[0]) / 1024
+    return {
+        "rss_mib": fields.get("Rss", 0.0),
+        "pss_mib": fields.get("Pss", 0.0),
+        "private_mib": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+def _command(mode: str, workers: int, port: int) -> list[str]:
+    if mode == "uvicorn":
+        return [
+            sys.executable, "-m", "uvicorn", "src.interfaces.api.app_factory:create_app",
+            "--factory", "--port", str(port), "--log-level", "warning",
+        ]
+    return [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--workers", str(workers)]
+
+
+def start_server(mode: str, workers: int, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ, PYTHONPATH=str(BACKEND_DIR), PORT=str(port),
+        AI_PROVIDER="template", LOG_LEVEL="WARNING", RATE_LIMIT_ENABLED="false",
+    )
+    proc = subprocess.Popen(
+        _command(mode, workers, port), cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/ready", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"servidor {mode} não ficou pronto")
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    proc.send_signal(signal.SIGTERM)
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def memory(proc: subprocess.Popen, mode: str) -> dict:
+    pids = [proc.pid] if mode == "uvicorn" else _children(proc.pid)
+    per_worker = [_smaps(p) for p in pids]
+    out = {
+        "processes": len(pids),
+        "worker_pss_mib": sum(m["pss_mib"] for m in per_worker) / len(per_worker),
+        "worker_private_mib": sum(m["private_mib"] for m in per_worker) / len(per_worker),
+        "worker_rss_mib": sum(m["rss_mib"] for m in per_worker) / len(per_worker),
+        "total_pss_mib": sum(m["pss_mib"] for m in per_worker),
+    }
+    if mode != "uvicorn":
+        out["total_pss_mib"] += _smaps(proc.pid)["pss_mib"]
+    return out
+
+
+async def drive(port: int, texts: list[str], n_requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(n_requests))
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+
+        async def worker(rng: random.Random) -> None:
+            nonlocal errors
+            for _ in counter:
+                start = time.perf_counter()
+                r = await client.post("/api/process_email", data={"text": rng.choice(texts)})
+                latencies.append(time.perf_counter() - start)
+                if r.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(random.Random(i)) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {"requests": n_requests, "errors": errors, "throughput_rps": n_requests / elapsed,
+            **latency_summary(latencies)}
+
+
+def run_one(mode: str, workers: int, port: int, texts: list[str], n_requests: int, concurrency: int) -> dict:
+    proc = start_server(mode, workers, port)
+    try:
+        asyncio.run(drive(port, texts, min(200, n_requests), concurrency))  # aquecimento
+        row = {"name": f"{mode}-w{workers}", "mode": mode, "workers": workers, "concurrency": concurrency}
+        row.update(asyncio.run(drive(port, texts, n_requests, concurrency)))
+        row.update(memory(proc, mode))
+    finally:
+        stop_server(proc)
+    print(
+        f"{row['name']:<14} {row['throughput_rps']:>8.1f} req/s  p95 {row['p95_ms']:>7.2f} ms  "
+        f"PSS/worker {row['worker_pss_mib']:>6.1f} MiB  privada/worker {row['worker_private_mib']:>6.1f} MiB  "
+        f"PSS total {row['total_pss_mib']:>7.1f} MiB"
+    )
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--size", choices=list(SIZES), default="medio")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    texts = make_corpus(64, SIZES[args.size])
+    rows = [run_one("uvicorn", 1, args.port, texts, args.requests, args.concurrency)]
+    for n in args.workers:
+        rows.append(run_one("gunicorn", n, args.port, texts, args.requests, args.concurrency))
+
+    base = rows[0]["throughput_rps"]
+    for row in rows:
+        row["speedup_vs_uvicorn"] = row["throughput_rps"] / base
+    params = {"size": args.size, "requests": args.requests, "concurrency": args.concurrency}
+    print(f"resultados em {save_results('workers', {'params': params, 'runs': rows})}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Modo multi-processo: o mestre carrega o modelo uma vez (--preload) e faz fork dos workers,
+que compartilham as páginas do modelo por copy-on-write.
+
+Uso (a partir de backend/):  gunicorn -c gunicorn.conf.py
+"""
+import gc
+import os
+
+# eager: o modelo precisa estar carregado antes do fork; uma thread de carga no mestre
+# não sobreviveria nos filhos
+wsgi_app = "src.interfaces.api.app_factory:create_app(load_mode='eager')"
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+
+
+def _cpu_count() -> int:
+    # respeita cpuset/affinity do container em vez do total da máquina
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# a inferência é CPU-bound e cada worker já tem seu pool de threads por estágio:
+# um processo por núcleo disponível
+workers = int(os.getenv("WEB_CONCURRENCY", _cpu_count()))
+
+# SIGTERM: para de aceitar conexões e espera as requisições em andamento até graceful_timeout
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", 30))
+timeout = int(os.getenv("WORKER_TIMEOUT", 60))
+keepalive = 5
+
+
+def when_ready(server):
+    # move os objetos do modelo para a geração permanente: o GC dos filhos não os
+    # percorre nem escreve nos cabeçalhos, preservando o compartilhamento das páginas
+    gc.freeze()
+    server.log.info("modelo carregado no mestre; iniciando %s workers", server.cfg.workers)
+
+
+def worker_exit(server, worker):
+    server.log.info("worker %s encerrado", worker.pid)
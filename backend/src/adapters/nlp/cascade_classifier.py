@@ -0,0 +1,189 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Protocol, Sequence, Tuple
+
+from src.adapters.observability.log import get_logger
+from src.config.settings import settings
+from src.core.entities.email import Email
+from src.core.entities.prediction import Prediction, tag_source
+from src.core.enums.category import Category
+from src.core.protocols.classifier import EmailClassifier
+
+
+log = get_logger(__name__)
+
+
+class LLMClassifier(Protocol):
+    def classify(self, raw_text: str) -> tuple[str, float]: ...
+
+
+@dataclass
+class TierStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def as_dict(self) -> dict:
+        mean = self.total_seconds / self.count if self.count else 0.0
+        return {"count": self.count, "mean_ms": mean * 1000, "max_ms": self.max_seconds * 1000}
+
+
+def keep_local(pred: Tuple[Category, float]) -> Prediction:
+    """Predição local mantida no lugar da resposta do LLM (falha, timeout ou sobrecarga)."""
+    return Prediction(
+        pred[0], pred[1], getattr(pred, "subtype", None), getattr(pred, "probabilities", None),
+        degraded=True, source=getattr(pred, "source", None),
+    )
+
+
+class CascadeEmailClassifier:
+    """Responde com o modelo local quando a confiança passa do limiar e só escala
+    os emails ambíguos para o LLM, com timeout e fallback para a predição local."""
+
+    def __init__(
+        self,
+        local: EmailClassifier,
+        llm: LLMClassifier,
+        threshold: float | None = None,
+        timeout: float | None = None,
+        max_workers: int | None = None,
+    ):
+        self.local = local
+        self.llm = llm
+        self.threshold = threshold if threshold is not None else settings.CLASSIFY_CONF_THRESHOLD
+        self.timeout = timeout if timeout is not None else settings.CLASSIFY_LLM_TIMEOUT_SECONDS
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or settings.STAGE_LIMIT_LLM, thread_name_prefix="cascade-llm"
+        )
+        self._lock = threading.Lock()
+        self.tiers = {"local": TierStats(), "llm": TierStats()}
+        self.total = 0
+        self.escalations = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    @property
+    def version(self) -> str | None:
+        return getattr(self.local, "version", None)
+
+    @property
+    def local_source(self) -> str:
+        return getattr(self.local, "source", None) or type(self.local).__name__
+
+    @property
+    def llm_source(self) -> str:
+        return getattr(self.llm, "source", None) or f"llm:{type(self.llm).__name__}"
+
+    # -- fase local (barata, roda no estágio ml) --------------------------------
+
+    def predict_local(self, email: Email) -> Tuple[Category, float]:
+        return self.predict_local_batch([email])[0]
+
+    def predict_local_batch(self, emails: Sequence[Email]) -> list[Tuple[Category, float]]:
+        start = time.perf_counter()
+        source = self.local_source
+        preds = [tag_source(p, source) for p in self.local.predict_batch(emails)]
+        elapsed = (time.perf_counter() - start) / max(len(emails), 1)
+        with self._lock:
+            for _ in emails:
+                self.tiers["local"].observe(elapsed)
+            self.total += len(emails)
+        return preds
+
+    def should_escalate(self, pred: Tuple[Category, float]) -> bool:
+        return pred[1] < self.threshold
+
+    # -- fase LLM (só para a cauda ambígua) -------------------------------------
+
+    def _llm_result(self, raw: tuple[str, float]) -> Tuple[Category, float]:
+        cat, conf = raw
+        return Prediction(Category(cat), float(conf), source=self.llm_source)
+
+    def _record_escalation(self, start: float, outcome: str) -> None:
+        with self._lock:
+            self.escalations += 1
+            self.tiers["llm"].observe(time.perf_counter() - start)
+            if outcome == "timeout":
+                self.timeouts += 1
+            elif outcome == "error":
+                self.errors += 1
+
+    async def aescalate(self, email: Email, pred: Tuple[Category, float]) -> Tuple[Category, float]:
+        if not self.should_escalate(pred):
+            return pred
+        start = time.perf_counter()
+        try:
+            if hasattr(self.llm, "aclassify"):
+                raw = await asyncio.wait_for(self.llm.aclassify(email.text), self.timeout)
+            else:
+                loop = asyncio.get_running_loop()
+                fut = loop.run_in_executor(self._pool, self.llm.classify, email.text)
+                raw = await asyncio.wait_for(fut, self.timeout)
+            result = self._llm_result(raw)
+        except asyncio.TimeoutError:
+            self._record_escalation(start, "timeout")
+            return keep_local(pred)
+        except Exception as e:
+            log.warning("cascade_escalation_failed", error=str(e))
+            self._record_escalation(start, "error")
+            return keep_local(pred)
+        self._record_escalation(start, "ok")
+        return result
+
+    def escalate(self, email: Email, pred: Tuple[Category, float]) -> Tuple[Category, float]:
+        if not self.should_escalate(pred):
+            return pred
+        start = time.perf_counter()
+        return self._await_llm(self._pool.submit(self.llm.classify, email.text), pred, start)
+
+    def _await_llm(self, future, pred: Tuple[Category, float], start: float) -> Tuple[Category, float]:
+        remaining = max(0.0, start + self.timeout - time.perf_counter())
+        try:
+            result = self._llm_result(future.result(timeout=remaining))
+        except FutureTimeout:
+            self._record_escalation(start, "timeout")
+            return keep_local(pred)
+        except Exception as e:
+            log.warning("cascade_escalation_failed", error=str(e))
+            self._record_escalation(start, "error")
+            return keep_local(pred)
+        self._record_escalation(start, "ok")
+        return result
+
+    # -- EmailClassifier --------------------------------------------------------
+
+    def predict(self, email: Email) -> Tuple[Category, float]:
+        return self.escalate(email, self.predict_local(email))
+
+    def predict_batch(self, emails: Sequence[Email]) -> list[Tuple[Category, float]]:
+        preds = self.predict_local_batch(emails)
+        # escalações do lote seguem em paralelo no pool do LLM, com o mesmo prazo
+        start = time.perf_counter()
+        futures = {
+            i: self._pool.submit(self.llm.classify, emails[i].text)
+            for i, p in enumerate(preds)
+            if self.should_escalate(p)
+        }
+        for i, fut in futures.items():
+            preds[i] = self._await_llm(fut, preds[i], start)
+        return preds
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "threshold": self.threshold,
+                "total": self.total,
+                "escalations": self.escalations,
+                "escalation_rate": self.escalations / self.total if self.total else 0.0,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "latency": {tier: s.as_dict() for tier, s in self.tiers.items()},
+            }
@@ -0,0 +1,116 @@
+from typing import Sequence
+
+import numpy as np
+from sklearn.pipeline import Pipeline
+
+from src.adapters.nlp.preprocessing import tokenize
+
+# linha TF-IDF esparsa: (índices de coluna em ordem crescente, pesos já normalizados)
+Row = tuple[np.ndarray, np.ndarray]
+
+_EMPTY = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64))
+
+
+class CompiledNB:
+    """Inferência TF-IDF + MultinomialNB sem o Pipeline do sklearn.
+
+    Guarda o vocabulário num dict e idf / feature_log_prob_ como arrays NumPy, e calcula
+    a posterior direto das contagens de tokens: sem validação por chamada, sem despacho
+    do Pipeline e sem montar uma matriz CSR. Reproduz as mesmas operações, na mesma ordem
+    de acumulação, que TfidfVectorizer(norm="l2", sublinear_tf=False) + predict_proba,
+    então o resultado é idêntico bit a bit (ver benchmarks.predictor).
+
+    Os arrays são guardados como vieram, sem cópia nem transposição: carregados de um
+    artefato, continuam memory-mapped e compartilhados entre os workers via page cache.
+    `feature_log_prob` pode ser uma lista de blocos (n_classes_i, n_features), como as
+    cabeças do classificador multi-rótulo, lidos em sequência como uma matriz só.
+    """
+
+    def __init__(
+        self,
+        vocabulary: dict[str, int],
+        idf: np.ndarray,
+        feature_log_prob: np.ndarray | Sequence[np.ndarray],
+        class_log_prior: np.ndarray,
+        classes: Sequence[str],
+        ngram_range: tuple[int, int] = (1, 2),
+    ):
+        self.vocabulary = vocabulary
+        # asanyarray: sem cópia para float64 (o caso dos artefatos), np.memmap continua memmap
+        self.idf = np.asanyarray(idf, dtype=np.float64)
+        blocks = [feature_log_prob] if isinstance(feature_log_prob, np.ndarray) else feature_log_prob
+        self.blocks = [np.asanyarray(b, dtype=np.float64) for b in blocks]
+        self.prior = np.asarray(class_log_prior, dtype=np.float64)
+        self.classes = list(classes)
+        self.ngram_range = ngram_range
+
+    @classmethod
+    def from_pipeline(cls, pipe: Pipeline) -> "CompiledNB":
+        tfidf, clf = pipe[0], pipe[-1]
+        if tfidf.norm != "l2" or tfidf.sublinear_tf or not tfidf.use_idf or tfidf.binary:
+            raise ValueError("CompiledNB suporta apenas TF-IDF com norm='l2', use_idf e tf linear.")
+        return cls(
+            tfidf.vocabulary_, tfidf.idf_, clf.feature_log_prob_, clf.class_log_prior_,
+            [str(c) for c in clf.classes_], tfidf.ngram_range,
+        )
+
+    def _ngrams(self, tokens: list[str]) -> list[str]:
+        # mesma expansão de TfidfVectorizer._word_ngrams
+        lo, hi = self.ngram_range
+        out = list(tokens) if lo == 1 else []
+        for n in range(max(lo, 2), min(hi, len(tokens)) + 1):
+            out.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return out
+
+    def transform_one(self, text: str) -> Row:
+        vocab = self.vocabulary
+        counts: dict[int, int] = {}
+        for term in self._ngrams(tokenize(text)):
+            j = vocab.get(term)
+            if j is not None:
+                counts[j] = counts.get(j, 0) + 1
+        if not counts:
+            return _EMPTY
+        cols = sorted(counts)
+        idx = np.fromiter(cols, dtype=np.intp, count=len(cols))
+        values = np.fromiter((counts[j] for j in cols), dtype=np.float64, count=len(cols))
+        values *= self.idf[idx]
+        # soma sequencial (cumsum), na mesma ordem de inplace_csr_row_normalize_l2
+        values /= np.sqrt(np.cumsum(values * values)[-1])
+        return idx, values
+
+    def transform(self, texts: Sequence[str]) -> list[Row]:
+        return [self.transform_one(t) for t in texts]
+
+    def _columns(self, idx: np.ndarray) -> np.ndarray:
+        """(len(idx), n_classes): só as colunas dos tokens presentes, lidas das matrizes originais."""
+        if len(self.blocks) == 1:
+            return self.blocks[0][:, idx].T
+        return np.concatenate([b[:, idx] for b in self.blocks]).T
+
+    def joint_log_likelihood(self, rows: Sequence[Row]) -> np.ndarray:
+        jll = np.empty((len(rows), len(self.prior)), dtype=np.float64)
+        for k, (idx, values) in enumerate(rows):
+            # acumulação em ordem de coluna, como o produto CSR x denso do scipy
+            acc = np.cumsum(values[:, None] * self._columns(idx), axis=0)[-1] if len(idx) else 0.0
+            jll[k] = acc + self.prior
+        return jll
+
+    def predict_proba(self, rows: Sequence[Row]) -> np.ndarray:
+        return softmax(self.joint_log_likelihood(rows))
+
+
+def logsumexp(jll: np.ndarray) -> np.ndarray:
+    """Mesma conta de scipy.special.logsumexp (scipy >= 1.15) para entradas finitas, por
+    linha: os máximos ficam fora da soma e entram via log1p. A versão do scipy passa pela
+    camada array-API e custa mais que o resto da inferência numa chamada de um email."""
+    top = jll.max(axis=1, keepdims=True)
+    is_max = jll == top
+    m = is_max.sum(axis=1, keepdims=True, dtype=np.float64)
+    s = np.exp(np.where(is_max, -np.inf, jll) - top).sum(axis=1, keepdims=True)
+    s = np.where(s == 0, s, s / m)
+    return np.log1p(s) + np.log(m) + top
+
+
+def softmax(jll: np.ndarray) -> np.ndarray:
+    return np.exp(jll - logsumexp(jll))
@@ -0,0 +1,35 @@
+from src.core.enums.category import Category
+
+# exemplos rotulados fora do SEED: validação de modelos candidatos antes da troca
+HOLDOUT = [
+    ("Bom dia, poderiam informar o status do meu chamado 4821?", Category.PRODUTIVO),
+    ("Não consigo entrar no aplicativo, aparece erro de senha inválida", Category.PRODUTIVO),
+    ("Segue anexo o comprovante de pagamento da fatura de março", Category.PRODUTIVO),
+    ("A segunda via do boleto veio com valor errado", Category.PRODUTIVO),
+    ("Preciso atualizar meu endereço de cobrança", Category.PRODUTIVO),
+    ("O PIX que enviei ontem ainda não caiu na conta", Category.PRODUTIVO),
+    ("Meu cartão foi recusado na compra online, podem verificar?", Category.PRODUTIVO),
+    ("Gostaria de contestar uma tarifa cobrada indevidamente", Category.PRODUTIVO),
+    ("O sistema apresenta erro 500 ao gerar o relatório", Category.PRODUTIVO),
+    ("Solicito o cancelamento do débito automático", Category.PRODUTIVO),
+    ("Quando será liberado o limite do empréstimo aprovado?", Category.PRODUTIVO),
+    ("Esqueci minha senha do internet banking e preciso redefinir", Category.PRODUTIVO),
+    ("Podem enviar o extrato detalhado do último trimestre?", Category.PRODUTIVO),
+    ("A transferência agendada não foi processada", Category.PRODUTIVO),
+    ("Há alguma atualização sobre a minha solicitação de estorno?", Category.PRODUTIVO),
+    ("Preciso de suporte para configurar o token de segurança", Category.PRODUTIVO),
+    ("Feliz ano novo a toda a equipe!", Category.IMPRODUTIVO),
+    ("Obrigado pela atenção de sempre, até mais", Category.IMPRODUTIVO),
+    ("Parabéns pelo aniversário da empresa", Category.IMPRODUTIVO),
+    ("Alguém vai ao happy hour na sexta?", Category.IMPRODUTIVO),
+    ("Que semana corrida, hein", Category.IMPRODUTIVO),
+    ("Bom fim de semana para todos", Category.IMPRODUTIVO),
+    ("Adorei o bolo de ontem na copa", Category.IMPRODUTIVO),
+    ("Boas festas e um próspero ano novo", Category.IMPRODUTIVO),
+    ("vocês são uns incompetentes", Category.IMPRODUTIVO),
+    ("Muito obrigada pelo carinho", Category.IMPRODUTIVO),
+    ("Vi as fotos da viagem, ficaram lindas", Category.IMPRODUTIVO),
+    ("Bom dia, pessoal! Tudo certo por aí?", Category.IMPRODUTIVO),
+    ("Parabéns ao time pela conquista do prêmio", Category.IMPRODUTIVO),
+    ("Até amanhã, pessoal", Category.IMPRODUTIVO),
+]
@@ -0,0 +1,117 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping
+
+# Léxicos consultados pela regra de toxicidade e pela escolha do template de resposta.
+# A ordem dos subtipos define a prioridade em detect_subtype.
+BAD_WORDS = {
+    "arrombado","idiota","imbecil","merda","lixo","odiar","te odeio",
+    "vai se f*","vai se ferrar","desgraça","otário","otaria","burro","burra"
+    # ajuste conforme necessário
+}
+
+SUBTYPE_KEYWORDS = {
+    "status": ["status", "andamento", "ticket", "chamado"],
+    "senha": ["senha", "reset", "acesso", "login"],
+    "fatura": ["fatura", "boleto", "cobrança", "pagamento", "segunda via", "2ª via"],
+    "anexo": ["anexo", "arquivo", "documento"],
+    "erro": ["erro", "bug", "falha"],
+}
+
+DEFAULT_LEXICONS = {"toxic": sorted(BAD_WORDS), **SUBTYPE_KEYWORDS}
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    lexicon: str
+    keyword: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class KeywordMatches:
+    """Resultado de uma varredura; posições referem-se a text.lower()."""
+    matches: list[KeywordMatch] = field(default_factory=list)
+
+    def has(self, lexicon: str) -> bool:
+        return any(m.lexicon == lexicon for m in self.matches)
+
+    def lexicons(self) -> set[str]:
+        return {m.lexicon for m in self.matches}
+
+    def by_lexicon(self, lexicon: str) -> list[KeywordMatch]:
+        return [m for m in self.matches if m.lexicon == lexicon]
+
+    def first_of(self, lexicons: Iterable[str]) -> str | None:
+        """Primeiro léxico (na ordem dada) com pelo menos uma ocorrência."""
+        found = self.lexicons()
+        return next((lex for lex in lexicons if lex in found), None)
+
+
+class KeywordAutomaton:
+    """Aho–Corasick sobre todos os léxicos: uma única passada, custo linear no
+    tamanho do texto independentemente da quantidade de palavras-chave."""
+
+    def __init__(self, lexicons: Mapping[str, Iterable[str]], whole_word: Iterable[str] = ()):
+        self.whole_word = frozenset(whole_word)
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[tuple[str, str]]] = [[]]
+        for lexicon, keywords in lexicons.items():
+            for kw in keywords:
+                kw = kw.lower()
+                if not kw:
+                    continue
+                state = 0
+                for ch in kw:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        goto.append({})
+                        out.append([])
+                        nxt = len(goto) - 1
+                        goto[state][ch] = nxt
+                    state = nxt
+                out[state].append((lexicon, kw))
+
+        # links de falha em BFS; a tabela de transição final é um DFA completo
+        # (sem seguir links de falha durante a varredura)
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+                queue.append(nxt)
+
+        self._delta = delta
+        self._out = [tuple(o) for o in out]
+
+    def scan(self, text: str) -> KeywordMatches:
+        t = text.lower()
+        delta, out = self._delta, self._out
+        found: list[KeywordMatch] = []
+        state = 0
+        for i, ch in enumerate(t):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for lexicon, kw in out[state]:
+                    start = end - len(kw)
+                    if lexicon in self.whole_word and not _at_word_boundary(t, start, end):
+                        continue
+                    found.append(KeywordMatch(lexicon, kw, start, end))
+        return KeywordMatches(found)
+
+
+def _at_word_boundary(t: str, start: int, end: int) -> bool:
+    return (start == 0 or not t[start - 1].isalnum()) and (end == len(t) or not t[end].isalnum())
+
+
+KEYWORDS = KeywordAutomaton(DEFAULT_LEXICONS)
+
+
+def scan_keywords(text: str) -> KeywordMatches:
+    return KEYWORDS.scan(text)
@@ -0,0 +1,387 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Sequence, Tuple
+
+from src.adapters.nlp.cascade_classifier import TierStats
+from src.adapters.nlp.holdout import HOLDOUT
+from src.adapters.nlp.sklearn_classifier import SklearnEmailClassifier
+from src.adapters.observability.log import get_logger
+from src.config.settings import settings
+from src.core.entities.email import Email
+from src.core.entities.prediction import tag_source
+from src.core.enums.category import Category
+from src.core.protocols.classifier import EmailClassifier
+from src.core.protocols.model_store import ModelStore, RegistryError
+
+log = get_logger(__name__)
+
+# ponteiro com as versões ativa e em sombra, lido por todos os workers
+REGISTRY_POINTER = "registry"
+# no ponteiro: o classificador com que cada worker subiu (motor configurado, sem artefato próprio)
+INITIAL = "initial"
+
+
+@dataclass
+class VersionStats:
+    latency: TierStats = field(default_factory=TierStats)
+    holdout_accuracy: float | None = None
+    # só para a versão em sombra: quantas predições bateram com a versão ativa
+    compared: int = 0
+    agreed: int = 0
+
+    def as_dict(self) -> dict:
+        out = {"latency": self.latency.as_dict(), "holdout_accuracy": self.holdout_accuracy}
+        if self.compared:
+            out["compared"] = self.compared
+            out["agreement"] = self.agreed / self.compared
+        return out
+
+
+def _version_of(clf: EmailClassifier) -> str:
+    return getattr(clf, "version", None) or f"{type(clf).__name__}@{id(clf):x}"
+
+
+def accuracy(clf: EmailClassifier, holdout: Sequence[tuple[str, Category]]) -> float:
+    if not holdout:
+        return 1.0
+    preds = clf.predict_batch([Email(text=t) for t, _ in holdout])
+    return sum(p == c for (p, _), (_, c) in zip(preds, holdout)) / len(holdout)
+
+
+class ModelRegistry:
+    """Versão ativa do classificador local, trocável em produção sem reiniciar o processo.
+
+    Candidatos são carregados do LocalModelStore numa thread própria e validados no holdout
+    antes de entrarem; a troca é a atribuição de uma referência, então predições em
+    andamento terminam na versão antiga e nenhuma leitura espera por lock. No modo sombra
+    o candidato pontua o mesmo tráfego fora do caminho da resposta, para comparação.
+
+    As versões ativa e em sombra são publicadas num ponteiro do store; os outros processos
+    o consultam a cada MODEL_SYNC_SECONDS e adotam a mudança (sem revalidar) numa thread,
+    como o motor online faz com a versão nova.
+    """
+
+    def __init__(
+        self,
+        active: EmailClassifier,
+        store: ModelStore,
+        holdout: Sequence[tuple[str, Category]] = HOLDOUT,
+        min_accuracy: float | None = None,
+        max_regression: float | None = None,
+        shadow_max_pending: int | None = None,
+    ):
+        self.store = store
+        self.holdout = list(holdout)
+        self.min_accuracy = min_accuracy if min_accuracy is not None else settings.MODEL_MIN_ACCURACY
+        self.max_regression = max_regression if max_regression is not None else settings.MODEL_MAX_REGRESSION
+        self.shadow_max_pending = shadow_max_pending or settings.SHADOW_MAX_PENDING
+        self._initial = active
+        self._active = active
+        self._previous: EmailClassifier | None = None
+        self._shadow: EmailClassifier | None = None
+        self._shadow_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-shadow")
+        self._shadow_pending = 0
+        self._lock = threading.Lock()  # só para estatísticas e operações administrativas
+        self._stats: dict[str, VersionStats] = {}
+        self.candidate: dict | None = None
+        self.shadow_dropped = 0
+        self.swaps = 0
+        self.syncs = 0
+        self.sync_error: str | None = None
+        self._applied: dict | None = None  # último ponteiro publicado ou adotado por este processo
+        self._syncing = False
+        self._last_sync = time.monotonic()
+        # um worker que (re)inicia já sobe na versão publicada
+        self.sync(force=True, wait=True)
+
+    @property
+    def active(self) -> EmailClassifier:
+        return self._active
+
+    @property
+    def version(self) -> str | None:
+        return getattr(self._active, "version", None)
+
+    @property
+    def source(self) -> str:
+        return type(self._active).__name__
+
+    def _version_stats(self, version: str) -> VersionStats:
+        stats = self._stats.get(version)
+        if stats is None:
+            stats = self._stats[version] = VersionStats()
+        return stats
+
+    # -- EmailClassifier -----------------------------------------------------
+
+    def predict(self, email: Email) -> Tuple[Category, float]:
+        return self.predict_batch([email])[0]
+
+    def predict_batch(self, emails: Sequence[Email]) -> list[Tuple[Category, float]]:
+        self.sync()
+        active, shadow = self._active, self._shadow
+        start = time.perf_counter()
+        # marca cada predição com o classificador que a fez, mesmo que haja troca logo depois
+        source = type(active).__name__
+        preds = [tag_source(p, source) for p in active.predict_batch(emails)]
+        self._observe(_version_of(active), time.perf_counter() - start, len(emails))
+        if shadow is not None and emails:
+            self._submit_shadow(shadow, list(emails), preds)
+        return preds
+
+    def _prune_stats(self) -> None:
+        """Mantém as estatísticas só das versões ativa, em sombra e anterior."""
+        keep = {_version_of(c) for c in (self._active, self._shadow, self._previous) if c is not None}
+        with self._lock:
+            for version in [v for v in self._stats if v not in keep]:
+                del self._stats[version]
+
+    def _observe(self, version: str, seconds: float, n: int) -> None:
+        per_item = seconds / max(n, 1)
+        with self._lock:
+            latency = self._version_stats(version).latency
+            for _ in range(n):
+                latency.observe(per_item)
+
+    def _submit_shadow(self, shadow: EmailClassifier, emails: list[Email], preds: list) -> None:
+        with self._lock:
+            # sombra atrasada descarta lotes em vez de acumular memória e CPU
+            if self._shadow_pending >= self.shadow_max_pending:
+                self.shadow_dropped += 1
+                return
+            self._shadow_pending += 1
+        self._shadow_pool.submit(self._score_shadow, shadow, emails, [c for c, _ in preds])
+
+    def _score_shadow(self, shadow: EmailClassifier, emails: list[Email], expected: list[Category]) -> None:
+        try:
+            if shadow is not self._shadow:
+                return  # sombra encerrada ou trocada: não recria as estatísticas já podadas
+            start = time.perf_counter()
+            preds = shadow.predict_batch(emails)
+            elapsed = time.perf_counter() - start
+            version = _version_of(shadow)
+            self._observe(version, elapsed, len(emails))
+            with self._lock:
+                stats = self._version_stats(version)
+                stats.compared += len(emails)
+                stats.agreed += sum(p == c for (p, _), c in zip(preds, expected))
+        except Exception as e:
+            log.warning("shadow_predict_failed", error=str(e))
+        finally:
+            with self._lock:
+                self._shadow_pending -= 1
+
+    # -- carga e validação de candidatos -------------------------------------
+
+    def resolve(self, version: str) -> str:
+        """Hash completo a partir de um prefixo (como aparece em /stats e nos logs)."""
+        matches = [m["content_hash"] for m in self.store.list_artifacts() if m["content_hash"].startswith(version)]
+        if not matches:
+            raise RegistryError(f"Versão não encontrada: {version}")
+        if len(set(matches)) > 1:
+            raise RegistryError(f"Prefixo ambíguo: {version}")
+        return matches[0]
+
+    def build(self, content_hash: str) -> EmailClassifier:
+        art = self.store.load_artifact(content_hash)
+        if art is None:
+            raise RegistryError(f"Artefato inválido ou ausente: {content_hash[:16]}")
+        if "subtype_feature_log_prob" in art.arrays:
+            from src.adapters.nlp.multilabel_classifier import MultiLabelEmailClassifier
+            return MultiLabelEmailClassifier.from_artifact(self.store, art)
+        if "vocabulary" not in art.arrays:
+            raise RegistryError("Artefato não suportado pelo registro (apenas TF-IDF + NB).")
+        return SklearnEmailClassifier.from_artifact(self.store, art)
+
+    def validate(self, candidate: EmailClassifier) -> tuple[float, float]:
+        """(acurácia do candidato, acurácia da versão ativa) no holdout."""
+        cand = accuracy(candidate, self.holdout)
+        current = accuracy(self._active, self.holdout)
+        with self._lock:
+            self._version_stats(_version_of(candidate)).holdout_accuracy = cand
+            self._version_stats(_version_of(self._active)).holdout_accuracy = current
+        if cand < self.min_accuracy:
+            raise RegistryError(f"Acurácia no holdout abaixo do mínimo: {cand:.3f} < {self.min_accuracy:.3f}")
+        if cand < current - self.max_regression:
+            raise RegistryError(f"Acurácia no holdout pior que a versão ativa: {cand:.3f} < {current:.3f}")
+        return cand, current
+
+    def load_candidate(self, version: str, mode: str = "shadow") -> dict:
+        """Carrega e valida `version` em background; mode=promote troca ao final, shadow
+        coloca em sombra. O andamento fica em `candidate` (ver stats)."""
+        if mode not in ("shadow", "promote"):
+            raise RegistryError(f"Modo inválido: {mode}")
+        content_hash = self.resolve(version)
+        with self._lock:
+            if self.candidate and self.candidate["state"] in ("loading", "validating"):
+                raise RegistryError("Já existe um candidato em carga.")
+            self.candidate = {"version": content_hash[:16], "mode": mode, "state": "loading", "error": None}
+            status = dict(self.candidate)
+        threading.Thread(
+            target=self._load_candidate, args=(content_hash, mode), name="model-candidate", daemon=True
+        ).start()
+        return status
+
+    def _set_candidate(self, **kw) -> None:
+        with self._lock:
+            self.candidate.update(kw)
+
+    def _load_candidate(self, content_hash: str, mode: str) -> None:
+        try:
+            candidate = self.build(content_hash)
+            self._set_candidate(state="validating")
+            cand, current = self.validate(candidate)
+        except Exception as e:
+            self._set_candidate(state="rejected" if isinstance(e, RegistryError) else "failed", error=str(e))
+            log.warning("model_candidate_rejected", version=content_hash[:16], error=str(e))
+            return
+        try:
+            if mode == "promote":
+                self._swap(candidate)
+            else:
+                self._set_shadow(candidate)
+        except RegistryError as e:
+            self._set_candidate(state="failed", error=str(e))
+            log.warning("model_candidate_rejected", version=content_hash[:16], error=str(e))
+            return
+        self._set_candidate(state="ready", holdout_accuracy=cand, active_accuracy=current)
+        log.info("model_candidate_ready", version=content_hash[:16], accuracy=cand, active_accuracy=current)
+
+    # -- publicação entre processos ------------------------------------------
+
+    def _ref(self, clf: EmailClassifier | None) -> str | None:
+        if clf is None:
+            return None
+        return INITIAL if clf is self._initial else _version_of(clf)
+
+    def _publish(self, active: EmailClassifier, shadow: EmailClassifier | None) -> None:
+        """Grava o ponteiro antes da troca local: se falhar, nenhum processo muda de versão."""
+        pointer = {
+            "engine": type(self._initial).__name__,
+            "active": self._ref(active),
+            "shadow": self._ref(shadow),
+            "published_at": time.time(),
+        }
+        try:
+            self.store.save_pointer(REGISTRY_POINTER, pointer)
+        except Exception as e:
+            log.warning("model_registry_publish_failed", error=str(e))
+            raise RegistryError(f"Falha ao publicar a troca para os outros workers: {e}") from e
+        self._applied = pointer
+
+    def _lookup(self, ref: str | None) -> EmailClassifier | None:
+        if ref is None:
+            return None
+        if ref == INITIAL:
+            return self._initial
+        for clf in (self._active, self._shadow, self._previous):
+            if clf is not None and getattr(clf, "version", None) == ref:
+                return clf
+        return self.build(ref)
+
+    def sync(self, force: bool = False, wait: bool = False) -> None:
+        """Adota as versões publicadas por outro processo; a carga do artefato roda numa
+        thread (wait=True espera, como no início do processo)."""
+        now = time.monotonic()
+        if not force and now - self._last_sync < settings.MODEL_SYNC_SECONDS:
+            return
+        self._last_sync = now
+        pointer = self.store.load_pointer(REGISTRY_POINTER)
+        if not pointer or pointer == self._applied or pointer.get("engine") != type(self._initial).__name__:
+            return
+        with self._lock:
+            if self._syncing:
+                return
+            self._syncing = True
+        if wait:
+            self._adopt(pointer)
+        else:
+            threading.Thread(target=self._adopt, args=(pointer,), name="model-sync", daemon=True).start()
+
+    def _adopt(self, pointer: dict) -> None:
+        try:
+            active = self._lookup(pointer.get("active"))
+            shadow = self._lookup(pointer.get("shadow"))
+        except Exception as e:
+            # marcado como aplicado: uma versão que não carrega não é tentada a cada intervalo
+            self.sync_error = str(e)
+            log.warning("model_sync_failed", active=str(pointer.get("active"))[:16], error=str(e))
+        else:
+            if active is not self._active:
+                self._swap(active, publish=False)
+            self._shadow = shadow
+            self._prune_stats()
+            self.sync_error = None
+            self.syncs += 1
+            log.info("model_synced", active=_version_of(active)[:16])
+        finally:
+            self._applied = pointer
+            with self._lock:
+                self._syncing = False
+
+    # -- troca ---------------------------------------------------------------
+
+    def _swap(self, new: EmailClassifier, publish: bool = True) -> None:
+        shadow = None if self._shadow is new else self._shadow
+        if publish:
+            self._publish(new, shadow)
+        with self._lock:
+            old = self._active
+            self._previous = old
+            self._active = new  # troca atômica: quem já leu a referência antiga termina nela
+            self._shadow = shadow
+            self.swaps += 1
+        self._prune_stats()
+        log.info("model_swapped", old=_version_of(old)[:16], new=_version_of(new)[:16])
+
+    def _set_shadow(self, shadow: EmailClassifier | None) -> None:
+        self._publish(self._active, shadow)
+        self._shadow = shadow
+        self._prune_stats()
+
+    def promote(self) -> str:
+        """Promove a versão em sombra (já validada) a ativa, em todos os workers."""
+        shadow = self._shadow
+        if shadow is None:
+            raise RegistryError("Nenhuma versão em sombra para promover.")
+        self._swap(shadow)
+        return _version_of(shadow)
+
+    def rollback(self) -> str:
+        previous = self._previous
+        if previous is None:
+            raise RegistryError("Nenhuma versão anterior disponível.")
+        self._swap(previous)
+        return _version_of(previous)
+
+    def stop_shadow(self) -> None:
+        self._set_shadow(None)
+
+    def stats(self) -> dict:
+        active, shadow, previous = self._active, self._shadow, self._previous
+        with self._lock:
+            versions = {v[:16]: s.as_dict() for v, s in self._stats.items()}
+            return {
+                "active": _version_of(active)[:16],
+                "shadow": _version_of(shadow)[:16] if shadow is not None else None,
+                "previous": _version_of(previous)[:16] if previous is not None else None,
+                "candidate": dict(self.candidate) if self.candidate else None,
+                "swaps": self.swaps,
+                "syncs": self.syncs,
+                "sync_error": self.sync_error,
+                "shadow_pending": self._shadow_pending,
+                "shadow_dropped": self.shadow_dropped,
+                "versions": versions,
+                **({"engine": active.stats()} if hasattr(active, "stats") else {}),
+            }
+
+
+def find_registry(classifier: EmailClassifier) -> ModelRegistry | None:
+    """Encontra o registro dentro dos wrappers (ex.: cascata -> registro)."""
+    while classifier is not None:
+        if isinstance(classifier, ModelRegistry):
+            return classifier
+        classifier = getattr(classifier, "local", None)
+    return None
@@ -0,0 +1,144 @@
+from typing import Sequence
+import hashlib
+import json
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+from src.core.entities.email import Email
+from src.core.entities.prediction import Prediction
+from src.core.enums.category import Category
+from src.core.protocols.model_store import ModelStore
+from src.adapters.nlp.compiled_nb import CompiledNB, softmax
+from src.adapters.nlp.multilabel_data import LABELED
+from src.adapters.nlp.sklearn_classifier import NB_PARAMS, TFIDF_PARAMS
+from src.adapters.observability.log import get_logger
+from src.adapters.observability.metrics import stage_timer
+from src.adapters.persistence.local_model_store import ModelArtifact
+
+log = get_logger(__name__)
+
+# subtipos (chaves de TEMPLATES) compatíveis com cada categoria
+SUBTYPES = {
+    Category.PRODUTIVO: ("status", "senha", "fatura", "anexo", "erro", "geral"),
+    Category.IMPRODUTIVO: ("improdutivo", "toxico"),
+}
+
+
+def multilabel_hash(data=LABELED) -> str:
+    spec = {
+        "engine": "multilabel",
+        "data": [(t, c.value, s) for t, c, s in data],
+        "tfidf": {
+            k: (f"{v.__module__}.{v.__qualname__}" if callable(v) else v)
+            for k, v in TFIDF_PARAMS.items()
+        },
+        "nb": NB_PARAMS,
+    }
+    payload = json.dumps(spec, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def train_artifact(data=LABELED, content_hash: str | None = None) -> ModelArtifact:
+    """Um TF-IDF ajustado uma vez; as duas cabeças NB treinam sobre a mesma matriz."""
+    tfidf = TfidfVectorizer(**TFIDF_PARAMS)
+    X = tfidf.fit_transform([t for t, _, _ in data])
+    category = MultinomialNB(**NB_PARAMS).fit(X, [c.value for _, c, _ in data])
+    subtype = MultinomialNB(**NB_PARAMS).fit(X, [s for _, _, s in data])
+    terms = np.empty(len(tfidf.vocabulary_), dtype=object)
+    for term, i in tfidf.vocabulary_.items():
+        terms[i] = term
+    return ModelArtifact(
+        content_hash=content_hash or multilabel_hash(data),
+        arrays={
+            "vocabulary": terms.astype(str),
+            "idf": tfidf.idf_,
+            "category_classes": category.classes_.astype(str),
+            "category_feature_log_prob": category.feature_log_prob_,
+            "category_class_log_prior": category.class_log_prior_,
+            "subtype_classes": subtype.classes_.astype(str),
+            "subtype_feature_log_prob": subtype.feature_log_prob_,
+            "subtype_class_log_prior": subtype.class_log_prior_,
+        },
+        meta={"n_samples": len(data), "engine": "multilabel"},
+    )
+
+
+class MultiLabelEmailClassifier:
+    """Categoria e subtipo de resposta numa única vetorização.
+
+    Cada email é tokenizado e ponderado por TF-IDF uma vez; as duas cabeças
+    MultinomialNB (categoria e subtipo) compartilham vocabulário e idf e leem a mesma
+    linha esparsa. O subtipo é o mais provável entre os compatíveis com a categoria
+    prevista, e segue na Prediction para o template não varrer o texto de novo.
+    """
+
+    def __init__(self, store: ModelStore):
+        self.store = store
+        self.version = multilabel_hash()
+        art = store.load_artifact(self.version)
+        if art is None:
+            log.info("multilabel_model_training", samples=len(LABELED))
+            art = train_artifact(content_hash=self.version)
+            try:
+                store.save_artifact(art)
+            except Exception as e:
+                log.warning("model_save_failed", error=str(e))
+        else:
+            log.info("multilabel_model_loaded", version=self.version[:16])
+        self._set_heads(art)
+
+    @classmethod
+    def from_artifact(cls, store: ModelStore, art: ModelArtifact) -> "MultiLabelEmailClassifier":
+        self = cls.__new__(cls)
+        self.store = store
+        self.version = art.content_hash
+        self._set_heads(art)
+        return self
+
+    def _set_heads(self, art: ModelArtifact) -> None:
+        a = art.arrays
+        self.categories = [str(c) for c in a["category_classes"]]
+        self.subtypes = [str(c) for c in a["subtype_classes"]]
+        # as duas cabeças empilhadas: uma única acumulação por email, depois um softmax
+        # por cabeça (as colunas são independentes, o resultado por cabeça não muda)
+        self.heads = CompiledNB(
+            {str(t): i for i, t in enumerate(a["vocabulary"])},
+            a["idf"],
+            [a["category_feature_log_prob"], a["subtype_feature_log_prob"]],
+            np.concatenate([a["category_class_log_prior"], a["subtype_class_log_prior"]]),
+            self.categories + self.subtypes,
+            TFIDF_PARAMS["ngram_range"],
+        )
+        sub_index = {s: j for j, s in enumerate(self.subtypes)}
+        # máscara (categoria x subtipo) para a decodificação conjunta
+        self._allowed = np.zeros((len(self.categories), len(self.subtypes)), dtype=bool)
+        for i, cat in enumerate(self.categories):
+            for s in SUBTYPES[Category(cat)]:
+                if s in sub_index:
+                    self._allowed[i, sub_index[s]] = True
+
+    def predict(self, email: Email) -> Prediction:
+        return self.predict_batch([email])[0]
+
+    def predict_batch(self, emails: Sequence[Email]) -> list[Prediction]:
+        if not emails:
+            return []
+        with stage_timer("vectorize"):
+            rows = self.heads.transform([e.text for e in emails])
+        with stage_timer("predict"):
+            jll = self.heads.joint_log_likelihood(rows)
+            n_cat = len(self.categories)
+            p_cat = softmax(jll[:, :n_cat])
+            p_sub = softmax(jll[:, n_cat:])
+        cat_idx = p_cat.argmax(axis=1)
+        sub_idx = np.where(self._allowed[cat_idx], p_sub, -1.0).argmax(axis=1)
+        labels = self.categories + self.subtypes
+        proba = np.hstack([p_cat, p_sub]).tolist()
+        return [
+            Prediction(
+                Category(self.categories[c]), proba[k][c], self.subtypes[s], dict(zip(labels, proba[k])),
+            )
+            for k, (c, s) in enumerate(zip(cat_idx.tolist(), sub_idx.tolist()))
+        ]
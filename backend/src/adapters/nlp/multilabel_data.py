@@ -0,0 +1,118 @@
+from src.core.enums.category import Category
+
+P, I = Category.PRODUTIVO, Category.IMPRODUTIVO
+
+# (texto, categoria, subtipo): o subtipo é a chave de TEMPLATES usada na resposta
+LABELED = [
+    # status
+    ("Preciso de atualização do chamado", P, "status"),
+    ("Status do projeto", P, "status"),
+    ("Minha transferência não foi processada", P, "status"),
+    ("Qual o andamento do meu pedido?", P, "status"),
+    ("Alguma novidade sobre o ticket que abri semana passada?", P, "status"),
+    ("Gostaria de saber em que pé está minha solicitação", P, "status"),
+    ("O chamado 3321 continua sem resposta", P, "status"),
+    ("Podem informar a previsão de conclusão do atendimento?", P, "status"),
+    ("Ainda aguardo retorno sobre o protocolo aberto", P, "status"),
+    ("Quando minha portabilidade será concluída?", P, "status"),
+    # senha
+    ("Poderiam resetar minha senha", P, "senha"),
+    ("Não consigo acessar minha conta", P, "senha"),
+    ("Esqueci a senha do aplicativo", P, "senha"),
+    ("Meu usuário está bloqueado após várias tentativas de login", P, "senha"),
+    ("Preciso redefinir o acesso ao internet banking", P, "senha"),
+    ("O token de acesso expirou e não consigo entrar", P, "senha"),
+    ("Como faço para trocar minha senha?", P, "senha"),
+    ("Perdi o acesso ao email cadastrado e não recebo o código", P, "senha"),
+    ("Minha senha não é aceita no portal", P, "senha"),
+    # fatura
+    ("Problema com pagamentos", P, "fatura"),
+    ("Problema com transação", P, "fatura"),
+    ("Consulta sobre faturamento", P, "fatura"),
+    ("O boleto não chegou", P, "fatura"),
+    ("Quando sai a segunda via da fatura", P, "fatura"),
+    ("Preciso cancelar uma transação", P, "fatura"),
+    ("Não recebi o comprovante por email", P, "fatura"),
+    ("Como faço para contestar uma cobrança", P, "fatura"),
+    ("Minha conta foi debitada indevidamente", P, "fatura"),
+    ("A fatura veio com um valor maior que o esperado", P, "fatura"),
+    ("Paguei o boleto mas continua em aberto", P, "fatura"),
+    ("Fui cobrado duas vezes pela mesma compra", P, "fatura"),
+    ("Preciso da 2ª via do boleto com nova data de vencimento", P, "fatura"),
+    # anexo
+    ("Segue em anexo o relatório solicitado", P, "anexo"),
+    ("Relatório mensal", P, "anexo"),
+    ("Envio em anexo os documentos para análise", P, "anexo"),
+    ("Segue o arquivo com a planilha atualizada", P, "anexo"),
+    ("Anexei o contrato assinado conforme pedido", P, "anexo"),
+    ("Encaminho os comprovantes de residência em anexo", P, "anexo"),
+    ("Mando em anexo as notas fiscais do mês", P, "anexo"),
+    ("O documento solicitado está anexado a este email", P, "anexo"),
+    # erro
+    ("Estou enfrentando problemas com o sistema", P, "erro"),
+    ("Erro no sistema de login", P, "erro"),
+    ("Bug no aplicativo", P, "erro"),
+    ("O sistema está lento hoje", P, "erro"),
+    ("O aplicativo está travando", P, "erro"),
+    ("Não consigo fazer PIX", P, "erro"),
+    ("Aparece uma mensagem de falha ao gerar o extrato", P, "erro"),
+    ("O site retorna erro 500 ao finalizar a operação", P, "erro"),
+    ("A tela fica em branco depois da atualização", P, "erro"),
+    ("O app fecha sozinho quando abro o cartão virtual", P, "erro"),
+    # geral
+    ("Preciso de ajuda urgente", P, "geral"),
+    ("Solicitação de suporte técnico", P, "geral"),
+    ("Solicitação de informações", P, "geral"),
+    ("Atualização de dados", P, "geral"),
+    ("Meu cartão foi bloqueado", P, "geral"),
+    ("Como altero meus dados cadastrais", P, "geral"),
+    ("Preciso de uma declaração de imposto de renda", P, "geral"),
+    ("Preciso falar com um gerente", P, "geral"),
+    ("Meu limite foi reduzido sem aviso", P, "geral"),
+    ("Preciso de ajuda com o internet banking", P, "geral"),
+    ("O atendimento presencial está funcionando", P, "geral"),
+    ("Preciso de orientação sobre investimentos", P, "geral"),
+    ("Como solicito um empréstimo", P, "geral"),
+    ("Quero aumentar o limite do cartão", P, "geral"),
+    ("Qual o horário de funcionamento da agência?", P, "geral"),
+    # tóxico
+    ("eu te odeio", I, "toxico"),
+    ("seu atendimento é uma porcaria", I, "toxico"),
+    ("vocês são uns idiotas", I, "toxico"),
+    ("vai se ferrer", I, "toxico"),
+    ("lixo de empresa", I, "toxico"),
+    ("empresa ridícula, equipe incompetente", I, "toxico"),
+    ("que serviço horrível, vergonha", I, "toxico"),
+    ("vocês não servem para nada", I, "toxico"),
+    # improdutivo
+    ("obrigado!", I, "improdutivo"),
+    ("feliz natal", I, "improdutivo"),
+    ("feliz aniversário", I, "improdutivo"),
+    ("bom dia pessoal", I, "improdutivo"),
+    ("como vocês estão", I, "improdutivo"),
+    ("parabéns pelo trabalho", I, "improdutivo"),
+    ("vamos almoçar juntos", I, "improdutivo"),
+    ("fim de semana bom", I, "improdutivo"),
+    ("conversa de corredor", I, "improdutivo"),
+    ("mensagem de cumprimento", I, "improdutivo"),
+    ("oi tudo bem", I, "improdutivo"),
+    ("que calor hoje", I, "improdutivo"),
+    ("viu o jogo ontem", I, "improdutivo"),
+    ("bom final de semana", I, "improdutivo"),
+    ("feliz dia das mães", I, "improdutivo"),
+    ("parabéns pela promoção", I, "improdutivo"),
+    ("adoro trabalhar aqui", I, "improdutivo"),
+    ("vocês são demais", I, "improdutivo"),
+    ("que equipe incrível", I, "improdutivo"),
+    ("até segunda pessoal", I, "improdutivo"),
+    ("boa sorte na apresentação", I, "improdutivo"),
+    ("muito obrigado por tudo", I, "improdutivo"),
+    ("adorei a festa de ontem", I, "improdutivo"),
+    ("vamos tomar um café", I, "improdutivo"),
+    ("que dia lindo hoje", I, "improdutivo"),
+    ("estou de férias na praia", I, "improdutivo"),
+    ("minha filha nasceu", I, "improdutivo"),
+    ("comprei um carro novo", I, "improdutivo"),
+    ("vou me casar mês que vem", I, "improdutivo"),
+    ("ganhei na loteria", I, "improdutivo"),
+]
@@ -0,0 +1,290 @@
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+import hashlib
+import json
+import threading
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+from src.core.entities.email import Email
+from src.core.enums.category import Category
+from src.core.protocols.model_store import ModelStore, ModelStoreError
+from src.adapters.nlp.preprocessing import tokenize
+from src.adapters.nlp.sklearn_classifier import NB_PARAMS, SEED
+from src.adapters.observability.log import get_logger
+from src.adapters.observability.metrics import stage_timer
+from src.adapters.persistence.local_model_store import ModelArtifact
+from src.config.settings import settings
+
+log = get_logger(__name__)
+
+HEAD_POINTER = "online-head"
+CLASSES = [c.value for c in Category]
+
+# sem vocabulário ajustado: o espaço de features é fixo e novos termos não exigem refit
+HASHING_PARAMS = {
+    "tokenizer": tokenize,
+    "lowercase": False,
+    "token_pattern": None,
+    "ngram_range": (1, 2),
+    "alternate_sign": False,  # MultinomialNB exige features não negativas
+    "norm": "l2",
+}
+
+
+def base_hash(n_features: int, seed=SEED) -> str:
+    """Identifica o modelo inicial (SEED + hiperparâmetros); versões online descendem dele."""
+    spec = {
+        "engine": "online",
+        "seed": [(t, c.value) for t, c in seed],
+        "hashing": {
+            k: (f"{v.__module__}.{v.__qualname__}" if callable(v) else v)
+            for k, v in HASHING_PARAMS.items()
+        },
+        "n_features": n_features,
+        "nb": NB_PARAMS,
+    }
+    payload = json.dumps(spec, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _next_version(parent: str, examples: Sequence[tuple[str, Category]]) -> str:
+    payload = json.dumps([parent, [(t, c.value) for t, c in examples]], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _finish(clf: MultinomialNB) -> MultinomialNB:
+    # log-probabilidades derivadas das contagens, como MultinomialNB faz após partial_fit
+    smoothed = clf.feature_count_ + clf.alpha
+    clf.feature_log_prob_ = np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))
+    clf.class_log_prior_ = np.log(clf.class_count_) - np.log(clf.class_count_.sum())
+    return clf
+
+
+def _clone(clf: MultinomialNB) -> MultinomialNB:
+    """Cópia com contagens próprias: o modelo servindo nunca é alterado no lugar."""
+    out = MultinomialNB(**NB_PARAMS)
+    out.classes_ = clf.classes_
+    out.class_count_ = np.array(clf.class_count_, dtype=np.float64)
+    out.feature_count_ = np.array(clf.feature_count_, dtype=np.float64)
+    out.n_features_in_ = clf.n_features_in_
+    return _finish(out)
+
+
+def clf_to_artifact(clf: MultinomialNB, content_hash: str, meta: dict) -> ModelArtifact:
+    # só as contagens são gravadas; as log-probabilidades são recalculadas ao carregar
+    return ModelArtifact(
+        content_hash=content_hash,
+        arrays={
+            "classes": clf.classes_.astype(str),
+            "class_count": clf.class_count_,
+            "feature_count": clf.feature_count_,
+        },
+        meta=meta,
+    )
+
+
+def clf_from_artifact(art: ModelArtifact) -> MultinomialNB:
+    a = art.arrays
+    clf = MultinomialNB(**NB_PARAMS)
+    clf.classes_ = np.asarray(a["classes"], dtype=object)
+    clf.class_count_ = np.asarray(a["class_count"])
+    clf.feature_count_ = np.asarray(a["feature_count"])
+    clf.n_features_in_ = clf.feature_count_.shape[1]
+    return _finish(clf)
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    clf: MultinomialNB
+    version: str
+    n_samples: int
+
+
+class OnlineEmailClassifier:
+    """HashingVectorizer + MultinomialNB atualizado por partial_fit.
+
+    Cada lote de feedback gera uma nova versão a partir da atual (custo proporcional aos
+    exemplos novos, não ao corpus), gravada no LocalModelStore e publicada num ponteiro.
+    As predições leem um snapshot imutável, trocado por atribuição: sem pausa nem lock
+    para o tráfego. Outros processos adotam a versão nova em até ONLINE_SYNC_SECONDS,
+    carregada numa thread (como no ModelRegistry), fora do caminho das predições.
+    """
+
+    def __init__(self, store: ModelStore, n_features: int | None = None):
+        self.store = store
+        self.n_features = n_features or settings.ONLINE_N_FEATURES
+        self.base = base_hash(self.n_features)
+        self.vectorizer = HashingVectorizer(n_features=self.n_features, **HASHING_PARAMS)
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._syncing = False
+        self._last_sync = time.monotonic()
+        self.syncs = 0
+        self._snapshot = self._load_head() or self._load_or_train_base()
+        self.updates = 0
+        self.learned = 0
+
+    @property
+    def version(self) -> str:
+        return self._snapshot.version
+
+    @property
+    def n_samples(self) -> int:
+        return self._snapshot.n_samples
+
+    # -- persistência --------------------------------------------------------
+
+    def _load(self, content_hash: str) -> _Snapshot | None:
+        art = self.store.load_artifact(content_hash)
+        if art is None:
+            return None
+        return _Snapshot(clf_from_artifact(art), content_hash, int(art.meta.get("n_samples", 0)))
+
+    def _load_head(self) -> _Snapshot | None:
+        pointer = self.store.load_pointer(HEAD_POINTER)
+        if not pointer or pointer.get("base") != self.base:
+            return None
+        snap = self._load(pointer["head"])
+        if snap is not None:
+            log.info("online_model_loaded", version=snap.version[:16], samples=snap.n_samples)
+        return snap
+
+    def _load_or_train_base(self) -> _Snapshot:
+        snap = self._load(self.base)
+        if snap is None:
+            log.info("online_model_training", samples=len(SEED))
+            clf = MultinomialNB(**NB_PARAMS)
+            clf.partial_fit(
+                self.vectorizer.transform([t for t, _ in SEED]),
+                [c.value for _, c in SEED],
+                classes=CLASSES,
+            )
+            snap = _Snapshot(clf, self.base, len(SEED))
+            try:
+                self._persist(snap, parent=None)
+            except ModelStoreError:
+                pass  # o modelo base é determinístico: serve da memória e é regravado no próximo início
+        return snap
+
+    def _persist(self, snap: _Snapshot, parent: str | None) -> None:
+        """Grava o artefato e publica o ponteiro; ModelStoreError se algum dos dois falhar."""
+        try:
+            meta = {"n_samples": snap.n_samples, "parent": parent, "engine": "online"}
+            self.store.save_artifact(clf_to_artifact(snap.clf, snap.version, meta))
+            pointer = self.store.load_pointer(HEAD_POINTER) or {}
+            history = pointer.get("history", []) if pointer.get("base") == self.base else []
+            history = [snap.version] + [h for h in history if h != snap.version]
+            keep = max(1, settings.ONLINE_KEEP_VERSIONS)
+            self.store.save_pointer(HEAD_POINTER, {"base": self.base, "head": snap.version, "history": history[:keep]})
+        except Exception as e:
+            log.warning("online_model_save_failed", error=str(e))
+            raise ModelStoreError(f"Falha ao gravar a versão {snap.version[:16]} do modelo online.") from e
+        # o modelo base fica sempre; versões antigas além do histórico são removidas.
+        # a versão nova já está publicada: falhar aqui só deixa lixo no disco
+        for old in history[keep:]:
+            if old != self.base:
+                try:
+                    self.store.delete_artifact(old)
+                except Exception as e:
+                    log.warning("online_model_prune_failed", version=old[:16], error=str(e))
+
+    def _published(self) -> str | None:
+        """Versão no ponteiro, se for outra que não a servida por este processo."""
+        pointer = self.store.load_pointer(HEAD_POINTER)
+        if not pointer or pointer.get("base") != self.base or pointer.get("head") == self.version:
+            return None
+        return pointer["head"]
+
+    def sync(self, force: bool = False, wait: bool = False) -> None:
+        """Adota a versão publicada por outro processo, se houver uma mais nova. A carga do
+        artefato roda numa thread (wait=True espera)."""
+        now = time.monotonic()
+        if not force and now - self._last_sync < settings.ONLINE_SYNC_SECONDS:
+            return
+        self._last_sync = now
+        head = self._published()
+        if head is None:
+            return
+        with self._lock:
+            if self._syncing:
+                return
+            self._syncing = True
+        if wait:
+            self._adopt(head)
+        else:
+            threading.Thread(target=self._adopt, args=(head,), name="online-sync", daemon=True).start()
+
+    def _adopt(self, head: str) -> None:
+        try:
+            snap = self._load(head)
+            if snap is None:
+                return
+            with self._write_lock:
+                # um learn() deste processo pode ter publicado outra versão durante a carga
+                if self._published() != head:
+                    return
+                self._snapshot = snap
+                self.syncs += 1
+            log.info("online_model_synced", version=snap.version[:16])
+        except Exception as e:
+            log.warning("online_model_sync_failed", version=head[:16], error=str(e))
+        finally:
+            with self._lock:
+                self._syncing = False
+
+    # -- aprendizado ---------------------------------------------------------
+
+    def learn(self, examples: Sequence[tuple[str, Category]]) -> str:
+        """Aplica exemplos rotulados sobre a versão atual e publica a nova versão.
+        Se a gravação falhar, levanta ModelStoreError e o snapshot atual segue servindo."""
+        if not examples:
+            return self.version
+        X = self.vectorizer.transform([t for t, _ in examples])
+        y = [c.value for _, c in examples]
+        with self._write_lock, self.store.lock(HEAD_POINTER):
+            # parte da versão publicada (talvez por outro worker), carregada aqui mesmo
+            head = self._published()
+            base = (self._load(head) if head is not None else None) or self._snapshot
+            clf = _clone(base.clf)
+            clf.partial_fit(X, y)
+            snap = _Snapshot(clf, _next_version(base.version, examples), base.n_samples + len(examples))
+            self._persist(snap, parent=base.version)
+            # só depois de publicada; troca atômica: predições em andamento seguem no snapshot anterior
+            self._snapshot = snap
+            self.updates += 1
+            self.learned += len(examples)
+        log.info("online_model_updated", version=snap.version[:16], examples=len(examples), samples=snap.n_samples)
+        return snap.version
+
+    # -- EmailClassifier -----------------------------------------------------
+
+    def predict(self, email: Email) -> Tuple[Category, float]:
+        return self.predict_batch([email])[0]
+
+    def predict_batch(self, emails: Sequence[Email]) -> list[Tuple[Category, float]]:
+        if not emails:
+            return []
+        self.sync()
+        snap = self._snapshot
+        with stage_timer("vectorize"):
+            X = self.vectorizer.transform([e.text for e in emails])
+        with stage_timer("predict"):
+            proba = snap.clf.predict_proba(X)
+        classes = snap.clf.classes_
+        idx = proba.argmax(axis=1)
+        conf = proba[range(len(emails)), idx]
+        return [(Category(classes[i]), float(c)) for i, c in zip(idx, conf)]
+
+    def stats(self) -> dict:
+        return {
+            "engine": "online",
+            "version": self.version[:16],
+            "samples": self.n_samples,
+            "updates": self.updates,
+            "learned": self.learned,
+            "syncs": self.syncs,
+        }
@@ -1,5 +1,7 @@
 import re
 
+from src.adapters.nlp.keywords import BAD_WORDS, scan_keywords
+
 # Stopwords em português hardcoded para evitar download no Render
 STOPWORDS_PT = {
     'a', 'ao', 'aos', 'aquela', 'aquelas', 'aquele', 'aqueles', 'aquilo', 'as', 'até', 'com', 'como', 'da', 'das', 'do', 'dos', 'e', 'ela', 'elas', 'ele', 'eles', 'em', 'entre', 'era', 'eram', 'essa', 'essas', 'esse', 'esses', 'esta', 'estamos', 'estas', 'estava', 'estavam', 'este', 'esteja', 'estejam', 'estejamos', 'estes', 'esteve', 'estive', 'estivemos', 'estiver', 'estivera', 'estiveram', 'estiverem', 'estivermos', 'estivesse', 'estivessem', 'estivéramos', 'estivéssemos', 'estou', 'está', 'estão', 'eu', 'foi', 'fomos', 'for', 'fora', 'foram', 'forem', 'formos', 'fosse', 'fossem', 'fui', 'fôramos', 'fôssemos', 'haja', 'hajam', 'hajamos', 'havemos', 'havia', 'hei', 'houve', 'houvemos', 'houver', 'houvera', 'houveram', 'houverei', 'houverem', 'houveremos', 'houveria', 'houveriam', 'houveríamos', 'houverão', 'houverá', 'houveríamos', 'houvesse', 'houvessem', 'houvéramos', 'houvéssemos', 'há', 'hão', 'isso', 'isto', 'já', 'lhe', 'lhes', 'mais', 'mas', 'me', 'mesmo', 'meu', 'meus', 'minha', 'minhas', 'muito', 'na', 'nas', 'nem', 'no', 'nos', 'nossa', 'nossas', 'nosso', 'nossos', 'num', 'numa', 'não', 'nós', 'o', 'os', 'ou', 'para', 'pela', 'pelas', 'pelo', 'pelos', 'por', 'qual', 'quando', 'que', 'quem', 'se', 'seja', 'sejam', 'sejamos', 'sem', 'ser', 'seria', 'seriam', 'será', 'serão', 'seríamos', 'seu', 'seus', 'sua', 'suas', 'são', 'só', 'sua', 'suas', 'também', 'te', 'tem', 'temos', 'tenha', 'tenham', 'tenhamos', 'tenho', 'ter', 'terei', 'teremos', 'teria', 'teriam', 'terá', 'terão', 'teríamos', 'teve', 'tinha', 'tinham', 'tive', 'tivemos', 'tiver', 'tivera', 'tiveram', 'tiverem', 'tivermos', 'tivesse', 'tivessem', 'tivéramos', 'tivéssemos', 'tu', 'tua', 'tuas', 'tém', 'tínhamos', 'um', 'uma', 'você', 'vocês', 'vos', 'à', 'às', 'éramos'
@@ -15,16 +17,35 @@ def clean_text(text: str) -> str:
 def preprocess(text: str) -> str:
     text = clean_text(text).lower()
     tokens = [t for t in text.split() if t not in STOPWORDS_PT]
-    result = " ".join(tokens)
-    print(f"Preprocessing: '{text[:50]}...' -> '{result[:50]}...'")
-    return result
+    return " ".join(tokens)
 
-BAD_WORDS = {
-    "arrombado","idiota","imbecil","merda","lixo","odiar","te odeio",
-    "vai se f*","vai se ferrar","desgraça","otário","otaria","burro","burra"
-    # ajuste conforme necessário
-}
+# Separadores de palavra em uma única regex: URLs (removidas) e qualquer caractere
+# fora do conjunto aceito por clean_text. Como uma URL (\S+) sempre termina em
+# espaço ou no fim do texto, remover a URL nunca junta duas palavras.
+_WORD_SPLIT_RE = re.compile(r"http\S+|www\.\S+|[^A-Za-zÀ-ÖØ-öø-ÿ0-9@.,!?]+")
+_PUNCT_RE = re.compile(r"[@.,!?]+")
+_PUNCT_CHARS = frozenset("@.,!?")
+
+def tokenize(text: str) -> list[str]:
+    """Equivale a aplicar o token_pattern padrão do sklearn sobre preprocess(text),
+    sem montar a string intermediária."""
+    tokens: list[str] = []
+    append = tokens.append
+    for word in _WORD_SPLIT_RE.split(text):
+        if not word:
+            continue
+        word = word.lower()
+        if word in STOPWORDS_PT:
+            continue
+        if _PUNCT_CHARS.isdisjoint(word):
+            if len(word) > 1:
+                append(word)
+            continue
+        # pontuação quebra a palavra como o \b\w\w+\b do TfidfVectorizer
+        for piece in _PUNCT_RE.split(word):
+            if len(piece) > 1:
+                append(piece)
+    return tokens
 
 def is_toxic(text: str) -> bool:
-    t = text.lower()
-    return any(w in t for w in BAD_WORDS)
\ No newline at end of file
+    return scan_keywords(text).has("toxic")
@@ -0,0 +1,230 @@
+import math
+import re
+import threading
+import time
+from typing import Sequence
+
+from src.adapters.nlp.preprocessing import tokenize
+from src.adapters.observability.metrics import stage_timer
+from src.config.settings import settings
+from src.core.protocols.classifier import EmailClassifier
+
+# aproximação de tokens de LLM para português
+CHARS_PER_TOKEN = 4
+# marca os trechos omitidos entre frases mantidas
+GAP = "(...)"
+# frases maiores (ex.: PDF sem pontuação) viram pedaços, para o ranking ter granularidade
+MAX_SENTENCE_CHARS = 400
+# assinatura: fecho seguido de no máximo estas linhas (nome, cargo, telefone)
+SIGNATURE_MAX_LINES = 6
+
+# início da conversa anterior: tudo dali para baixo é histórico citado. Só cabeçalhos de
+# resposta de verdade: "Em <data>, <remetente> escreveu:" (com número e dois-pontos) ou o
+# separador de mensagem original/encaminhada
+_HISTORY_RE = re.compile(
+    r"^\s*(?:em\s[^\n]{0,80}\d[^\n]{0,80},[^\n]{1,160}escreveu\s*:"
+    r"|on\s[^\n]{0,80}\d[^\n]{0,80},?[^\n]{1,160}wrote\s*:"
+    r"|-{2,}\s*(?:mensagem original|original message|mensagem encaminhada|forwarded message)\s*-*)\s*$",
+    re.IGNORECASE,
+)
+# bloco de cabeçalhos do Outlook: "De:" seguido logo abaixo de Para/Assunto/Enviado...
+_FROM_RE = re.compile(r"^\s*(?:de|from)\s*:\s*\S", re.IGNORECASE)
+_HEADER_RE = re.compile(
+    r"^\s*(?:para|to|cc|assunto|subject|enviad[oa]|sent|data|date)\s*:", re.IGNORECASE
+)
+# linhas seguintes ao "De:" onde procurar os demais cabeçalhos
+HEADER_LOOKAHEAD = 3
+# cabeçalhos são curtos: linhas maiores nem passam pelas regexes
+MAX_HEADER_CHARS = 300
+_SIGNATURE_RE = re.compile(r"^\s*(?:--|_{3,}|enviado do meu .*|sent from my .*)\s*$", re.IGNORECASE)
+_CLOSING_RE = re.compile(
+    r"^\s*(?:atenciosamente|att\.?|at\.te|abraços?|cordialmente|saudações|grat[oa]|obrigad[oa]s?"
+    r"|best regards|regards)\s*[,.!]?\s*$",
+    re.IGNORECASE,
+)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def idf_table(classifier: EmailClassifier | None) -> tuple[dict[str, int], Sequence[float]] | None:
+    """Vocabulário e idf do TF-IDF em uso, atravessando os wrappers (cascata -> registro).
+    Resolvido a cada chamada: uma troca de modelo no registro vale para a próxima."""
+    while classifier is not None:
+        model = getattr(classifier, "compiled", None) or getattr(classifier, "heads", None)
+        if model is not None:
+            return model.vocabulary, model.idf
+        pipe = getattr(classifier, "pipe", None)
+        if pipe is not None:
+            return pipe[0].vocabulary_, pipe[0].idf_
+        classifier = getattr(classifier, "local", None) or getattr(classifier, "active", None)
+    return None  # ex.: motor online (HashingVectorizer, sem idf)
+
+
+def _history_start(lines: list[str], i: int) -> bool:
+    line = lines[i]
+    if len(line) > MAX_HEADER_CHARS:
+        return False
+    if _HISTORY_RE.match(line):
+        return True
+    if not _FROM_RE.match(line):
+        return False
+    following = [nxt for nxt in lines[i + 1:i + 1 + HEADER_LOOKAHEAD * 2] if nxt.strip()]
+    return any(_HEADER_RE.match(nxt) for nxt in following[:HEADER_LOOKAHEAD])
+
+
+def strip_quoted(text: str) -> tuple[str, bool, bool]:
+    """(corpo, removeu histórico, removeu assinatura)."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    body: list[str] = []
+    history = False
+    for i, line in enumerate(lines):
+        if line.lstrip().startswith(">"):
+            history = True
+            continue
+        # um cabeçalho no topo é o próprio email (ex.: encaminhado sem comentário), não histórico
+        if any(b.strip() for b in body) and _history_start(lines, i):
+            history = True
+            break
+        body.append(line)
+    signature = False
+    for i, line in enumerate(body):
+        if _SIGNATURE_RE.match(line) or (
+            _CLOSING_RE.match(line) and len(body) - i - 1 <= SIGNATURE_MAX_LINES
+        ):
+            body = body[:i]
+            signature = True
+            break
+    return "\n".join(body), history, signature
+
+
+def split_sentences(text: str) -> list[str]:
+    """Frases na ordem original, sem repetições (citações e PDFs repetem trechos)."""
+    out: list[str] = []
+    seen: set[str] = set()
+    for piece in _SENTENCE_RE.split(text):
+        piece = _SPACE_RE.sub(" ", piece).strip()
+        while len(piece) > MAX_SENTENCE_CHARS:
+            cut = piece.rfind(" ", 0, MAX_SENTENCE_CHARS)
+            cut = cut if cut > 0 else MAX_SENTENCE_CHARS
+            _add(out, seen, piece[:cut])
+            piece = piece[cut:].lstrip()
+        if piece:
+            _add(out, seen, piece)
+    return out
+
+
+def _add(out: list[str], seen: set[str], sentence: str) -> None:
+    key = sentence.lower()
+    if key not in seen:
+        seen.add(key)
+        out.append(sentence)
+
+
+class PromptCompressor:
+    """Compressão extrativa do email antes de ir para o LLM.
+
+    Remove o histórico citado e a assinatura e, se o texto ainda passar do orçamento,
+    mantém as frases de maior peso TF-IDF (soma do idf dos termos distintos do vocabulário
+    ajustado, normalizada pela raiz do tamanho), na ordem original. Substitui o corte
+    cego em N caracteres, que partia frases e perdia o que vinha depois do corte.
+    A entrada é limitada a TEXT_CHAR_BUDGET caracteres antes de tudo, como na extração de
+    uploads: o custo de CPU não cresce com textos colados de centenas de KB.
+    """
+
+    def __init__(self, classifier: EmailClassifier | None = None, max_chars: int | None = None):
+        self.classifier = classifier
+        self.max_chars = max_chars or settings.TEXT_CHAR_BUDGET
+        # peso dos termos fora do vocabulário, calculado uma vez por idf (troca de modelo recalcula)
+        self._unknown: tuple[object, float] | None = None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.chars_in = 0
+        self.chars_out = 0
+        self.ranked = 0
+        self.history_dropped = 0
+        self.signature_dropped = 0
+        self.cpu_seconds = 0.0
+
+    def _unknown_weight(self, idf: Sequence[float]) -> float:
+        # termo fora do vocabulário ainda pesa um pouco (números de chamado, nomes de produto)
+        cached = self._unknown
+        if cached is not None and cached[0] is idf:
+            return cached[1]
+        weight = float(min(idf)) / 2 if len(idf) else 1.0
+        self._unknown = (idf, weight)
+        return weight
+
+    def _weights(self, sentences: list[str]) -> list[float]:
+        table = idf_table(self.classifier)
+        vocab, idf = table if table is not None else ({}, ())
+        unknown = self._unknown_weight(idf)
+        scores = []
+        for sentence in sentences:
+            tokens = tokenize(sentence)
+            if not tokens:
+                scores.append(0.0)
+                continue
+            weight = 0.0
+            for term in set(tokens):
+                j = vocab.get(term)
+                weight += idf[j] if j is not None else unknown
+            scores.append(weight / math.sqrt(len(tokens)))
+        return scores
+
+    def _select(self, sentences: list[str], budget: int) -> str:
+        scores = self._weights(sentences)
+        chosen: list[int] = []
+        used = 0
+        for i in sorted(range(len(sentences)), key=lambda i: (-scores[i], i)):
+            cost = len(sentences[i]) + len(GAP) + 2
+            if used + cost <= budget:
+                chosen.append(i)
+                used += cost
+        if not chosen:
+            return sentences[0][:budget]
+        chosen.sort()
+        parts = [GAP] if chosen[0] else []
+        for k, i in enumerate(chosen):
+            if k and i != chosen[k - 1] + 1:
+                parts.append(GAP)
+            parts.append(sentences[i])
+        if chosen[-1] != len(sentences) - 1:
+            parts.append(GAP)
+        return " ".join(parts)
+
+    def compress(self, text: str, max_tokens: int) -> str:
+        start = time.thread_time()
+        chars_in = len(text)
+        with stage_timer("prompt_compression"):
+            budget = max_tokens * CHARS_PER_TOKEN
+            text = text[:self.max_chars]
+            body, history, signature = strip_quoted(text)
+            if not body.strip():
+                body, history, signature = text, False, False  # só havia citação: fica o original
+            sentences = split_sentences(body)
+            compact = " ".join(sentences)
+            ranked = len(compact) > budget
+            out = self._select(sentences, budget) if ranked else compact
+        elapsed = time.thread_time() - start
+        with self._lock:
+            self.calls += 1
+            self.chars_in += chars_in
+            self.chars_out += len(out)
+            self.ranked += ranked
+            self.history_dropped += history
+            self.signature_dropped += signature
+            self.cpu_seconds += elapsed
+        return out
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "chars_in": self.chars_in,
+                "chars_out": self.chars_out,
+                "ratio": self.chars_out / self.chars_in if self.chars_in else 1.0,
+                "ranked": self.ranked,
+                "history_dropped": self.history_dropped,
+                "signature_dropped": self.signature_dropped,
+                "cpu_ms_per_call": self.cpu_seconds * 1000 / self.calls if self.calls else 0.0,
+            }
@@ -1,4 +1,8 @@
-from typing import Tuple
+from typing import Sequence, Tuple
+import hashlib
+import json
+
+import numpy as np
 from sklearn.pipeline import Pipeline
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
@@ -6,7 +10,14 @@ from sklearn.naive_bayes import MultinomialNB
 from src.core.entities.email import Email
 from src.core.enums.category import Category
 from src.core.protocols.model_store import ModelStore
-from src.adapters.nlp.preprocessing import preprocess
+from src.adapters.nlp.compiled_nb import CompiledNB
+from src.adapters.nlp.preprocessing import tokenize
+from src.adapters.observability.log import get_logger
+from src.adapters.observability.metrics import stage_timer
+from src.adapters.persistence.local_model_store import ModelArtifact
+from src.config.settings import settings
+
+log = get_logger(__name__)
 
 # dataset semente para inicializar
 SEED = [
@@ -85,37 +96,138 @@ SEED = [
     ("ganhei na loteria", Category.IMPRODUTIVO),
 ]
 
+# tokenize já normaliza o texto; lowercase/token_pattern do sklearn seriam retrabalho
+TFIDF_PARAMS = {
+    "tokenizer": tokenize,
+    "lowercase": False,
+    "token_pattern": None,
+    "ngram_range": (1, 2),
+    "min_df": 1,
+}
+NB_PARAMS: dict = {}
+
+
+def training_hash(seed=SEED) -> str:
+    """Hash do conteúdo de treino + hiperparâmetros; muda quando o modelo precisa ser retreinado."""
+    spec = {
+        "seed": [(t, c.value) for t, c in seed],
+        "tfidf": {
+            k: (f"{v.__module__}.{v.__qualname__}" if callable(v) else v)
+            for k, v in TFIDF_PARAMS.items()
+        },
+        "nb": NB_PARAMS,
+    }
+    payload = json.dumps(spec, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def train_pipeline(examples=SEED) -> Pipeline:
+    pipe = Pipeline([
+        ("tfidf", TfidfVectorizer(**TFIDF_PARAMS)),
+        ("clf", MultinomialNB(**NB_PARAMS)),
+    ])
+    pipe.fit([t for t, _ in examples], [c.value for _, c in examples])
+    return pipe
+
+
+def pipeline_to_artifact(pipe: Pipeline, content_hash: str) -> ModelArtifact:
+    tfidf: TfidfVectorizer = pipe.named_steps["tfidf"]
+    clf: MultinomialNB = pipe.named_steps["clf"]
+    terms = np.empty(len(tfidf.vocabulary_), dtype=object)
+    for term, i in tfidf.vocabulary_.items():
+        terms[i] = term
+    return ModelArtifact(
+        content_hash=content_hash,
+        arrays={
+            "classes": clf.classes_.astype(str),
+            "vocabulary": terms.astype(str),
+            "idf": tfidf.idf_,
+            "feature_log_prob": clf.feature_log_prob_,
+            "class_log_prior": clf.class_log_prior_,
+        },
+        meta={"n_samples": int(clf.class_count_.sum())},
+    )
+
+
+def pipeline_from_artifact(art: ModelArtifact) -> Pipeline:
+    a = art.arrays
+    # vocabulário fixo e idf pela API pública: sem fit e sem atributos privados do sklearn
+    tfidf = TfidfVectorizer(vocabulary={str(t): i for i, t in enumerate(a["vocabulary"])}, **TFIDF_PARAMS)
+    tfidf.idf_ = a["idf"]
+
+    clf = MultinomialNB(**NB_PARAMS)
+    clf.classes_ = np.asarray(a["classes"], dtype=object)
+    clf.feature_log_prob_ = a["feature_log_prob"]
+    clf.class_log_prior_ = a["class_log_prior"]
+    clf.n_features_in_ = a["feature_log_prob"].shape[1]
+    return Pipeline([("tfidf", tfidf), ("clf", clf)])
+
+
 class SklearnEmailClassifier:
     def __init__(self, store: ModelStore):
         self.store = store
         self.pipe: Pipeline | None = None
+        self.compiled: CompiledNB | None = None
+        self.version: str | None = None
         self._load_or_train()
 
-    def _build(self) -> Pipeline:
-        return Pipeline([
-            ("tfidf", TfidfVectorizer(preprocessor=preprocess, ngram_range=(1,2), min_df=1)),
-            ("clf", MultinomialNB()),
-        ])
+    @classmethod
+    def from_artifact(cls, store: ModelStore, art: ModelArtifact) -> "SklearnEmailClassifier":
+        """Classificador fixo numa versão já gravada (usado pelo ModelRegistry)."""
+        self = cls.__new__(cls)
+        self.store = store
+        self._set_pipeline(pipeline_from_artifact(art))
+        self.version = art.content_hash
+        return self
 
-    def _load_or_train(self):
-        print("Iniciando treinamento do modelo...")
-        # Sempre treinar em memória para evitar problemas de arquivo
-        X = [t for t, _ in SEED]
-        y = [c.value for _, c in SEED]
-        pipe = self._build()
-        pipe.fit(X, y)
+    def _set_pipeline(self, pipe: Pipeline) -> None:
         self.pipe = pipe
-        print("Modelo treinado em memória com sucesso")
+        self.compiled = CompiledNB.from_pipeline(pipe) if settings.CLASSIFIER_FAST_PATH else None
+
+    def _load_or_train(self):
+        content_hash = training_hash()
+        art = self.store.load_artifact(content_hash)
+        if art is not None:
+            self._set_pipeline(pipeline_from_artifact(art))
+            self.version = content_hash
+            log.info("model_loaded", version=content_hash[:16])
+            return
+
+        log.info("model_training", samples=len(SEED))
+        pipe = train_pipeline(SEED)
+        self._set_pipeline(pipe)
+        self.version = content_hash
+        try:
+            path = self.store.save_artifact(pipeline_to_artifact(pipe, content_hash))
+            log.info("model_saved", version=content_hash[:16], path=str(path))
+        except Exception as e:
+            # sem disco gravável o modelo continua servindo da memória
+            log.warning("model_save_failed", error=str(e))
 
     def predict(self, email: Email) -> Tuple[Category, float]:
-        print(f"Predicting for: '{email.text[:50]}...'")
+        return self.predict_batch([email])[0]
+
+    def predict_batch(self, emails: Sequence[Email]) -> list[Tuple[Category, float]]:
+        if not emails:
+            return []
         if self.pipe is None:
-            print("Pipeline is None!")
-            return Category.IMPRODUTIVO, 0.5
-        
-        proba = self.pipe.predict_proba([email.text])[0]
+            log.warning("pipeline_not_loaded")
+            return [(Category.IMPRODUTIVO, 0.5) for _ in emails]
+
+        texts = [e.text for e in emails]
+        if self.compiled is not None:
+            # caminho rápido: mesmas contas do Pipeline, sem validação nem matriz CSR
+            with stage_timer("vectorize"):
+                rows = self.compiled.transform(texts)
+            with stage_timer("predict"):
+                proba = self.compiled.predict_proba(rows)
+        else:
+            # um único transform + predict_proba para o lote inteiro
+            with stage_timer("vectorize"):
+                X = self.pipe[:-1].transform(texts)
+            with stage_timer("predict"):
+                proba = self.pipe[-1].predict_proba(X)
         classes = self.pipe.classes_
-        idx = proba.argmax()
-        result = Category(classes[idx]), float(proba[idx])
-        print(f"Prediction result: {result}")
-        return result
+        idx = proba.argmax(axis=1)
+        conf = proba[range(len(emails)), idx]
+        return [(Category(classes[i]), float(c)) for i, c in zip(idx, conf)]
@@ -0,0 +1,88 @@
+"""Logging estruturado (JSON), com nível e amostragem; custo ~zero quando desabilitado."""
+import json
+import logging
+import random
+import sys
+import time
+from typing import Any
+
+from src.config.settings import settings
+
+ROOT_LOGGER = "src"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(f"{k}={v}" for k, v in getattr(record, "fields", {}).items())
+        base = f"{time.strftime('%H:%M:%S', time.localtime(record.created))} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        out = f"{base} {fields}" if fields else base
+        if record.exc_info:
+            out += "\n" + self.formatException(record.exc_info)
+        return out
+
+
+class StructuredLogger:
+    """debug/info passam por amostragem (LOG_SAMPLE_RATE); warning/error sempre saem.
+
+    O nível é checado antes de qualquer formatação, então chamadas abaixo do nível
+    configurado custam só uma comparação.
+    """
+
+    __slots__ = ("_logger", "sample_rate")
+
+    def __init__(self, name: str, sample_rate: float | None = None):
+        self._logger = logging.getLogger(name)
+        self.sample_rate = settings.LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self._logger.isEnabledFor(level)
+
+    def _emit(self, level: int, event: str, fields: dict, exc_info: bool = False) -> None:
+        self._logger.log(level, event, extra={"fields": fields}, exc_info=exc_info)
+
+    def debug(self, event: str, **fields: Any) -> None:
+        if self._logger.isEnabledFor(logging.DEBUG) and random.random() < self.sample_rate:
+            self._emit(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields: Any) -> None:
+        if self._logger.isEnabledFor(logging.INFO) and random.random() < self.sample_rate:
+            self._emit(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields: Any) -> None:
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._emit(logging.WARNING, event, fields)
+
+    def error(self, event: str, **fields: Any) -> None:
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._emit(logging.ERROR, event, fields)
+
+    def exception(self, event: str, **fields: Any) -> None:
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._emit(logging.ERROR, event, fields, exc_info=True)
+
+
+def get_logger(name: str, sample_rate: float | None = None) -> StructuredLogger:
+    return StructuredLogger(name, sample_rate)
+
+
+def configure_logging(level: str | None = None, fmt: str | None = None) -> None:
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel((level or settings.LOG_LEVEL).upper())
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if (fmt or settings.LOG_FORMAT) == "json" else TextFormatter())
+    root.handlers = [handler]
+    root.propagate = False
@@ -0,0 +1,209 @@
+"""Métricas no formato de exposição de texto do Prometheus, sem dependências externas."""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _fmt_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_fmt_labels(self.labelnames, k)} {v}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    @contextmanager
+    def track(self, **labels: str) -> Iterator[None]:
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # por série: contagens por bucket (não cumulativas), soma, total
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][i] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(c), s[0]) for k, (c, s) in self._series.items()]
+        lines = self.header()
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _fmt_labels(self.labelnames, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: dict[str, Callable[[], Iterable[tuple[str, str, float, dict]]]] = {}
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (), **kw) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, **kw))
+
+    def add_collector(self, key: str, fn: Callable[[], Iterable[tuple[str, str, float, dict]]]) -> None:
+        """fn() devolve amostras (nome, tipo, valor, labels) calculadas na hora do scrape.
+        Registrar de novo a mesma chave substitui o coletor anterior."""
+        self._collectors[key] = fn
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        seen: set[str] = set()
+        for fn in self._collectors.values():
+            for name, kind, value, labels in fn():
+                if name not in seen:
+                    lines.append(f"# TYPE {name} {kind}")
+                    seen.add(name)
+                names = tuple(labels)
+                lines.append(f"{name}{_fmt_labels(names, tuple(labels[n] for n in names))} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "email_stage_seconds",
+    "Latência por estágio do pipeline de classificação.",
+    ["stage"],
+)
+CLASSIFICATIONS = REGISTRY.counter(
+    "email_classifications_total", "Classificações por origem da decisão.", ["classify_source"]
+)
+REPLIES = REGISTRY.counter("email_replies_total", "Respostas geradas por gerador.", ["reply_source"])
+IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "Requisições HTTP em andamento.")
+
+
+def stage_timer(stage: str):
+    return STAGE_SECONDS.time(stage=stage)
+
+
+def stats_samples(
+    prefix: str, stats: dict, labels: dict[str, str] | None = None
+) -> list[tuple[str, str, float, dict]]:
+    """Achata o dict de stats() de um componente em gauges (apenas valores numéricos).
+
+    labels: chaves cujos filhos têm nomes dinâmicos (ex.: {"versions": "version"}); cada
+    filho vira um valor de label em vez de parte do nome, para não criar uma métrica nova
+    por versão.
+    """
+    labels = labels or {}
+    out: list[tuple[str, str, float, dict]] = []
+
+    def walk(path: list[str], value, tags: dict, label: str | None = None) -> None:
+        if isinstance(value, dict):
+            for k, v in value.items():
+                if label is not None:
+                    walk(path, v, {**tags, label: str(k)})
+                else:
+                    walk(path + [str(k)], v, tags, labels.get(str(k)))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            name = "_".join([prefix, *path]).replace("-", "_").replace(".", "_")
+            out.append((name, "gauge", float(value), tags))
+
+    walk([], stats, {})
+    return out
@@ -0,0 +1,37 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class StartupProfile:
+    """Tempo de import e de inicialização de cada componente, desde create_app()."""
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self.steps: list[dict] = []
+        self.ready_ms: float | None = None
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000
+
+    @contextmanager
+    def step(self, kind: str, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append({
+                "kind": kind,
+                "name": name,
+                "ms": round((time.perf_counter() - start) * 1000, 2),
+                "at_ms": round(self._elapsed_ms(), 2),
+            })
+
+    def mark(self, name: str) -> None:
+        self.steps.append({"kind": "mark", "name": name, "at_ms": round(self._elapsed_ms(), 2)})
+
+    def mark_ready(self) -> None:
+        self.ready_ms = round(self._elapsed_ms(), 2)
+
+    def report(self) -> dict:
+        return {"ready_after_ms": self.ready_ms, "steps": list(self.steps)}
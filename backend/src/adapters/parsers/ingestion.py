@@ -0,0 +1,93 @@
+import codecs
+from typing import BinaryIO, Iterator
+
+from src.config.settings import settings
+
+
+class UnsupportedFormat(ValueError):
+    pass
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class InvalidDocument(ValueError):
+    pass
+
+
+def iter_pdf_pages(fileobj: BinaryIO, max_pages: int | None = None) -> Iterator[str]:
+    """Extrai o texto página a página; páginas não pedidas nunca são processadas."""
+    # pypdf só é importado quando o primeiro PDF chega
+    from pypdf import PdfReader
+    from pypdf.errors import PyPdfError
+
+    try:
+        reader = PdfReader(fileobj)
+        for i, page in enumerate(reader.pages):
+            if max_pages is not None and i >= max_pages:
+                return
+            yield page.extract_text() or ""
+    except PyPdfError as e:
+        raise InvalidDocument(str(e)) from e
+
+
+def extract_pdf_text(
+    fileobj: BinaryIO, char_budget: int | None = None, max_pages: int | None = None
+) -> str:
+    parts: list[str] = []
+    total = 0
+    for text in iter_pdf_pages(fileobj, max_pages):
+        parts.append(text)
+        total += len(text) + 1
+        if char_budget is not None and total >= char_budget:
+            break
+    out = "\n".join(parts).strip()
+    return out[:char_budget] if char_budget is not None else out
+
+
+def read_txt(fileobj: BinaryIO, char_budget: int | None = None, chunk_size: int | None = None) -> str:
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_BYTES
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    parts: list[str] = []
+    total = 0
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            parts.append(decoder.decode(b"", final=True))
+            break
+        text = decoder.decode(chunk)
+        parts.append(text)
+        total += len(text)
+        if char_budget is not None and total >= char_budget:
+            break
+    out = "".join(parts)
+    return out[:char_budget] if char_budget is not None else out
+
+
+SUPPORTED_EXTENSIONS = (".txt", ".pdf")
+
+
+def ensure_supported(filename: str | None) -> None:
+    if not (filename or "").lower().endswith(SUPPORTED_EXTENSIONS):
+        raise UnsupportedFormat("Formato não suportado. Use .txt ou .pdf.")
+
+
+def read_upload_text(
+    fileobj: BinaryIO,
+    filename: str,
+    size: int | None = None,
+    char_budget: int | None = None,
+    max_pages: int | None = None,
+) -> str:
+    """Lê um upload já em disco/spool (.txt ou .pdf) até o orçamento de caracteres."""
+    if size is not None and size > settings.MAX_UPLOAD_BYTES:
+        raise UploadTooLarge(f"Arquivo excede o limite de {settings.MAX_UPLOAD_BYTES} bytes.")
+    char_budget = char_budget if char_budget is not None else settings.TEXT_CHAR_BUDGET
+    max_pages = max_pages if max_pages is not None else settings.MAX_PDF_PAGES
+
+    ensure_supported(filename)
+    fileobj.seek(0)
+    if filename.lower().endswith(".txt"):
+        return read_txt(fileobj, char_budget)
+    return extract_pdf_text(fileobj, char_budget, max_pages)
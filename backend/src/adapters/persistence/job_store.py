@@ -0,0 +1,197 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from src.config.settings import settings
+
+TERMINAL = frozenset({"done", "failed"})
+
+
+@dataclass
+class Job:
+    id: str
+    status: str  # queued | running | done | failed
+    priority: int
+    attempts: int
+    max_attempts: int
+    payload: dict
+    idempotency_key: str | None = None
+    result: dict | None = None
+    error: str | None = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in TERMINAL
+
+    def as_dict(self) -> dict:
+        out = asdict(self)
+        out.pop("payload")
+        return out
+
+
+_COLUMNS = (
+    "id, status, priority, attempts, max_attempts, payload, idempotency_key,"
+    " result, error, created_at, updated_at"
+)
+
+
+def _row_to_job(row) -> Job:
+    return Job(
+        id=row[0], status=row[1], priority=row[2], attempts=row[3], max_attempts=row[4],
+        payload=json.loads(row[5]), idempotency_key=row[6],
+        result=json.loads(row[7]) if row[7] else None, error=row[8],
+        created_at=row[9], updated_at=row[10],
+    )
+
+
+class SqliteJobStore:
+    """Fila persistente de jobs em SQLite, compartilhada entre workers do mesmo host.
+
+    Um job em execução tem um lease: se o processo que o pegou morrer, o job volta a
+    ser elegível quando o lease vence.
+    """
+
+    def __init__(self, path: str | None = None, lease_seconds: float | None = None):
+        self.path = Path(path or Path(settings.JOBS_DIR) / "jobs.sqlite3")
+        self.lease = lease_seconds if lease_seconds is not None else settings.JOBS_LEASE_SECONDS
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, status TEXT NOT NULL, priority INTEGER NOT NULL,"
+                " attempts INTEGER NOT NULL, max_attempts INTEGER NOT NULL, payload TEXT NOT NULL,"
+                " idempotency_key TEXT UNIQUE, result TEXT, error TEXT,"
+                " created_at REAL NOT NULL, updated_at REAL NOT NULL,"
+                " available_at REAL NOT NULL, lease_until REAL NOT NULL DEFAULT 0)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority DESC, created_at)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        # uma conexão por thread e por processo (conexões não sobrevivem ao fork do gunicorn)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def submit(
+        self,
+        payload: dict,
+        priority: int = 0,
+        idempotency_key: str | None = None,
+        max_attempts: int | None = None,
+    ) -> tuple[Job, bool]:
+        """(job, criado). Com uma idempotency_key já vista, devolve o job existente."""
+        now = time.time()
+        job = Job(
+            id=uuid.uuid4().hex, status="queued", priority=priority, attempts=0,
+            max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS, payload=payload,
+            idempotency_key=idempotency_key, created_at=now, updated_at=now,
+        )
+        conn = self._conn()
+        try:
+            conn.execute(
+                f"INSERT INTO jobs ({_COLUMNS}, available_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.status, job.priority, job.attempts, job.max_attempts,
+                 json.dumps(payload, ensure_ascii=False), idempotency_key, None, None, now, now, now),
+            )
+        except sqlite3.IntegrityError:
+            existing = self.get_by_key(idempotency_key)
+            if existing is None:
+                raise
+            return existing, False
+        return job, True
+
+    def get(self, job_id: str) -> Job | None:
+        row = self._conn().execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def get_by_key(self, idempotency_key: str | None) -> Job | None:
+        if idempotency_key is None:
+            return None
+        row = self._conn().execute(
+            f"SELECT {_COLUMNS} FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+        ).fetchone()
+        return _row_to_job(row) if row else None
+
+    def claim(self) -> Job | None:
+        """Pega o próximo job elegível (maior prioridade, mais antigo) e o marca como running."""
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs"
+                " WHERE (status = 'queued' AND available_at <= ?) OR (status = 'running' AND lease_until < ?)"
+                " ORDER BY priority DESC, created_at LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, updated_at = ?"
+                " WHERE id = ?",
+                (now + self.lease, now, row[0]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        job = _row_to_job(row)
+        job.status, job.attempts, job.updated_at = "running", job.attempts + 1, now
+        return job
+
+    def renew(self, job_id: str) -> bool:
+        """Estende o lease de um job em execução; False se ele já não está running
+        (lease vencido e job retomado, ou devolvido à fila)."""
+        now = time.time()
+        cur = self._conn().execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = 'running'",
+            (now + self.lease, job_id),
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: str, result: dict) -> None:
+        self._conn().execute(
+            "UPDATE jobs SET status = 'done', result = ?, error = NULL, updated_at = ? WHERE id = ?",
+            (json.dumps(result, ensure_ascii=False), time.time(), job_id),
+        )
+
+    def fail(self, job_id: str, error: str, retry_in: float | None = None) -> None:
+        """retry_in=None encerra o job; senão ele volta à fila após retry_in segundos."""
+        now = time.time()
+        if retry_in is None:
+            self._conn().execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+                (error, now, job_id),
+            )
+        else:
+            self._conn().execute(
+                "UPDATE jobs SET status = 'queued', error = ?, available_at = ?, updated_at = ? WHERE id = ?",
+                (error, now + retry_in, now, job_id),
+            )
+
+    def release(self, job_id: str) -> None:
+        """Devolve à fila um job interrompido (ex.: shutdown), sem contar a tentativa."""
+        self._conn().execute(
+            "UPDATE jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), available_at = ?,"
+            " updated_at = ? WHERE id = ? AND status = 'running'",
+            (time.time(), time.time(), job_id),
+        )
+
+    def counts(self) -> dict[str, int]:
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {"queued": 0, "running": 0, "done": 0, "failed": 0, **dict(rows)}
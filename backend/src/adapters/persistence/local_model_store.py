@@ -1,8 +1,37 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
+import json
+import os
 import pickle
-from typing import Any
+import shutil
+from typing import Any, Iterator
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+from src.adapters.observability.log import get_logger
 from src.config.settings import settings
 
+log = get_logger(__name__)
+
+# versão do layout em disco; incrementar invalida todos os artefatos existentes
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+@dataclass(frozen=True)
+class ModelArtifact:
+    """Artefato versionado: arrays NumPy (memory-mapped ao carregar) + metadados JSON."""
+    content_hash: str
+    arrays: dict[str, np.ndarray]
+    meta: dict[str, Any] = field(default_factory=dict)
+
+
 class LocalModelStore:
     def __init__(self, model_dir: str | None = None, model_file: str | None = None):
         self.dir = Path(model_dir or settings.MODEL_DIR)
@@ -10,12 +39,13 @@ class LocalModelStore:
         try:
             self.dir.mkdir(exist_ok=True)
         except Exception as e:
-            print(f"Erro ao criar diretório {self.dir}: {e}")
+            log.warning("model_dir_unavailable", dir=str(self.dir), error=str(e))
             # Fallback para diretório temporário
             import tempfile
             self.dir = Path(tempfile.gettempdir()) / "model_artifacts"
             self.path = self.dir / (model_file or settings.MODEL_FILE)
             self.dir.mkdir(exist_ok=True)
+        self.artifacts_dir = self.dir / "artifacts"
 
     def save(self, obj: Any) -> None:
         with open(self.path, "wb") as f:
@@ -26,3 +56,101 @@ class LocalModelStore:
             return None
         with open(self.path, "rb") as f:
             return pickle.load(f)
+
+    def artifact_path(self, content_hash: str) -> Path:
+        return self.artifacts_dir / f"v{ARTIFACT_FORMAT_VERSION}-{content_hash[:16]}"
+
+    def save_artifact(self, artifact: ModelArtifact) -> Path:
+        final = self.artifact_path(artifact.content_hash)
+        if final.exists():
+            return final
+
+        # grava em diretório temporário e renomeia: outros workers nunca veem artefato parcial
+        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.artifacts_dir / f".{final.name}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        for name, arr in artifact.arrays.items():
+            np.save(tmp / f"{name}.npy", np.ascontiguousarray(arr), allow_pickle=False)
+        manifest = {
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "content_hash": artifact.content_hash,
+            "arrays": sorted(artifact.arrays),
+            "meta": artifact.meta,
+        }
+        (tmp / MANIFEST_FILE).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        try:
+            os.rename(tmp, final)
+        except OSError:
+            # outro processo publicou o mesmo artefato primeiro
+            shutil.rmtree(tmp, ignore_errors=True)
+        return final
+
+    def load_artifact(self, content_hash: str) -> ModelArtifact | None:
+        path = self.artifact_path(content_hash)
+        manifest_path = path / MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if (
+                manifest.get("format_version") != ARTIFACT_FORMAT_VERSION
+                or manifest.get("content_hash") != content_hash
+            ):
+                return None
+            # mmap_mode="r": páginas compartilhadas entre processos via page cache
+            arrays = {
+                name: np.load(path / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+                for name in manifest["arrays"]
+            }
+        except Exception as e:
+            log.warning("artifact_invalid", path=str(path), error=str(e))
+            return None
+        return ModelArtifact(content_hash=content_hash, arrays=arrays, meta=manifest.get("meta", {}))
+
+    def list_artifacts(self) -> list[dict]:
+        """Manifestos dos artefatos válidos no diretório (mais recentes primeiro)."""
+        out = []
+        if not self.artifacts_dir.exists():
+            return out
+        for path in self.artifacts_dir.glob(f"v{ARTIFACT_FORMAT_VERSION}-*/{MANIFEST_FILE}"):
+            try:
+                manifest = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            out.append({**manifest, "modified_at": path.stat().st_mtime})
+        return sorted(out, key=lambda m: m["modified_at"], reverse=True)
+
+    def delete_artifact(self, content_hash: str) -> None:
+        shutil.rmtree(self.artifact_path(content_hash), ignore_errors=True)
+
+    def _pointer_path(self, name: str) -> Path:
+        return self.artifacts_dir / f"{name}.json"
+
+    def save_pointer(self, name: str, data: dict) -> None:
+        """Ponteiro nomeado (ex.: versão corrente do modelo online), trocado atomicamente."""
+        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        path = self._pointer_path(name)
+        tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def load_pointer(self, name: str) -> dict | None:
+        try:
+            return json.loads(self._pointer_path(name).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    @contextmanager
+    def lock(self, name: str) -> Iterator[None]:
+        """Trava exclusiva entre processos (workers do gunicorn) para atualizações de modelo."""
+        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.artifacts_dir / f"{name}.lock", "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from src.adapters.runtime.result_cache import normalize_text
+from src.config.settings import settings
+from src.core.protocols.reply_generator import ReplyGenerator
+
+
+class LRUTTLCache:
+    """LRU em memória com expiração por TTL; seguro entre threads."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl = ttl_seconds
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SqliteReplyCache:
+    """Segundo nível persistente: sobrevive a restarts e é compartilhado entre workers."""
+
+    def __init__(self, path: str, ttl_seconds: float, max_rows: int | None = None, prune_every: int = 256):
+        self.path = Path(path)
+        self.ttl = ttl_seconds
+        self.max_rows = max_rows or settings.REPLY_CACHE_SQLITE_MAX_ROWS
+        self.prune_every = prune_every
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.pruned = 0
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS replies ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS replies_expires_at ON replies (expires_at)")
+        self.prune()
+
+    def _conn(self) -> sqlite3.Connection:
+        # uma conexão por thread e por processo: o prune do __init__ roda no master do
+        # gunicorn (preload) e a conexão dele não pode ser herdada pelos workers no fork.
+        # WAL permite leituras concorrentes de vários processos
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> str | None:
+        row = self._conn().execute(
+            "SELECT value FROM replies WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO replies (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl),
+            )
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    def prune(self) -> int:
+        """Remove os vencidos e, acima de max_rows, os mais antigos (TTL único: vencem antes)."""
+        with self._conn() as conn:
+            n = conn.execute("DELETE FROM replies WHERE expires_at <= ?", (time.time(),)).rowcount
+            n += conn.execute(
+                "DELETE FROM replies WHERE key IN"
+                " (SELECT key FROM replies ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            ).rowcount
+        self.pruned += n
+        return n
+
+
+def reply_cache_key(category: str, text: str) -> str:
+    """Categoria + texto normalizado (NFC, caixa e espaços). Todas as palavras contam:
+    descartar stopwords juntaria "não consigo acessar" e "consigo acessar" na mesma resposta."""
+    raw = f"{category}\x1f{normalize_text(text).casefold()}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CachedReplyGenerator:
+    """Envolve um ReplyGenerator com cache em memória (L1) e SQLite opcional (L2)."""
+
+    def __init__(
+        self,
+        inner: ReplyGenerator,
+        memory: LRUTTLCache | None = None,
+        disk: SqliteReplyCache | None = None,
+    ):
+        self.inner = inner
+        if memory is None:
+            memory = LRUTTLCache(settings.REPLY_CACHE_SIZE, settings.REPLY_CACHE_TTL_SECONDS)
+        self.memory = memory
+        self.disk = disk
+
+    @property
+    def source(self) -> str:
+        # respostas do cache foram geradas pelo gerador interno
+        return getattr(self.inner, "source", None) or type(self.inner).__name__
+
+    def _lookup_disk(self, key: str) -> str | None:
+        if self.disk is None:
+            return None
+        value = self.disk.get(key)
+        if value is not None:
+            self.memory.set(key, value)
+        return value
+
+    def _store(self, key: str, value: str) -> None:
+        if not value:
+            return
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def generate(self, category: str, original_text: str) -> str:
+        key = reply_cache_key(category, original_text)
+        cached = self.memory.get(key)
+        if cached is None:
+            cached = self._lookup_disk(key)
+        if cached is not None:
+            return cached
+        value = self.inner.generate(category, original_text)
+        self._store(key, value)
+        return value
+
+    async def agenerate(self, category: str, original_text: str) -> str:
+        key = reply_cache_key(category, original_text)
+        cached = self.memory.get(key)
+        if cached is None and self.disk is not None:
+            cached = await asyncio.to_thread(self._lookup_disk, key)
+        if cached is not None:
+            return cached
+        if hasattr(self.inner, "agenerate"):
+            value = await self.inner.agenerate(category, original_text)
+        else:
+            value = await asyncio.to_thread(self.inner.generate, category, original_text)
+        if self.disk is not None:
+            await asyncio.to_thread(self._store, key, value)
+        else:
+            self._store(key, value)
+        return value
+
+    def stats(self) -> dict:
+        out = {
+            "memory": {
+                "size": len(self.memory),
+                "hits": self.memory.hits,
+                "misses": self.memory.misses,
+                "evictions": self.memory.evictions,
+                "expirations": self.memory.expirations,
+            }
+        }
+        if self.disk is not None:
+            out["disk"] = {"hits": self.disk.hits, "misses": self.disk.misses, "pruned": self.disk.pruned}
+        if hasattr(self.inner, "stats"):
+            out["inner"] = self.inner.stats()
+        return out
@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import random
+import threading
+import time
+
+from src.adapters.observability.log import get_logger
+from src.config.settings import settings
+from src.core.protocols.reply_provider import ReplyProvider
+
+log = get_logger(__name__)
+
+
+class ProviderError(RuntimeError):
+    """O provedor falhou em todas as tentativas (ou o circuito está aberto)."""
+
+
+class CircuitOpenError(ProviderError):
+    pass
+
+
+class CircuitBreaker:
+    """closed -> open após N falhas seguidas; depois de reset_seconds, half_open deixa
+    passar uma única sonda: sucesso fecha o circuito, falha reabre."""
+
+    def __init__(self, failure_threshold: int | None = None, reset_seconds: float | None = None, clock=time.monotonic):
+        self.failure_threshold = failure_threshold or settings.LLM_BREAKER_FAILURES
+        self.reset_seconds = reset_seconds if reset_seconds is not None else settings.LLM_BREAKER_RESET_SECONDS
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opens = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if self._clock() - self._opened_at < self.reset_seconds:
+                    return False
+                self.state = "half_open"
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.opens += 1
+                    log.warning("llm_circuit_opened", failures=self.consecutive_failures)
+                self.state = "open"
+                self._opened_at = self._clock()
+                self._probing = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "open": int(self.state == "open"),
+            "consecutive_failures": self.consecutive_failures,
+            "opens": self.opens,
+        }
+
+
+class ProviderClient:
+    """Cliente compartilhado para um ReplyProvider.
+
+    Todas as chamadas rodam num event loop próprio (uma thread), de modo que a conexão
+    do provedor é reaproveitada independentemente do loop ou thread de quem chama.
+    Sobre esse loop: limite de chamadas simultâneas, timeout por chamada, retries com
+    backoff exponencial com jitter, circuit breaker e single-flight (prompts idênticos
+    em andamento compartilham a mesma chamada).
+    """
+
+    def __init__(
+        self,
+        provider: ReplyProvider,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+        retries: int | None = None,
+        backoff_base: float | None = None,
+        backoff_max: float | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.provider = provider
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.timeout = timeout if timeout is not None else settings.LLM_TIMEOUT_SECONDS
+        self.retries = retries if retries is not None else settings.LLM_RETRIES
+        self.backoff_base = backoff_base if backoff_base is not None else settings.LLM_BACKOFF_BASE_SECONDS
+        self.backoff_max = backoff_max if backoff_max is not None else settings.LLM_BACKOFF_MAX_SECONDS
+        self.breaker = breaker or CircuitBreaker()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_lock = threading.Lock()
+        self._sem: asyncio.Semaphore | None = None
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.retried = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.rejected = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        # criado na primeira chamada: no modo pre-fork, já dentro de cada worker
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-client", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    async def complete(self, prompt: str, timeout: float | None = None) -> str:
+        """timeout: prazo por tentativa, no lugar do padrão (ex.: prompts em lote, mais longos)."""
+        fut = asyncio.run_coroutine_threadsafe(self._complete(prompt, timeout), self._ensure_loop())
+        return await asyncio.wrap_future(fut)
+
+    def complete_blocking(self, prompt: str, timeout: float | None = None) -> str:
+        return asyncio.run_coroutine_threadsafe(self._complete(prompt, timeout), self._ensure_loop()).result()
+
+    def close(self) -> None:
+        with self._loop_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+
+    async def _complete(self, prompt: str, timeout: float | None = None) -> str:
+        self.calls += 1
+        key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._call_with_retries(prompt, timeout or self.timeout))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.coalesced += 1
+        # shield: um chamador que desiste (timeout da cascata) não cancela os demais
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # evita "exception was never retrieved" se ninguém mais espera
+
+    async def _call_with_retries(self, prompt: str, timeout: float) -> str:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+        last: BaseException | None = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.retried += 1
+            try:
+                async with self._sem:
+                    # consultado já com a vaga: quem esperou na fila vê o circuito atualizado
+                    if not self.breaker.allow():
+                        self.rejected += 1
+                        raise CircuitOpenError(f"Circuito aberto para o provedor {self.provider.name}.") from last
+                    self.upstream_calls += 1
+                    out = await asyncio.wait_for(self.provider.complete(prompt), timeout)
+            except CircuitOpenError:
+                raise
+            except asyncio.TimeoutError as e:
+                self.timeouts += 1
+                last = e
+            except Exception as e:
+                last = e
+            else:
+                self.breaker.record_success()
+                return out
+            self.breaker.record_failure()
+            log.warning("llm_call_failed", provider=self.provider.name, attempt=attempt + 1, error=repr(last))
+            if attempt < self.retries:
+                # full jitter: espalha as novas tentativas de uma rajada de falhas
+                await asyncio.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+        self.failures += 1
+        raise ProviderError(
+            f"Provedor {self.provider.name} falhou após {self.retries + 1} tentativas."
+        ) from last
+
+    def stats(self) -> dict:
+        return {
+            "provider": self.provider.name,
+            "calls": self.calls,
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "retries": self.retried,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "in_flight": len(self._inflight),
+            "breaker": self.breaker.stats(),
+        }
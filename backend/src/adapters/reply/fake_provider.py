@@ -0,0 +1,60 @@
+import asyncio
+import hashlib
+import json
+import random
+
+from src.adapters.nlp.keywords import SUBTYPE_KEYWORDS, scan_keywords
+from src.config.settings import settings
+
+
+class FakeProvider:
+    """Provedor local para rodar e testar o caminho do LLM sem rede: latência e taxa de
+    falhas configuráveis, respostas determinísticas por prompt.
+
+    Prompts em lote (ver LLMReplyGenerator.agenerate_batch) recebem o array JSON no formato
+    pedido, cercado por ```json como o Gemini costuma fazer; `item_latency_ms` soma latência
+    por email extra e `drop_rate` omite itens da resposta.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_ms: float | None = None,
+        failure_rate: float | None = None,
+        seed: int | None = None,
+        item_latency_ms: float = 0.0,
+        drop_rate: float = 0.0,
+    ):
+        latency_ms = latency_ms if latency_ms is not None else settings.FAKE_PROVIDER_LATENCY_MS
+        self.latency = latency_ms / 1000
+        self.item_latency = item_latency_ms / 1000
+        self.failure_rate = failure_rate if failure_rate is not None else settings.FAKE_PROVIDER_FAILURE_RATE
+        self.drop_rate = drop_rate
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    async def complete(self, prompt: str) -> str:
+        self.calls += 1
+        _, batch, body = prompt.partition("\nEmails (JSON):\n")
+        items = json.loads(body) if batch else []
+        await asyncio.sleep(self.latency + self.item_latency * max(len(items) - 1, 0))
+        if self._rng.random() < self.failure_rate:
+            raise ConnectionError("Falha simulada do provedor.")
+        if batch:
+            return self._batch_reply(items)
+        if prompt.startswith("Classifique o email"):
+            email = prompt.split("Email:\n", 1)[-1]
+            produtivo = bool(scan_keywords(email).lexicons() & set(SUBTYPE_KEYWORDS))
+            return json.dumps({"category": "Produtivo" if produtivo else "Improdutivo", "confidence": 0.9})
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        return f"Olá! Obrigado pelo contato. Resposta simulada {digest}."
+
+    def _batch_reply(self, items: list[dict]) -> str:
+        replies = []
+        for item in items:
+            if self._rng.random() < self.drop_rate:
+                continue
+            digest = hashlib.sha256(f"{item['categoria']}\x1f{item['email']}".encode("utf-8")).hexdigest()[:8]
+            replies.append({"id": item["id"], "reply": f"Olá! Obrigado pelo contato. Resposta simulada {digest}."})
+        return "```json\n" + json.dumps(replies, ensure_ascii=False) + "\n```"
@@ -1,7 +1,12 @@
 # src/adapters/reply/gemini_reply.py
-import os
+import asyncio
 import json
-import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
 import google.generativeai as genai
 from google.generativeai import GenerativeModel
 from dotenv import load_dotenv, find_dotenv
@@ -9,8 +14,16 @@ from dotenv import load_dotenv, find_dotenv
 # garante que o .env foi lido (também no subprocess do uvicorn --reload)
 load_dotenv(find_dotenv())
 
-logger = logging.getLogger("gemini_reply")
-logger.setLevel(logging.INFO)
+from src.adapters.observability.log import get_logger
+from src.config.settings import settings
+from src.adapters.reply.client import ProviderClient
+from src.adapters.reply.llm_reply import LLMReplyGenerator
+from src.adapters.nlp.prompt_compression import PromptCompressor
+from src.adapters.runtime.stages import StageExecutor
+
+logger = get_logger(__name__)
+
+DEFAULT_MODEL = "gemini-1.5-flash"
 
 PREFERRED = [
     "gemini-2.5-flash",
@@ -32,97 +45,175 @@ def _configure_gemini():
     # aceita GEMINI_API_KEY ou GOOGLE_API_KEY
     api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
     if not api_key:
-        print("GEMINI_API_KEY/GOOGLE_API_KEY ausente no ambiente (.env).")
+        logger.error("gemini_api_key_missing")
         raise RuntimeError("GEMINI_API_KEY/GOOGLE_API_KEY ausente no ambiente (.env).")
-    print(f"Configurando Gemini com API key: {api_key[:10]}...")
     try:
         genai.configure(api_key=api_key)
-        print("Gemini configurado com sucesso")
-    except Exception as e:
-        print(f"Erro ao configurar Gemini: {e}")
+    except Exception:
+        logger.exception("gemini_configure_failed")
         raise
 
-def _resolve_gemini_model_name() -> str:
-    _configure_gemini()
-    desired = _normalize_name(os.getenv("GEMINI_MODEL", "").strip())
+def _resolve_gemini_model_name(desired: str) -> tuple[str, str]:
+    """(modelo, critério) a partir de list_models(); erros de rede sobem para o chamador."""
+    available = list(genai.list_models())
+    names = {_normalize_name(m.name): m for m in available}
+
+    if desired:
+        m = names.get(desired)
+        if m and _supports_generate_content(m):
+            return desired, "configured"
+        if not m and desired.endswith("-flash"):
+            alt = desired + "-latest"
+            if alt in names and _supports_generate_content(names[alt]):
+                return alt, "latest_alias"
+        logger.warning("gemini_model_unsupported", requested=desired)
+
+    for cand in PREFERRED:
+        if cand in names and _supports_generate_content(names[cand]):
+            return cand, "preferred"
+
+    for m in available:
+        if _supports_generate_content(m):
+            return _normalize_name(m.name), "first_available"
+
+    raise RuntimeError("Nenhum modelo Gemini disponível com generateContent.")
+
+
+@dataclass
+class ModelResolution:
+    model: str
+    via: str  # configured | latest_alias | preferred | first_available | default
+    source: str  # cache | list_models | stale_cache | fallback
+    requested: str
+    resolved_at: float
+    error: str | None = None
+
+    def age_seconds(self) -> float:
+        return time.time() - self.resolved_at
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "age_seconds": round(self.age_seconds(), 1)}
 
+
+_resolution: ModelResolution | None = None
+_resolution_lock = threading.Lock()
+# resolução com erro vale só até aqui (time.monotonic); depois, nova consulta a list_models()
+_retry_at = 0.0
+
+
+def _cache_path() -> Path:
+    return Path(settings.MODEL_DIR) / "gemini_model.json"
+
+
+def _read_cached(path: Path) -> ModelResolution | None:
     try:
-        available = list(genai.list_models())
-        names = {_normalize_name(m.name): m for m in available}
-
-        if desired:
-            m = names.get(desired)
-            if m and _supports_generate_content(m):
-                logger.info(f"✔ Usando modelo Gemini configurado: {desired}")
-                return desired
-            if not m and desired.endswith("-flash"):
-                alt = desired + "-latest"
-                if alt in names and _supports_generate_content(names[alt]):
-                    logger.info(f"⚠ Modelo {desired} não encontrado; usando {alt}")
-                    return alt
-            logger.warning(f"⚠ Modelo {desired} não suportado; tentando fallback.")
-
-        for cand in PREFERRED:
-            if cand in names and _supports_generate_content(names[cand]):
-                logger.info(f"✔ Usando modelo Gemini fallback: {cand}")
-                return cand
-
-        for m in available:
-            n = _normalize_name(m.name)
-            if _supports_generate_content(m):
-                logger.info(f"✔ Usando primeiro modelo válido encontrado: {n}")
-                return n
-
-        raise RuntimeError("Nenhum modelo Gemini disponível com generateContent.")
-    except Exception as e:
-        print(f"Erro ao listar modelos Gemini: {e}")
-        # Fallback para modelo padrão
-        return "gemini-1.5-flash"
-
-def _gemini_model() -> GenerativeModel:
-    model_name = _resolve_gemini_model_name()
-    return GenerativeModel(model_name)
-
-class GeminiReplyGenerator:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return ModelResolution(
+            model=data["model"], via=data["via"], source="cache",
+            requested=data["requested"], resolved_at=float(data["resolved_at"]),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cached(path: Path, res: ModelResolution) -> None:
+    # escrita atômica: workers concorrentes nunca leem um JSON pela metade
+    data = {"model": res.model, "via": res.via, "requested": res.requested, "resolved_at": res.resolved_at}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("gemini_model_cache_write_failed", path=str(path), error=str(e))
+
+
+def resolve_gemini_model() -> ModelResolution:
+    """Nome do modelo a usar, resolvido uma vez por processo.
+
+    Usa o cache em disco (compartilhado entre workers e reinícios) enquanto estiver dentro
+    do TTL e para o mesmo GEMINI_MODEL; senão consulta list_models() e regrava o cache.
+    Se a consulta falhar, vale o cache vencido e, na falta dele, o modelo padrão; o erro
+    fica registrado na resolução (ver /diagnostics) e ela é refeita depois de
+    GEMINI_MODEL_RETRY_SECONDS, em vez de valer até o fim do processo.
+    """
+    global _resolution, _retry_at
+    with _resolution_lock:
+        if _resolution is not None and not _needs_retry(_resolution):
+            return _resolution
+
+        desired = _normalize_name(os.getenv("GEMINI_MODEL", "").strip())
+        path = _cache_path()
+        cached = _read_cached(path)
+        if cached is not None and cached.requested != desired:
+            cached = None
+
+        if cached is not None and cached.age_seconds() < settings.GEMINI_MODEL_CACHE_TTL_SECONDS:
+            res = cached
+        else:
+            try:
+                _configure_gemini()
+                model, via = _resolve_gemini_model_name(desired)
+                res = ModelResolution(model, via, "list_models", desired, time.time())
+                _write_cached(path, res)
+            except Exception as e:
+                if cached is not None:
+                    res = ModelResolution(cached.model, cached.via, "stale_cache", desired, cached.resolved_at, str(e))
+                else:
+                    res = ModelResolution(DEFAULT_MODEL, "default", "fallback", desired, time.time(), str(e))
+                _retry_at = time.monotonic() + settings.GEMINI_MODEL_RETRY_SECONDS
+                logger.warning("gemini_model_resolution_failed", error=str(e), model=res.model, source=res.source)
+
+        logger.info("gemini_model_resolved", model=res.model, via=res.via, source=res.source)
+        _resolution = res
+        return res
+
+
+def _needs_retry(res: ModelResolution) -> bool:
+    return res.error is not None and time.monotonic() >= _retry_at
+
+
+def resolution_pending() -> bool:
+    """Ainda não resolvido, ou a última resolução falhou e já pode ser refeita."""
+    res = _resolution
+    return res is None or _needs_retry(res)
+
+
+def resolution_diagnostics() -> dict | None:
+    res = _resolution
+    return None if res is None else res.as_dict()
+
+
+class GeminiProvider:
+    name = "gemini"
+
     def __init__(self):
-        print("GeminiReplyGenerator sendo inicializado")
         self._model = None
+        self._model_name: str | None = None
 
     def _model_instance(self) -> GenerativeModel:
-        if self._model is None:
-            self._model = _gemini_model()
+        name = resolve_gemini_model().model
+        if self._model is None or name != self._model_name:
+            _configure_gemini()
+            self._model = GenerativeModel(name)
+            self._model_name = name
         return self._model
 
-    def generate(self, category: str, original_text: str) -> str:
-        print(f"GeminiReplyGenerator.generate chamado com category: {category}")
-        prompt = (
-            "Você é um assistente de atendimento de uma empresa do setor financeiro.\n"
-            f"Classificação do email: {category}.\n"
-            "Escreva uma resposta breve, clara e cordial em PT-BR, com tom profissional.\n"
-            "Se for Produtivo, agradeça, diga que analisará/atualizará o status e peça informações extras.\n"
-            "Se for Improdutivo, agradeça e diga que não há ação necessária.\n\n"
-            f"Email original (resuma discretamente, NÃO copie tudo):\n{original_text[:1200]}"
-        )
-        resp = self._model_instance().generate_content(prompt)
+    async def complete(self, prompt: str) -> str:
+        # normalmente já resolvido no startup (ver app_factory); senão, ou se a resolução
+        # falhou e venceu a janela de nova tentativa, resolve fora do loop
+        model = self._model
+        if model is None or resolution_pending():
+            model = await asyncio.to_thread(self._model_instance)
+        resp = await model.generate_content_async(prompt)
         return (resp.text or "").strip()
 
-    def classify(self, raw_text: str) -> tuple[str, float]:
-        prompt = (
-            "Classifique o email como \"Produtivo\" ou \"Improdutivo\" e retorne JSON:\n"
-            "{\"category\":\"Produtivo|Improdutivo\",\"confidence\":0.xx}\n\n"
-            f"Email:\n{raw_text[:3000]}"
-        )
-        resp = self._model_instance().generate_content(prompt)
-        out = resp.text or ""
-        try:
-            data = json.loads(out)
-            cat = data.get("category", "").strip()
-            conf = float(data.get("confidence", 0.65))
-            if cat not in ("Produtivo", "Improdutivo"):
-                raise ValueError
-            return cat, max(0.0, min(conf, 1.0))
-        except Exception:
-            logger.warning("⚠ JSON inválido do Gemini; usando heurística simples.")
-            t = raw_text.lower()
-            cat = "Produtivo" if any(k in t for k in ["status","ticket","senha","fatura","erro","anexo","suporte"]) else "Improdutivo"
-            return cat, 0.65
+
+class GeminiReplyGenerator(LLMReplyGenerator):
+    def __init__(
+        self,
+        client: ProviderClient | None = None,
+        compressor: PromptCompressor | None = None,
+        stages: StageExecutor | None = None,
+    ):
+        super().__init__(client or ProviderClient(GeminiProvider()), compressor=compressor, stages=stages)
@@ -0,0 +1,276 @@
+import asyncio
+import json
+
+from src.adapters.nlp.prompt_compression import CHARS_PER_TOKEN, PromptCompressor
+from src.adapters.observability.log import get_logger
+from src.adapters.reply.client import ProviderClient, ProviderError
+from src.adapters.reply.templates import TemplateReplyGenerator
+from src.adapters.runtime.micro_batch import MicroBatcher
+from src.adapters.runtime.stages import StageExecutor
+from src.config.settings import settings
+from src.core.protocols.reply_generator import ReplyGenerator
+
+logger = get_logger(__name__)
+
+# reply_source das respostas de template usadas porque o provedor falhou
+FALLBACK_SOURCE = "fallback:template"
+
+
+def _strip_fence(out: str) -> str:
+    # o modelo costuma cercar o JSON com ```json ... ```
+    return out.strip().removeprefix("```json").removeprefix("```").removesuffix("```")
+
+
+async def _await_batch(fn, items):
+    return await fn(items)
+
+
+class LLMReplyGenerator:
+    """Resposta e classificação por LLM, sobre um ProviderClient (qualquer provedor).
+
+    Com LLM_BATCH_MAX_ITEMS > 1, respostas pedidas ao mesmo tempo saem de um único prompt
+    com todos os emails, que pede um array JSON indexado por id (ver agenerate_batch).
+    Com `stages`, a compressão do email (CPU) roda no estágio ml, fora do event loop.
+    """
+
+    def __init__(
+        self,
+        client: ProviderClient,
+        batch_max_items: int | None = None,
+        batch_max_wait_ms: float | None = None,
+        compressor: PromptCompressor | None = None,
+        stages: StageExecutor | None = None,
+    ):
+        self.client = client
+        self.compressor = compressor
+        self.stages = stages
+        self.batch_calls = 0
+        self.batch_items = 0
+        self.batch_retried = 0
+        self.batcher: MicroBatcher | None = None
+        max_items = batch_max_items or settings.LLM_BATCH_MAX_ITEMS
+        if max_items > 1:
+            # com vaga no cliente, o pedido sai na hora; o lote se forma enquanto as vagas estão ocupadas
+            self.batcher = MicroBatcher(
+                self.agenerate_batch,
+                _await_batch,
+                max_items=max_items,
+                max_wait_ms=batch_max_wait_ms if batch_max_wait_ms is not None else settings.LLM_BATCH_MAX_WAIT_MS,
+                max_concurrent=client.max_concurrency,
+            )
+
+    @property
+    def source(self) -> str:
+        return f"llm:{self.client.provider.name}"
+
+    def _fit(self, text: str, max_tokens: int) -> str:
+        """Texto do email dentro do orçamento de tokens do prompt."""
+        if self.compressor is None:
+            return text[:max_tokens * CHARS_PER_TOKEN]
+        return self.compressor.compress(text, max_tokens)
+
+    def _fit_many(self, texts: list[str], max_tokens: int) -> list[str]:
+        return [self._fit(t, max_tokens) for t in texts]
+
+    async def _afit_many(self, texts: list[str], max_tokens: int) -> list[str]:
+        if self.compressor is None or self.stages is None:
+            return self._fit_many(texts, max_tokens)
+        return await self.stages.run("ml", self._fit_many, texts, max_tokens)
+
+    async def _afit(self, text: str, max_tokens: int) -> str:
+        return (await self._afit_many([text], max_tokens))[0]
+
+    def _reply_prompt(self, category: str, email: str) -> str:
+        """email: texto já ajustado ao orçamento (ver _fit)."""
+        return (
+            "Você é um assistente de atendimento de uma empresa do setor financeiro.\n"
+            f"Classificação do email: {category}.\n"
+            "Escreva uma resposta breve, clara e cordial em PT-BR, com tom profissional.\n"
+            "Se for Produtivo, agradeça, diga que analisará/atualizará o status e peça informações extras.\n"
+            "Se for Improdutivo, agradeça e diga que não há ação necessária.\n\n"
+            f"Email original (resuma discretamente, NÃO copie tudo):\n{email}"
+        )
+
+    def generate(self, category: str, original_text: str) -> str:
+        email = self._fit(original_text, settings.PROMPT_REPLY_TOKENS)
+        return self.client.complete_blocking(self._reply_prompt(category, email)).strip()
+
+    async def agenerate(self, category: str, original_text: str) -> str:
+        if self.batcher is not None:
+            out = await self.batcher.submit((category, original_text))
+            if isinstance(out, Exception):
+                raise out
+            return out
+        return await self._agenerate_one(category, original_text)
+
+    async def _agenerate_one(self, category: str, original_text: str) -> str:
+        email = await self._afit(original_text, settings.PROMPT_REPLY_TOKENS)
+        out = await self.client.complete(self._reply_prompt(category, email))
+        return out.strip()
+
+    def _batch_reply_prompt(self, items: list[tuple[str, str]]) -> str:
+        """items: (categoria, texto já ajustado ao orçamento)."""
+        emails = [
+            {"id": str(i), "categoria": category, "email": email}
+            for i, (category, email) in enumerate(items, 1)
+        ]
+        return (
+            "Você é um assistente de atendimento de uma empresa do setor financeiro.\n"
+            "Para cada email da lista, escreva uma resposta breve, clara e cordial em PT-BR, com tom profissional.\n"
+            "Se for Produtivo, agradeça, diga que analisará/atualizará o status e peça informações extras.\n"
+            "Se for Improdutivo, agradeça e diga que não há ação necessária.\n"
+            "Cada resposta trata apenas do seu email; resuma discretamente, NÃO copie tudo.\n"
+            "Retorne somente um array JSON, um objeto por email, no formato:\n"
+            "[{\"id\":\"1\",\"reply\":\"...\"}]\n\n"
+            f"Emails (JSON):\n{json.dumps(emails, ensure_ascii=False)}"
+        )
+
+    @staticmethod
+    def _parse_batch_replies(out: str, n: int) -> list[str | None]:
+        """Resposta de cada item pela posição (ids 1..n); None se ausente, inválida ou repetida."""
+        replies: list[str | None] = [None] * n
+        try:
+            data = json.loads(_strip_fence(out))
+        except ValueError:
+            data = None
+        if not isinstance(data, list):
+            logger.warning("llm_batch_reply_invalid_json")
+            return replies
+        repeated: set[int] = set()
+        for obj in data:
+            if not isinstance(obj, dict):
+                continue
+            reply = obj.get("reply")
+            try:
+                k = int(obj.get("id")) - 1
+            except (TypeError, ValueError):
+                continue
+            # ids fora da lista ou respostas vazias não são aceitos
+            if not (0 <= k < n and isinstance(reply, str) and reply.strip()):
+                continue
+            if replies[k] is not None:
+                repeated.add(k)
+            replies[k] = reply.strip()
+        # id repetido: não há como saber qual das respostas é a dele, então o item é refeito
+        for k in repeated:
+            replies[k] = None
+        return replies
+
+    def _batch_timeout(self, n: int) -> float:
+        return self.client.timeout + settings.LLM_BATCH_TIMEOUT_PER_ITEM_SECONDS * (n - 1)
+
+    async def agenerate_batch(self, items: list[tuple[str, str]]) -> list[str | Exception]:
+        """Respostas para vários (categoria, texto) numa única chamada ao provedor.
+
+        O timeout da chamada cresce com o número de itens (LLM_BATCH_TIMEOUT_PER_ITEM_SECONDS
+        por email além do primeiro). Itens ausentes, inválidos ou com id repetido na resposta
+        são refeitos um a um; o que ainda falhar volta como exceção na posição do item, para o
+        FallbackReplyGenerator usar o template só nele. Uma falha da chamada em lote sobe
+        para todos.
+        """
+        if len(items) == 1:
+            return [await self._agenerate_one(*items[0])]
+        self.batch_calls += 1
+        self.batch_items += len(items)
+        fitted = await self._afit_many([text for _, text in items], settings.PROMPT_REPLY_TOKENS)
+        prompt = self._batch_reply_prompt([(category, email) for (category, _), email in zip(items, fitted)])
+        out = await self.client.complete(prompt, timeout=self._batch_timeout(len(items)))
+        replies: list = self._parse_batch_replies(out, len(items))
+        missing = [i for i, r in enumerate(replies) if r is None]
+        if missing:
+            self.batch_retried += len(missing)
+            logger.warning("llm_batch_reply_incomplete", items=len(items), missing=len(missing))
+            retried = await asyncio.gather(
+                *(self._agenerate_one(*items[i]) for i in missing), return_exceptions=True
+            )
+            for i, r in zip(missing, retried):
+                replies[i] = r
+        return replies
+
+    def _classify_prompt(self, email: str) -> str:
+        return (
+            "Classifique o email como \"Produtivo\" ou \"Improdutivo\" e retorne JSON:\n"
+            "{\"category\":\"Produtivo|Improdutivo\",\"confidence\":0.xx}\n\n"
+            f"Email:\n{email}"
+        )
+
+    @staticmethod
+    def _parse_classification(out: str) -> tuple[str, float]:
+        """Categoria e confiança do JSON do modelo. Resposta inválida levanta ValueError:
+        a cascata registra o erro e mantém a predição local em vez de aceitar um chute."""
+        try:
+            data = json.loads(_strip_fence(out))
+            cat = data.get("category", "").strip()
+            conf = float(data.get("confidence", 0.65))
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning("llm_classify_invalid_json")
+            raise ValueError("Resposta do LLM sem classificação válida.") from e
+        if cat not in ("Produtivo", "Improdutivo"):
+            logger.warning("llm_classify_invalid_category", category=cat[:40])
+            raise ValueError(f"Categoria inválida na resposta do LLM: {cat[:40]!r}")
+        return cat, max(0.0, min(conf, 1.0))
+
+    def classify(self, raw_text: str) -> tuple[str, float]:
+        email = self._fit(raw_text, settings.PROMPT_CLASSIFY_TOKENS)
+        return self._parse_classification(self.client.complete_blocking(self._classify_prompt(email)))
+
+    async def aclassify(self, raw_text: str) -> tuple[str, float]:
+        email = await self._afit(raw_text, settings.PROMPT_CLASSIFY_TOKENS)
+        return self._parse_classification(await self.client.complete(self._classify_prompt(email)))
+
+    def stats(self) -> dict:
+        out = self.client.stats()
+        if self.compressor is not None:
+            out["prompt_compression"] = self.compressor.stats()
+        if self.batcher is not None:
+            out["batch"] = {
+                **self.batcher.stats(),
+                "prompt_calls": self.batch_calls,
+                "prompt_items": self.batch_items,
+                "retried_items": self.batch_retried,
+            }
+        return out
+
+
+class FallbackReplyGenerator:
+    """Usa os templates quando o provedor falha de vez (retries esgotados ou circuito
+    aberto). Fica por fora do cache, para que respostas de fallback não sejam cacheadas;
+    `agenerate_sourced` marca essas respostas com FALLBACK_SOURCE, para que o cache de
+    resultados também as ignore; as demais levam a origem do gerador principal."""
+
+    def __init__(self, primary: ReplyGenerator, fallback: ReplyGenerator | None = None):
+        self.primary = primary
+        self.fallback = fallback or TemplateReplyGenerator()
+        self.fallbacks = 0
+
+    @property
+    def source(self) -> str:
+        return getattr(self.primary, "source", None) or type(self.primary).__name__
+
+    def _fallback(self, category: str, original_text: str, error: ProviderError) -> tuple[str, str]:
+        self.fallbacks += 1
+        logger.warning("reply_fallback", error=str(error), fallback=type(self.fallback).__name__)
+        return self.fallback.generate(category, original_text), FALLBACK_SOURCE
+
+    def generate_sourced(self, category: str, original_text: str) -> tuple[str, str]:
+        """(resposta, reply_source)."""
+        try:
+            return self.primary.generate(category, original_text), self.source
+        except ProviderError as e:
+            return self._fallback(category, original_text, e)
+
+    async def agenerate_sourced(self, category: str, original_text: str) -> tuple[str, str]:
+        try:
+            return await self.primary.agenerate(category, original_text), self.source
+        except ProviderError as e:
+            return self._fallback(category, original_text, e)
+
+    def generate(self, category: str, original_text: str) -> str:
+        return self.generate_sourced(category, original_text)[0]
+
+    async def agenerate(self, category: str, original_text: str) -> str:
+        return (await self.agenerate_sourced(category, original_text))[0]
+
+    def stats(self) -> dict:
+        inner = self.primary.stats() if hasattr(self.primary, "stats") else {}
+        return {"fallbacks": self.fallbacks, **inner}
@@ -1,19 +1,16 @@
-from src.adapters.nlp.preprocessing import is_toxic
+from src.adapters.nlp.keywords import SUBTYPE_KEYWORDS, KeywordMatches, scan_keywords
 from src.core.enums.category import Category
 
-def detect_subtype(text: str) -> str:
-    t = text.lower()
-    if any(k in t for k in ["status", "andamento", "ticket", "chamado"]):
-        return "status"
-    if any(k in t for k in ["senha", "reset", "acesso", "login"]):
-        return "senha"
-    if any(k in t for k in ["fatura", "boleto", "cobrança", "pagamento", "segunda via", "2ª via"]):
-        return "fatura"
-    if any(k in t for k in ["anexo", "arquivo", "documento"]):
-        return "anexo"
-    if any(k in t for k in ["erro", "bug", "falha"]):
-        return "erro"
-    return "geral"
+def detect_subtype(text: str, matches: KeywordMatches | None = None) -> str:
+    if matches is None:
+        matches = scan_keywords(text)
+    return matches.first_of(SUBTYPE_KEYWORDS) or "geral"
+
+def reply_subtype(category: str, matches: KeywordMatches) -> str:
+    """Chave de TEMPLATES para a categoria, a partir de uma varredura já feita."""
+    if category == Category.IMPRODUTIVO.value:
+        return "toxico" if matches.has("toxic") else "improdutivo"
+    return detect_subtype("", matches)
 
 TEMPLATES = {
     "status": "Olá! Obrigado pelo contato. Estamos verificando o status da sua solicitação e retornaremos em breve. Se tiver número do chamado, por favor informe.",
@@ -22,17 +19,17 @@ TEMPLATES = {
     "anexo": "Olá! Recebemos o arquivo e vamos analisar os detalhes. Se houver pendências, retornaremos solicitando informações complementares.",
     "erro": "Olá! Obrigado por reportar. Estamos avaliando o comportamento informado e retornamos com orientação ou correção.",
     "geral": "Olá! Obrigado pelo contato. Recebemos sua solicitação e vamos analisar os detalhes. Em breve retornaremos com próximos passos.",
+    "improdutivo": "Obrigado pela mensagem! Não há ação necessária no momento. Permanecemos à disposição.",
 }
 
 class TemplateReplyGenerator:
     def generate(self, category: str, original_text: str) -> str:
-        print(f"TemplateReplyGenerator.generate chamado com category: {category}")
-        if category == Category.IMPRODUTIVO.value:
-            # checa tóxico primeiro
-            if is_toxic(original_text):
-                return TEMPLATES["toxico"]
-            return "Obrigado pela mensagem! Não há ação necessária no momento. Permanecemos à disposição."
-        subtype = detect_subtype(original_text)
+        return self.generate_subtype(reply_subtype(category, scan_keywords(original_text)), original_text)
+
+    async def agenerate(self, category: str, original_text: str) -> str:
+        return self.generate(category, original_text)
+
+    def generate_subtype(self, subtype: str, original_text: str) -> str:
         return TEMPLATES.get(subtype, TEMPLATES["geral"])
 
 TEMPLATES["toxico"] = (
@@ -0,0 +1,109 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Sequence, TypeVar
+
+from src.config.settings import settings
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Junta chamadas concorrentes de um item num único lote para `fn`.
+
+    Com o executor ocioso, o grupo sai na próxima volta do event loop (sem espera
+    artificial para um cliente só). Enquanto um lote roda, os itens novos se acumulam e
+    saem quando ele termina, ao chegar a `max_items` ou após `max_wait_ms` milissegundos
+    desde o primeiro item, o que vier antes. `max_wait_ms` maior troca latência por lotes
+    maiores. Um erro de `fn` chega a todos os chamadores do lote; um chamador cancelado
+    sai do lote sem afetar os demais.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[list[T]], Sequence[R]],
+        run: Callable[[Callable[[list[T]], Sequence[R]], list[T]], Awaitable[Sequence[R]]],
+        max_items: int | None = None,
+        max_wait_ms: float | None = None,
+        max_concurrent: int = 1,
+    ):
+        self.fn = fn
+        self.run = run
+        self.max_items = max_items or settings.MICRO_BATCH_MAX_ITEMS
+        # em segundos, como o event loop usa
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.MICRO_BATCH_MAX_WAIT_MS) / 1000
+        self.max_concurrent = max_concurrent
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: list[tuple[T, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._running = 0
+        self.batches = 0
+        self.items = 0
+        self.max_batch_seen = 0
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # estado preso a outro event loop (ex.: asyncio.run repetido em testes/benchmarks)
+            self._loop, self._pending, self._timer, self._running = loop, [], None, 0
+        fut = loop.create_future()
+        self._pending.append((item, fut))
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif len(self._pending) == 1:
+            if self._running < self.max_concurrent:
+                self._timer = loop.call_soon(self._flush)
+            else:
+                self._timer = loop.call_later(self.max_wait, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending[:self.max_items], self._pending[self.max_items:]
+        self._running += 1
+        task = self._loop.create_task(self._run(batch))
+        task.add_done_callback(self._done)
+        if self._pending:
+            self._timer = self._loop.call_later(self.max_wait, self._flush)
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        live = [(item, fut) for item, fut in batch if not fut.done()]  # chamadores cancelados saem
+        if not live:
+            return
+        self.batches += 1
+        self.items += len(live)
+        self.max_batch_seen = max(self.max_batch_seen, len(live))
+        try:
+            results = await self.run(self.fn, [item for item, _ in live])
+        except asyncio.CancelledError:
+            # lote interrompido (ex.: shutdown): os chamadores não ficam esperando para sempre
+            for _, fut in live:
+                fut.cancel()
+            raise
+        except Exception as e:
+            for _, fut in live:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), result in zip(live, results):
+            if not fut.done():
+                fut.set_result(result)
+
+    def _done(self, _task: asyncio.Task) -> None:
+        self._running -= 1
+        # itens que chegaram durante o lote saem já, sem esperar o timer
+        if self._pending and self._running < self.max_concurrent:
+            self._flush()
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch": self.items / self.batches if self.batches else 0.0,
+            "max_batch": self.max_batch_seen,
+            "max_items": self.max_items,
+            "max_wait_ms": self.max_wait * 1000,
+        }
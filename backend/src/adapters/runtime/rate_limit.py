@@ -0,0 +1,38 @@
+import time
+from collections import OrderedDict
+
+from src.config.settings import settings
+
+
+class TokenBucketLimiter:
+    """Token bucket por chave de cliente: `rate` requisições por segundo, com rajadas de
+    até `burst`. Guarda no máximo `max_keys` clientes (os menos recentes saem primeiro;
+    um cliente esquecido volta com o balde cheio). Usado só no event loop, sem lock."""
+
+    def __init__(self, rate: float | None = None, burst: int | None = None, max_keys: int = 10000):
+        self.rate = rate or settings.RATE_LIMIT_PER_SECOND
+        self.burst = float(burst or settings.RATE_LIMIT_BURST)
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        """0 se liberado; senão, segundos até haver tokens suficientes."""
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens >= cost:
+            tokens -= cost
+            wait = 0.0
+            self.allowed += 1
+        else:
+            wait = (cost - tokens) / self.rate
+            self.limited += 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def stats(self) -> dict:
+        return {"clients": len(self._buckets), "allowed": self.allowed, "limited": self.limited}
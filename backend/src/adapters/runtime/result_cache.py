@@ -0,0 +1,88 @@
+import hashlib
+import sys
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from typing import Any, BinaryIO
+
+from src.config.settings import settings
+
+
+def normalize_text(text: str) -> str:
+    """NFC + espaços colapsados: cópias do mesmo email com quebras/indentação diferentes
+    produzem a mesma chave (o classificador não enxerga essa diferença)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def file_digest(fileobj: BinaryIO, chunk_size: int | None = None) -> str:
+    """Hash dos bytes crus do upload, lido em blocos; devolve o arquivo no início."""
+    h = hashlib.sha256()
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(chunk_size or settings.UPLOAD_CHUNK_BYTES), b""):
+        h.update(chunk)
+    fileobj.seek(0)
+    return h.hexdigest()
+
+
+def _approx_size(value: Any) -> int:
+    if is_dataclass(value):
+        return sys.getsizeof(value) + sum(sys.getsizeof(getattr(value, f.name)) for f in fields(value))
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """LRU limitado pelo tamanho aproximado (bytes) dos resultados guardados; seguro entre threads."""
+
+    def __init__(self, max_bytes: int | None = None):
+        self.max_bytes = max_bytes or settings.RESULT_CACHE_MAX_BYTES
+        self._data: OrderedDict[str, tuple[int, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: str, value: Any) -> None:
+        size = len(key) + _approx_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[0]
+            self._data[key] = (size, value)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (evicted, _) = self._data.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,110 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Callable, TypeVar
+
+from src.config.settings import settings
+
+T = TypeVar("T")
+
+# estágios que só esperam rede: usam um pool próprio para não ocupar threads de CPU
+IO_STAGES = frozenset({"llm"})
+
+
+class StageSaturated(RuntimeError):
+    """Estágio com todas as vagas ocupadas e a fila de espera cheia: rejeitar na hora sai
+    mais barato que enfileirar até o timeout da plataforma."""
+
+    def __init__(self, stage: str, retry_after: float):
+        super().__init__(f"Estágio {stage} saturado.")
+        self.stage = stage
+        self.retry_after = retry_after
+
+
+class StageExecutor:
+    """Pool de threads limitado para trabalho bloqueante + limite de concorrência por estágio.
+
+    Cada estágio (pdf, ml, llm) tem seu próprio semáforo, então uma rajada de PDFs
+    não consome todas as threads que a inferência precisa. A fila de espera de cada
+    estágio também é limitada: acima dela, StageSaturated.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        limits: dict[str, int] | None = None,
+        queue_limits: dict[str, int] | None = None,
+    ):
+        self.max_workers = max_workers or settings.CPU_WORKERS
+        self.limits = limits or {
+            "pdf": settings.STAGE_LIMIT_PDF,
+            "ml": settings.STAGE_LIMIT_ML,
+            "llm": settings.STAGE_LIMIT_LLM,
+        }
+        self.queue_limits = queue_limits or {
+            "pdf": settings.STAGE_QUEUE_PDF,
+            "ml": settings.STAGE_QUEUE_ML,
+            "llm": settings.STAGE_QUEUE_LLM,
+        }
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage-cpu")
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=max(1, sum(n for st, n in self.limits.items() if st in IO_STAGES)),
+            thread_name_prefix="stage-io",
+        )
+        self._sems = {stage: asyncio.Semaphore(n) for stage, n in self.limits.items()}
+        self._in_flight = dict.fromkeys(self.limits, 0)
+        self._waiting = dict.fromkeys(self.limits, 0)
+        self.rejected = dict.fromkeys(self.limits, 0)
+        self.shed = dict.fromkeys(self.limits, 0)
+
+    @asynccontextmanager
+    async def limit(self, stage: str) -> AsyncIterator[None]:
+        sem = self._sems[stage]
+        if sem.locked() and self._waiting[stage] >= self.queue_limits.get(stage, float("inf")):
+            self.rejected[stage] += 1
+            raise StageSaturated(stage, settings.STAGE_RETRY_AFTER_SECONDS)
+        self._waiting[stage] += 1
+        try:
+            await sem.acquire()
+        finally:
+            self._waiting[stage] -= 1
+        self._in_flight[stage] += 1
+        try:
+            yield
+        finally:
+            self._in_flight[stage] -= 1
+            sem.release()
+
+    async def run(self, stage: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        async with self.limit(stage):
+            loop = asyncio.get_running_loop()
+            pool = self._io_pool if stage in IO_STAGES else self._pool
+            return await loop.run_in_executor(pool, partial(fn, *args, **kwargs))
+
+    def in_flight(self, stage: str) -> int:
+        return self._in_flight[stage]
+
+    def should_shed(self, stage: str, max_waiting: int = 0) -> bool:
+        """True (e conta um descarte) se o estágio está sem vagas e com mais de
+        `max_waiting` chamadas esperando: o chamador usa um caminho degradado."""
+        if self._sems[stage].locked() and self._waiting[stage] >= max_waiting:
+            self.shed[stage] += 1
+            return True
+        return False
+
+    def stats(self) -> dict:
+        return {
+            stage: {
+                "limit": limit,
+                "in_flight": self._in_flight[stage],
+                "waiting": self._waiting[stage],
+                "rejected": self.rejected[stage],
+                "shed": self.shed[stage],
+            }
+            for stage, limit in self.limits.items()
+        }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=False)
+        self._io_pool.shutdown(wait=True, cancel_futures=False)
@@ -5,7 +5,11 @@ class Settings(BaseSettings):
     MODEL_DIR: str = "model_artifacts"
     MODEL_FILE: str = "clf_nb_tfidf.pkl"
 
-    AI_PROVIDER: str = "gemini"  # template | gemini
+    AI_PROVIDER: str = "gemini"  # template | gemini | fake (LLM simulado, sem rede)
+
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # json | text
+    LOG_SAMPLE_RATE: float = 1.0  # fração dos logs debug/info emitidos
 
     OPENAI_API_KEY: str | None = None
     OPENAI_MODEL: str = "gpt-4o-mini"
@@ -13,8 +17,111 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str | None = None
     GOOGLE_API_KEY: str | None = None
     GEMINI_MODEL: str = "gemini-2.5-flash"
+    # nome resolvido via list_models() fica em MODEL_DIR/gemini_model.json, compartilhado entre workers
+    GEMINI_MODEL_CACHE_TTL_SECONDS: float = 24 * 3600
+    GEMINI_MODEL_RETRY_SECONDS: float = 60.0  # resolução que falhou (cache vencido/padrão) é refeita depois disso
+
+    # background: /health responde de imediato e o modelo carrega numa thread (ver /ready)
+    MODEL_LOAD_MODE: str = "background"  # background | eager
+
+    # tfidf: modelo fixo treinado no SEED; online: hashing + NB incremental, aprende com POST /api/feedback
+    CLASSIFIER_ENGINE: str = "tfidf"  # tfidf | online | multilabel (categoria + subtipo)
+    CLASSIFIER_FAST_PATH: bool = True  # inferência TF-IDF + NB sem o Pipeline do sklearn (ver CompiledNB)
+    ONLINE_N_FEATURES: int = 2 ** 18
+    ONLINE_KEEP_VERSIONS: int = 3
+    ONLINE_SYNC_SECONDS: float = 5.0  # intervalo para outros workers adotarem a versão nova
+
+    # registro de modelos: troca de versão em produção via /api/admin/models
+    ADMIN_TOKEN: str | None = None  # sem token, os endpoints administrativos ficam desligados
+    MODEL_MIN_ACCURACY: float = 0.7  # acurácia mínima do candidato no holdout
+    MODEL_MAX_REGRESSION: float = 0.05  # piora máxima tolerada em relação à versão ativa
+    SHADOW_MAX_PENDING: int = 64  # lotes aguardando a versão em sombra antes de descartar
+    MODEL_SYNC_SECONDS: float = 5.0  # intervalo para outros workers adotarem promoções e rollbacks
 
     CLASSIFY_CONF_THRESHOLD: float = 0.65
+    # abaixo do limiar, o modelo local escala a decisão para o LLM (quando AI_PROVIDER=gemini|fake)
+    CLASSIFY_CASCADE: bool = True
+    CLASSIFY_LLM_TIMEOUT_SECONDS: float = 3.0
+
+    # cliente do provedor de LLM: chamadas simultâneas, timeout, retries e circuit breaker
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_TIMEOUT_SECONDS: float = 15.0
+    LLM_RETRIES: int = 2
+    LLM_BACKOFF_BASE_SECONDS: float = 0.2
+    LLM_BACKOFF_MAX_SECONDS: float = 2.0
+    LLM_BREAKER_FAILURES: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    # respostas em lote: pedidos simultâneos dividem um prompt (array JSON por id);
+    # LLM_BATCH_MAX_ITEMS=1 desliga. Os lotes só enchem com STAGE_LIMIT_LLM folgado
+    LLM_BATCH_MAX_ITEMS: int = 1
+    LLM_BATCH_MAX_WAIT_MS: float = 20.0
+    # a chamada em lote gera uma resposta por email: o timeout cresce com o tamanho do lote
+    LLM_BATCH_TIMEOUT_PER_ITEM_SECONDS: float = 3.0
+    # compressão extrativa do email antes do LLM: sem histórico citado e assinatura, frases
+    # de maior peso TF-IDF dentro do orçamento (~4 caracteres por token); desligada, corta em N
+    PROMPT_COMPRESSION: bool = True
+    PROMPT_REPLY_TOKENS: int = 300
+    PROMPT_CLASSIFY_TOKENS: int = 750
+    FAKE_PROVIDER_LATENCY_MS: float = 200.0
+    FAKE_PROVIDER_FAILURE_RATE: float = 0.0
+
+    BATCH_MAX_ITEMS: int = 1000
+
+    # threads para trabalho bloqueante e limite de requisições simultâneas por estágio
+    CPU_WORKERS: int = 4
+    STAGE_LIMIT_PDF: int = 2
+    STAGE_LIMIT_ML: int = 4
+    STAGE_LIMIT_LLM: int = 16
+    # fila de espera por estágio; cheia, a requisição recebe 503 com Retry-After na hora
+    STAGE_QUEUE_PDF: int = 8
+    STAGE_QUEUE_ML: int = 64
+    STAGE_QUEUE_LLM: int = 64
+    STAGE_RETRY_AFTER_SECONDS: float = 1.0
+    # com o LLM sem vagas e mais que isso esperando, respostas caem para template
+    # e a escalação da cascata fica com a predição local
+    LLM_SHED_QUEUE: int = 16
+
+    # limite de requisições por cliente (token bucket) nas rotas /api
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_SECOND: float = 10.0
+    RATE_LIMIT_BURST: int = 30
+    # cabeçalho com a identidade do cliente, definido por um proxy confiável
+    # (ex.: X-Forwarded-For no Render); sem ele, o IP da conexão
+    RATE_LIMIT_KEY_HEADER: str | None = None
+    # proxies confiáveis que acrescentam ao cabeçalho (lista estilo X-Forwarded-For): vale a
+    # entrada nessa posição a partir da direita; as da esquerda vêm do próprio cliente
+    RATE_LIMIT_TRUSTED_HOPS: int = 1
+
+    # micro-batching: emails avulsos concorrentes passam juntos pelo modelo; maior espera,
+    # lotes maiores (mais vazão) e mais latência. MICRO_BATCH_MAX_ITEMS=1 desliga
+    MICRO_BATCH_MAX_ITEMS: int = 64
+    MICRO_BATCH_MAX_WAIT_MS: float = 2.0
+
+    # cache de resultados completos por hash do conteúdo (bytes do arquivo ou texto normalizado)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # fila de jobs assíncronos (POST /api/jobs), persistida em SQLite em JOBS_DIR
+    JOBS_ENABLED: bool = True
+    JOBS_DIR: str = "jobs"
+    JOBS_WORKERS: int = 2
+    JOBS_MAX_ATTEMPTS: int = 3
+    JOBS_RETRY_BASE_SECONDS: float = 2.0
+    JOBS_LEASE_SECONDS: float = 600.0
+    JOBS_POLL_SECONDS: float = 1.0
+
+    # ingestão de uploads: o texto extraído para no orçamento de caracteres
+    MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    MAX_PDF_PAGES: int = 50
+    TEXT_CHAR_BUDGET: int = 20000
+    UPLOAD_CHUNK_BYTES: int = 64 * 1024
+
+    # cache de respostas do LLM (L1 em memória, L2 SQLite opcional)
+    REPLY_CACHE_ENABLED: bool = True
+    REPLY_CACHE_SIZE: int = 1024
+    REPLY_CACHE_TTL_SECONDS: float = 24 * 3600
+    REPLY_CACHE_SQLITE_PATH: str | None = None
+    REPLY_CACHE_SQLITE_MAX_ROWS: int = 100_000  # acima disso, as entradas mais antigas saem
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -23,6 +130,3 @@ class Settings(BaseSettings):
     )
 
 settings = Settings()
-print(f"Settings carregadas - AI_PROVIDER: '{settings.AI_PROVIDER}', ENV: '{settings.ENV}'")
-print(f"AI_PROVIDER type: {type(settings.AI_PROVIDER)}")
-print(f"AI_PROVIDER repr: {repr(settings.AI_PROVIDER)}")
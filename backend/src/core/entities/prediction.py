@@ -0,0 +1,41 @@
+from src.core.enums.category import Category
+
+
+class Prediction(tuple):
+    """Par (categoria, confiança) com os rótulos extras de classificadores multi-rótulo.
+
+    Continua sendo uma tupla de dois elementos, então passa pelos wrappers (cascata,
+    registro de modelos) e por quem só desempacota `cat, conf` sem mudança.
+    `degraded` marca a predição local mantida porque a escalação ao LLM falhou.
+    `source` diz qual camada respondeu (classificador local ou `llm:<provedor>`).
+    """
+
+    def __new__(
+        cls,
+        category: Category,
+        confidence: float,
+        subtype: str | None = None,
+        probabilities: dict[str, float] | None = None,
+        degraded: bool = False,
+        source: str | None = None,
+    ):
+        self = super().__new__(cls, (category, confidence))
+        self.subtype = subtype
+        self.probabilities = probabilities or {}
+        self.degraded = degraded
+        self.source = source
+        return self
+
+    def __getnewargs__(self):
+        return (self[0], self[1], self.subtype, self.probabilities, self.degraded, self.source)
+
+
+def tag_source(pred: tuple, source: str) -> Prediction:
+    """A predição marcada com a camada que a produziu; uma origem já marcada por um
+    wrapper mais interno (ex.: o registro de modelos) é mantida."""
+    if getattr(pred, "source", None):
+        return pred
+    return Prediction(
+        pred[0], pred[1], getattr(pred, "subtype", None), getattr(pred, "probabilities", None),
+        getattr(pred, "degraded", False), source,
+    )
@@ -1,4 +1,4 @@
-from typing import Protocol, Tuple
+from typing import Protocol, Sequence, Tuple
 from src.core.entities.email import Email
 from src.core.enums.category import Category
 
@@ -6,3 +6,7 @@ class EmailClassifier(Protocol):
     def predict(self, email: Email) -> Tuple[Category, float]:
         """Retorna (categoria, confiança)."""
         ...
+
+    def predict_batch(self, emails: Sequence[Email]) -> list[Tuple[Category, float]]:
+        """Retorna (categoria, confiança) para cada email, na ordem de entrada."""
+        ...
@@ -1,5 +1,22 @@
-from typing import Protocol, Any
+from typing import Protocol, Any, ContextManager
+
+
+class ModelStoreError(RuntimeError):
+    """Falha ao gravar um artefato ou ponteiro: a versão nova não foi publicada."""
+
+
+class RegistryError(ValueError):
+    """Operação do registro de modelos recusada (versão inexistente, sem sombra, falha ao publicar).
+    Fica aqui, fora do ModelRegistry, para as rotas não importarem o sklearn."""
+
 
 class ModelStore(Protocol):
     def save(self, obj: Any) -> None: ...
     def load(self) -> Any | None: ...
+    def save_artifact(self, artifact: Any) -> Any: ...
+    def load_artifact(self, content_hash: str) -> Any | None: ...
+    def list_artifacts(self) -> list[dict]: ...
+    def delete_artifact(self, content_hash: str) -> None: ...
+    def save_pointer(self, name: str, data: dict) -> None: ...
+    def load_pointer(self, name: str) -> dict | None: ...
+    def lock(self, name: str) -> ContextManager[None]: ...
@@ -3,3 +3,7 @@ from typing import Protocol
 class ReplyGenerator(Protocol):
     def generate(self, category: str, original_text: str) -> str:
         ...
+
+class AsyncReplyGenerator(ReplyGenerator, Protocol):
+    async def agenerate(self, category: str, original_text: str) -> str:
+        ...
@@ -0,0 +1,8 @@
+from typing import Protocol
+
+class ReplyProvider(Protocol):
+    """Chamada crua a um LLM: prompt em texto, resposta em texto."""
+    name: str
+
+    async def complete(self, prompt: str) -> str:
+        ...
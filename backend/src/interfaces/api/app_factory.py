@@ -1,18 +1,134 @@
+from contextlib import asynccontextmanager
+import threading
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.config.settings import settings
-from src.adapters.persistence.local_model_store import LocalModelStore
-from src.adapters.nlp.sklearn_classifier import SklearnEmailClassifier
-from src.adapters.reply.templates import TemplateReplyGenerator
-
-from src.adapters.reply.gemini_reply import GeminiReplyGenerator
+from src.adapters.runtime.stages import StageExecutor, StageSaturated
+from src.adapters.observability.log import configure_logging, get_logger
+from src.adapters.observability.metrics import REGISTRY, stats_samples
+from src.adapters.observability.startup import StartupProfile
 
+from src.interfaces.api.middleware import InFlightMiddleware, MaxBodySizeMiddleware, RateLimitMiddleware
 from src.interfaces.api.routes.email_routes import router
+from src.interfaces.api.routes.admin_routes import router as admin_router
+from src.interfaces.api.routes.job_routes import router as job_router
 from src.use_cases.classify_email import ClassifyEmailUseCase
 
-def create_app() -> FastAPI:
-    app = FastAPI(title="Email Classifier API", version="0.1.0")
+log = get_logger(__name__)
+
+def _resolve_llm_model() -> None:
+    # resolve o modelo Gemini (cache em disco ou list_models) fora da primeira requisição;
+    # roda em cada worker, depois do fork
+    try:
+        from src.adapters.reply.gemini_reply import resolve_gemini_model
+        resolve_gemini_model()
+    except Exception:
+        log.exception("gemini_model_warmup_failed")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.AI_PROVIDER.lower() == "gemini":
+        threading.Thread(target=_resolve_llm_model, name="gemini-resolve", daemon=True).start()
+    runner = app.state.job_runner
+    if runner is not None:
+        await runner.start()
+    yield
+    if runner is not None:
+        await runner.stop()
+    # espera o trabalho em andamento nos pools antes de encerrar o processo
+    app.state.stages.shutdown()
+
+def build_use_case(stages: StageExecutor, profile: StartupProfile | None = None) -> ClassifyEmailUseCase:
+    """Importa e inicializa os adaptadores pesados (sklearn, Gemini) sob demanda."""
+    profile = profile or StartupProfile()
+
+    with profile.step("import", "src.adapters.persistence.local_model_store"):
+        from src.adapters.persistence.local_model_store import LocalModelStore
+    engine = settings.CLASSIFIER_ENGINE.lower()
+    if engine == "online":
+        with profile.step("import", "src.adapters.nlp.online_classifier"):
+            from src.adapters.nlp.online_classifier import OnlineEmailClassifier
+        with profile.step("init", "OnlineEmailClassifier"):
+            classifier = OnlineEmailClassifier(LocalModelStore())
+    elif engine == "multilabel":
+        with profile.step("import", "src.adapters.nlp.multilabel_classifier"):
+            from src.adapters.nlp.multilabel_classifier import MultiLabelEmailClassifier
+        with profile.step("init", "MultiLabelEmailClassifier"):
+            classifier = MultiLabelEmailClassifier(LocalModelStore())
+    else:
+        with profile.step("import", "src.adapters.nlp.sklearn_classifier"):
+            from src.adapters.nlp.sklearn_classifier import SklearnEmailClassifier
+        with profile.step("init", "SklearnEmailClassifier"):
+            classifier = SklearnEmailClassifier(LocalModelStore())
+    with profile.step("import", "src.adapters.nlp.model_registry"):
+        from src.adapters.nlp.model_registry import ModelRegistry
+    classifier = ModelRegistry(classifier, classifier.store)
+
+    provider = settings.AI_PROVIDER.lower()
+    if provider in ("gemini", "fake"):
+        compressor = None
+        if settings.PROMPT_COMPRESSION:
+            from src.adapters.nlp.prompt_compression import PromptCompressor
+            # usa o vocabulário/idf da versão ativa do registro; roda no estágio ml (ver LLMReplyGenerator)
+            compressor = PromptCompressor(classifier)
+        if provider == "gemini":
+            with profile.step("import", "src.adapters.reply.gemini_reply"):
+                from src.adapters.reply.gemini_reply import GeminiReplyGenerator
+            with profile.step("init", "GeminiReplyGenerator"):
+                reply = llm = GeminiReplyGenerator(compressor=compressor, stages=stages)
+        else:
+            from src.adapters.reply.client import ProviderClient
+            from src.adapters.reply.fake_provider import FakeProvider
+            from src.adapters.reply.llm_reply import LLMReplyGenerator
+            reply = llm = LLMReplyGenerator(ProviderClient(FakeProvider()), compressor=compressor, stages=stages)
+        if settings.CLASSIFY_CASCADE:
+            from src.adapters.nlp.cascade_classifier import CascadeEmailClassifier
+            classifier = CascadeEmailClassifier(classifier, llm)
+        if settings.REPLY_CACHE_ENABLED:
+            from src.adapters.reply.cache import CachedReplyGenerator, SqliteReplyCache
+            disk = None
+            if settings.REPLY_CACHE_SQLITE_PATH:
+                disk = SqliteReplyCache(settings.REPLY_CACHE_SQLITE_PATH, settings.REPLY_CACHE_TTL_SECONDS)
+            reply = CachedReplyGenerator(reply, disk=disk)
+        from src.adapters.reply.llm_reply import FallbackReplyGenerator
+        reply = FallbackReplyGenerator(reply)
+    else:
+        from src.adapters.reply.templates import TemplateReplyGenerator
+        reply = TemplateReplyGenerator()
+
+    log.info(
+        "app_configured",
+        env=settings.ENV,
+        ai_provider=settings.AI_PROVIDER,
+        classifier=type(classifier).__name__,
+        reply=type(reply).__name__,
+    )
+    results = None
+    if settings.RESULT_CACHE_ENABLED:
+        from src.adapters.runtime.result_cache import ResultCache
+        results = ResultCache()
+    return ClassifyEmailUseCase(classifier, reply, stages, results)
+
+def _load(app: FastAPI) -> None:
+    try:
+        app.state.uc = build_use_case(app.state.stages, app.state.startup)
+        app.state.startup.mark_ready()
+        log.info("app_ready", **{"ready_after_ms": app.state.startup.ready_ms})
+    except Exception as e:
+        app.state.load_error = repr(e)
+        log.exception("app_load_failed")
+    finally:
+        app.state.loaded.set()
+
+def create_app(load_mode: str | None = None) -> FastAPI:
+    """load_mode: "background" (padrão) responde /health na hora e carrega o modelo numa
+    thread; "eager" carrega antes de retornar (usado pelo modo pre-fork)."""
+    profile = StartupProfile()
+    configure_logging()
+    app = FastAPI(title="Email Classifier API", version="0.1.0", lifespan=lifespan)
 
     import os
     
@@ -29,24 +145,38 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    # folga para os cabeçalhos multipart além do próprio arquivo
+    app.add_middleware(MaxBodySizeMiddleware, max_bytes=settings.MAX_UPLOAD_BYTES + 64 * 1024)
+    app.add_middleware(InFlightMiddleware)
+    app.state.rate_limiter = None
+    if settings.RATE_LIMIT_ENABLED:
+        from src.adapters.runtime.rate_limit import TokenBucketLimiter
+        app.state.rate_limiter = TokenBucketLimiter()
+        app.add_middleware(
+            RateLimitMiddleware,
+            limiter=app.state.rate_limiter,
+            key_header=settings.RATE_LIMIT_KEY_HEADER,
+            trusted_hops=settings.RATE_LIMIT_TRUSTED_HOPS,
+        )
 
-    store = LocalModelStore()
-    classifier = SklearnEmailClassifier(store)
+    @app.exception_handler(StageSaturated)
+    async def stage_saturated(request, exc: StageSaturated):
+        return JSONResponse(
+            {"detail": "Servidor sobrecarregado. Tente novamente em instantes.", "stage": exc.stage},
+            status_code=503,
+            headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+        )
 
-    print(f"AI_PROVIDER configurado: '{settings.AI_PROVIDER}'")
-    print(f"AI_PROVIDER.lower() == 'gemini': {settings.AI_PROVIDER.lower() == 'gemini'}")
-    
-    if settings.AI_PROVIDER.lower() == "gemini":
-        print("Usando GeminiReplyGenerator")
-        reply = GeminiReplyGenerator()
-    else:
-        print("Usando TemplateReplyGenerator")
-        reply = TemplateReplyGenerator()
-    
-    print(f"Reply generator criado: {type(reply).__name__}")
-
-    uc = ClassifyEmailUseCase(classifier, reply)
-    app.state.uc = uc
+    app.state.startup = profile
+    app.state.stages = StageExecutor()
+    app.state.uc = None
+    app.state.load_error = None
+    app.state.loaded = threading.Event()
+    app.state.job_runner = None
+    if settings.JOBS_ENABLED:
+        from src.adapters.persistence.job_store import SqliteJobStore
+        from src.use_cases.process_jobs import JobRunner
+        app.state.job_runner = JobRunner(SqliteJobStore(), lambda: app.state.uc)
 
     from fastapi import Depends
     def get_uc():
@@ -56,9 +186,78 @@ def create_app() -> FastAPI:
         r.dependant.dependencies.insert(0, Depends(get_uc))
 
     app.include_router(router, prefix="/api")
+    app.include_router(job_router, prefix="/api")
+    app.include_router(admin_router, prefix="/api")
 
     @app.get("/health")
     def health():
         return {"status": "ok"}
 
+    @app.get("/ready")
+    def ready():
+        # /health indica que o processo responde; /ready, que o modelo está carregado
+        if app.state.uc is not None:
+            return {"status": "ready", "startup": app.state.startup.report()}
+        status = "failed" if app.state.load_error else "loading"
+        return JSONResponse(
+            {"status": status, "error": app.state.load_error, "startup": app.state.startup.report()},
+            status_code=503,
+            headers={"Retry-After": "1"},
+        )
+
+    def component_stats() -> dict:
+        # contadores dos componentes que os expõem (cascata, registro de modelos, caches, fila de jobs)
+        uc = app.state.uc
+        components = [
+            ("stages", app.state.stages),
+            ("rate_limit", app.state.rate_limiter),
+            ("jobs", app.state.job_runner),
+        ]
+        if uc is not None:
+            from src.adapters.nlp.model_registry import find_registry
+            models = find_registry(uc.classifier)
+            if uc.classifier is not models:
+                components.append(("classifier", uc.classifier))
+            components += [
+                ("models", models),
+                ("micro_batch", uc.batcher),
+                ("reply", uc.reply),
+                ("results", uc.results),
+            ]
+        return {name: comp.stats() for name, comp in components if hasattr(comp, "stats")}
+
+    def collect():
+        stages = app.state.stages
+        samples = [
+            ("email_stage_in_flight", "gauge", float(stages.in_flight(st)), {"stage": st})
+            for st in stages.limits
+        ]
+        for name, stats in component_stats().items():
+            # estatísticas por versão de modelo viram label, não nome de métrica
+            samples.extend(stats_samples(f"email_{name}", stats, labels={"versions": "version"}))
+        return samples
+
+    REGISTRY.add_collector("app", collect)
+
+    @app.get("/diagnostics")
+    def diagnostics():
+        out = {"ai_provider": settings.AI_PROVIDER, "gemini_model": None}
+        if settings.AI_PROVIDER.lower() == "gemini":
+            from src.adapters.reply.gemini_reply import resolution_diagnostics
+            out["gemini_model"] = resolution_diagnostics()
+        return out
+
+    @app.get("/stats")
+    def stats():
+        return component_stats()
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+    if (load_mode or settings.MODEL_LOAD_MODE) == "eager":
+        _load(app)
+    else:
+        threading.Thread(target=_load, args=(app,), name="model-loader", daemon=True).start()
+    profile.mark("create_app")
     return app
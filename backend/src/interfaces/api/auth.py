@@ -0,0 +1,14 @@
+import hmac
+
+from fastapi import HTTPException
+
+from src.config.settings import settings
+
+
+def require_admin(token: str | None) -> None:
+    """Valida o header X-Admin-Token. Sem ADMIN_TOKEN configurado, as rotas protegidas
+    ficam desligadas (404)."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(404, "Endpoints administrativos desabilitados.")
+    if token is None or not hmac.compare_digest(token, settings.ADMIN_TOKEN):
+        raise HTTPException(401, "Token administrativo inválido.")
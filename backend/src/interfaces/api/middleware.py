@@ -0,0 +1,104 @@
+import math
+
+from starlette.exceptions import HTTPException
+
+from src.adapters.observability.metrics import IN_FLIGHT
+from src.adapters.runtime.rate_limit import TokenBucketLimiter
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class MaxBodySizeMiddleware:
+    """Recusa corpos acima do limite antes do parsing multipart.
+
+    Verifica o Content-Length e, para corpos chunked, conta os bytes conforme chegam.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        length = dict(scope["headers"]).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_bytes:
+            response = PlainTextResponse("Payload muito grande.", status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(413, "Payload muito grande.")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class InFlightMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with IN_FLIGHT.track():
+            await self.app(scope, receive, send)
+
+
+class RateLimitMiddleware:
+    """429 com Retry-After quando o cliente esgota o seu token bucket.
+
+    Só as rotas sob `prefix` contam; /health, /ready e /metrics ficam livres para
+    probes e scrapers.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: TokenBucketLimiter,
+        key_header: str | None = None,
+        prefix: str = "/api",
+        trusted_hops: int = 1,
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.key_header = key_header.lower().encode() if key_header else None
+        self.prefix = prefix
+        self.trusted_hops = max(1, trusted_hops)
+
+    def _client_key(self, scope: Scope) -> str:
+        if self.key_header is not None:
+            value = dict(scope["headers"]).get(self.key_header)
+            if value:
+                # X-Forwarded-For: cada proxy acrescenta à direita o endereço de quem o chamou.
+                # As entradas à esquerda vêm do cliente e podem ser forjadas; vale a que o
+                # proxy confiável mais externo gravou
+                hops = [h.strip() for h in value.decode("latin-1").split(",")]
+                return hops[max(len(hops) - self.trusted_hops, 0)]
+        client = scope.get("client")
+        return client[0] if client else "-"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+        wait = self.limiter.acquire(self._client_key(scope))
+        if wait > 0:
+            response = JSONResponse(
+                {"detail": "Muitas requisições. Tente novamente em instantes."},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -0,0 +1,74 @@
+import asyncio
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Header, HTTPException, Request
+
+from src.core.protocols.model_store import RegistryError
+from src.interfaces.api.auth import require_admin
+from src.interfaces.api.schemas import ModelLoadRequest
+
+if TYPE_CHECKING:
+    from src.adapters.nlp.model_registry import ModelRegistry
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+def _registry(request: Request, token: str | None) -> "ModelRegistry":
+    require_admin(token)
+    # import tardio: o registro puxa o sklearn, que não deve pesar no import do app
+    from src.adapters.nlp.model_registry import find_registry
+
+    uc = request.app.state.uc
+    if uc is None:
+        raise HTTPException(503, "Modelo ainda carregando.", headers={"Retry-After": "1"})
+    registry = find_registry(uc.classifier)
+    if registry is None:
+        raise HTTPException(409, "Registro de modelos indisponível.")
+    return registry
+
+@router.get("/models")
+async def list_models(request: Request, x_admin_token: str | None = Header(None)) -> dict:
+    """Versão ativa, em sombra e anterior, estatísticas por versão e artefatos disponíveis."""
+    registry = _registry(request, x_admin_token)
+    artifacts = await asyncio.to_thread(registry.store.list_artifacts)
+    return {
+        **registry.stats(),
+        "available": [
+            {"version": m["content_hash"][:16], "engine": m.get("meta", {}).get("engine", "tfidf"), "modified_at": m["modified_at"]}
+            for m in artifacts
+        ],
+    }
+
+@router.post("/models/load", status_code=202)
+async def load_model(request: Request, body: ModelLoadRequest, x_admin_token: str | None = Header(None)) -> dict:
+    """Carrega e valida a versão em background; acompanhe o campo `candidate` em GET /admin/models."""
+    registry = _registry(request, x_admin_token)
+    try:
+        return await asyncio.to_thread(registry.load_candidate, body.version, body.mode)
+    except RegistryError as e:
+        raise HTTPException(409, str(e))
+
+@router.post("/models/promote")
+async def promote_model(request: Request, x_admin_token: str | None = Header(None)) -> dict:
+    registry = _registry(request, x_admin_token)
+    try:
+        # grava o ponteiro lido pelos outros workers: fora do event loop
+        return {"active": (await asyncio.to_thread(registry.promote))[:16]}
+    except RegistryError as e:
+        raise HTTPException(409, str(e))
+
+@router.post("/models/rollback")
+async def rollback_model(request: Request, x_admin_token: str | None = Header(None)) -> dict:
+    registry = _registry(request, x_admin_token)
+    try:
+        return {"active": (await asyncio.to_thread(registry.rollback))[:16]}
+    except RegistryError as e:
+        raise HTTPException(409, str(e))
+
+@router.delete("/models/shadow")
+async def stop_shadow(request: Request, x_admin_token: str | None = Header(None)) -> dict:
+    registry = _registry(request, x_admin_token)
+    try:
+        await asyncio.to_thread(registry.stop_shadow)
+    except RegistryError as e:
+        raise HTTPException(409, str(e))
+    return {"shadow": None}
@@ -1,33 +1,124 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
-from pypdf import PdfReader
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Request
+from pydantic import ValidationError
 import io
 
-from src.interfaces.api.schemas import ProcessEmailResponse
+from src.adapters.parsers.ingestion import (
+    InvalidDocument,
+    UnsupportedFormat,
+    UploadTooLarge,
+    extract_pdf_text,
+    read_upload_text,
+)
+from src.adapters.observability.metrics import stage_timer
+from src.adapters.runtime.result_cache import file_digest
+from src.config.settings import settings
+from src.core.protocols.model_store import ModelStoreError
+from src.interfaces.api.auth import require_admin
+from src.interfaces.api.schemas import (
+    FeedbackRequest,
+    FeedbackResponse,
+    ProcessEmailBatchRequest,
+    ProcessEmailRequest,
+    ProcessEmailResponse,
+)
 from src.use_cases.classify_email import ClassifyEmailUseCase, ClassifyEmailInput
+from src.use_cases.submit_feedback import FeedbackInput, SubmitFeedbackUseCase
 
 router = APIRouter(tags=["emails"])
 
 def _read_pdf_bytes(data: bytes) -> str:
-    r = PdfReader(io.BytesIO(data))
-    txt = []
-    for p in r.pages:
-        txt.append(p.extract_text() or "")
-    return "\n".join(txt).strip()
+    return extract_pdf_text(io.BytesIO(data))
+
+def _read_upload(file: UploadFile) -> str:
+    filename = file.filename or ""
+    stage = "pdf_extract" if filename.lower().endswith(".pdf") else "upload_read"
+    with stage_timer(stage):
+        return read_upload_text(file.file, filename, file.size)
+
+def _use_case(request: Request) -> ClassifyEmailUseCase:
+    uc: ClassifyEmailUseCase | None = request.app.state.uc
+    if uc is None:
+        raise HTTPException(503, "Modelo ainda carregando.", headers={"Retry-After": "1"})
+    return uc
+
+def _parse_batch_body(body: bytes, content_type: str) -> list[ProcessEmailRequest]:
+    try:
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            return [
+                ProcessEmailRequest.model_validate_json(line)
+                for line in body.splitlines()
+                if line.strip()
+            ]
+        return ProcessEmailBatchRequest.validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(422, e.errors(include_url=False, include_context=False, include_input=False))
 
 @router.post("/process_email", response_model=ProcessEmailResponse)
 async def process_email(request: Request, text: str | None = Form(None), file: UploadFile | None = File(None)) -> ProcessEmailResponse:
     if not text and not file:
         raise HTTPException(400, "Envie 'text' ou 'file' (.txt/.pdf).")
+    # Acessa o use case do estado da aplicação
+    uc = _use_case(request)
     content = text or ""
+    cache_key = None
     if file:
-        if file.filename.lower().endswith(".txt"):
-            content = (await file.read()).decode("utf-8", errors="ignore")
-        elif file.filename.lower().endswith(".pdf"):
-            content = _read_pdf_bytes(await file.read())
-        else:
-            raise HTTPException(400, "Formato não suportado. Use .txt ou .pdf.")
+        # mesmo arquivo reenviado: resultado direto do cache, sem extrair o PDF de novo
+        if uc.results is not None:
+            cache_key = uc.cache_key("file", await uc.stages.run("pdf", file_digest, file.file))
+            hit = uc.cached(cache_key)
+            if hit is not None:
+                return ProcessEmailResponse(**hit.__dict__)
+        # o upload já está em spool (memória/disco) pelo parser multipart; lemos só
+        # o necessário dele, no pool limitado, fora do event loop
+        try:
+            content = await uc.stages.run("pdf", _read_upload, file)
+        except UnsupportedFormat as e:
+            raise HTTPException(400, str(e))
+        except UploadTooLarge as e:
+            raise HTTPException(413, str(e))
+        except InvalidDocument:
+            raise HTTPException(400, "PDF inválido ou corrompido.")
 
-    # Acessa o use case do estado da aplicação
-    uc: ClassifyEmailUseCase = request.app.state.uc
-    out = uc.execute(ClassifyEmailInput(text=content))
+    out = await uc.execute(ClassifyEmailInput(text=content), cache_key=cache_key)
     return ProcessEmailResponse(**out.__dict__)
+
+@router.post("/process_email_batch", response_model=list[ProcessEmailResponse])
+async def process_email_batch(request: Request) -> list[ProcessEmailResponse]:
+    """Aceita um array JSON ou NDJSON de objetos {"text": ...}; resultados na ordem de entrada."""
+    items = _parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+    if not items:
+        raise HTTPException(400, "Envie ao menos um email no lote.")
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(413, f"Lote excede o limite de {settings.BATCH_MAX_ITEMS} emails.")
+
+    uc = _use_case(request)
+    outs = await uc.execute_batch([ClassifyEmailInput(text=i.text) for i in items])
+    return [ProcessEmailResponse(**o.__dict__) for o in outs]
+
+@router.post("/feedback", response_model=FeedbackResponse)
+async def submit_feedback(
+    request: Request, items: FeedbackRequest | list[FeedbackRequest], x_admin_token: str | None = Header(None)
+) -> FeedbackResponse:
+    """Rótulos corrigidos pelo operador ({"text", "category"} ou lista); atualizam o modelo
+    online de forma incremental e a nova versão passa a responder na hora. Exige o
+    X-Admin-Token: quem envia feedback muda o modelo que responde a todos."""
+    require_admin(x_admin_token)
+    uc = _use_case(request)
+    items = items if isinstance(items, list) else [items]
+    if not items:
+        raise HTTPException(400, "Envie ao menos um exemplo.")
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(413, f"Lote excede o limite de {settings.BATCH_MAX_ITEMS} exemplos.")
+    # quem aprende é o modelo local ativo (cascata -> registro -> classificador)
+    learner = getattr(uc.classifier, "local", uc.classifier)
+    learner = getattr(learner, "active", learner)
+    if not hasattr(learner, "learn"):
+        raise HTTPException(409, "O classificador atual não aprende com feedback (use CLASSIFIER_ENGINE=online).")
+    try:
+        out = await SubmitFeedbackUseCase(learner, uc.stages).execute(
+            [FeedbackInput(text=i.text, category=i.category) for i in items]
+        )
+    except ModelStoreError as e:
+        # nada foi aprendido: o modelo em uso continua o anterior e o cliente pode reenviar
+        raise HTTPException(503, str(e))
+    return FeedbackResponse(**out.__dict__)
@@ -0,0 +1,90 @@
+import asyncio
+from pathlib import Path
+
+from fastapi import APIRouter, File, Form, Header, HTTPException, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+
+from src.adapters.parsers.ingestion import UnsupportedFormat, ensure_supported
+from src.interfaces.api.schemas import JobResponse
+from src.use_cases.process_jobs import JobRunner
+
+router = APIRouter(tags=["jobs"])
+
+def _runner(request: Request) -> JobRunner:
+    runner: JobRunner | None = getattr(request.app.state, "job_runner", None)
+    if runner is None:
+        raise HTTPException(404, "Fila de jobs desabilitada.")
+    return runner
+
+async def _get_job(runner: JobRunner, job_id: str):
+    job = await asyncio.to_thread(runner.store.get, job_id)
+    if job is None:
+        raise HTTPException(404, "Job não encontrado.")
+    return job
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(
+    request: Request,
+    response: Response,
+    text: str | None = Form(None),
+    file: UploadFile | None = File(None),
+    priority: int = Form(0),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+) -> JobResponse:
+    """Enfileira o processamento e responde na hora; acompanhe por GET /jobs/{id} ou /jobs/{id}/events.
+    Reenvios com o mesmo Idempotency-Key devolvem o job original (200)."""
+    if not text and not file:
+        raise HTTPException(400, "Envie 'text' ou 'file' (.txt/.pdf).")
+    runner = _runner(request)
+
+    existing = await asyncio.to_thread(runner.store.get_by_key, idempotency_key)
+    if existing is not None:
+        response.status_code = 200
+        return JobResponse(**existing.as_dict())
+
+    if file:
+        try:
+            ensure_supported(file.filename)
+        except UnsupportedFormat as e:
+            raise HTTPException(400, str(e))
+        path = await asyncio.to_thread(runner.spool_upload, file.file, file.filename)
+        payload = {"file": str(path), "filename": file.filename}
+    else:
+        payload = {"text": text}
+
+    job, created = await asyncio.to_thread(runner.store.submit, payload, priority, idempotency_key)
+    if created:
+        runner.notify()
+    else:
+        # corrida entre dois envios com a mesma chave: vale o primeiro
+        response.status_code = 200
+        if "file" in payload:
+            Path(payload["file"]).unlink(missing_ok=True)
+    return JobResponse(**job.as_dict())
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(request: Request, job_id: str) -> JobResponse:
+    job = await _get_job(_runner(request), job_id)
+    return JobResponse(**job.as_dict())
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(request: Request, job_id: str) -> StreamingResponse:
+    """Server-Sent Events: um evento `status` por mudança, encerrando no estado final."""
+    runner = _runner(request)
+    await _get_job(runner, job_id)
+
+    async def stream():
+        async for job in runner.watch(job_id):
+            if await request.is_disconnected():
+                return
+            if job is None:
+                yield ": keep-alive\n\n"
+                continue
+            data = JobResponse(**job.as_dict()).model_dump_json()
+            yield f"event: status\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,4 +1,8 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, TypeAdapter
+
+from src.core.enums.category import Category
 
 class ProcessEmailRequest(BaseModel):
     text: str
@@ -9,4 +13,35 @@ class ProcessEmailResponse(BaseModel):
     suggested_reply: str
     classify_source: str
     reply_source: str | None = None
+    subtype: str | None = None
+
+
+ProcessEmailBatchRequest = TypeAdapter(list[ProcessEmailRequest])
+
+
+class FeedbackRequest(BaseModel):
+    text: str
+    category: Category
+
+class FeedbackResponse(BaseModel):
+    version: str
+    learned: int
+    samples: int
+
+
+class JobResponse(BaseModel):
+    id: str
+    status: str
+    priority: int
+    attempts: int
+    max_attempts: int
+    idempotency_key: str | None = None
+    result: ProcessEmailResponse | None = None
+    error: str | None = None
+    created_at: float
+    updated_at: float
+
 
+class ModelLoadRequest(BaseModel):
+    version: str  # hash completo ou prefixo (como aparece em /stats)
+    mode: Literal["shadow", "promote"] = "shadow"
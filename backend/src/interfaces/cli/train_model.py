@@ -0,0 +1,52 @@
+"""Treina uma nova versão TF-IDF + NB e grava o artefato no MODEL_DIR.
+
+    python -m src.interfaces.cli.train_model exemplos.jsonl [--no-seed]
+
+Cada linha do JSONL é {"text": ..., "category": "Produtivo" | "Improdutivo"}. A versão
+gravada não entra em produção sozinha: carregue-a por POST /api/admin/models/load.
+"""
+import argparse
+import json
+import sys
+
+from src.adapters.nlp.model_registry import accuracy
+from src.adapters.nlp.holdout import HOLDOUT
+from src.adapters.nlp.sklearn_classifier import (
+    SEED, SklearnEmailClassifier, pipeline_to_artifact, train_pipeline, training_hash,
+)
+from src.adapters.persistence.local_model_store import LocalModelStore
+from src.core.enums.category import Category
+
+
+def read_examples(path: str) -> list[tuple[str, Category]]:
+    out = []
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+                out.append((row["text"], Category(row["category"])))
+            except (ValueError, KeyError) as e:
+                raise SystemExit(f"{path}:{n}: linha inválida ({e})")
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("examples", help="JSONL com exemplos rotulados")
+    parser.add_argument("--no-seed", action="store_true", help="não inclui o dataset semente")
+    args = parser.parse_args(argv)
+
+    examples = ([] if args.no_seed else list(SEED)) + read_examples(args.examples)
+    content_hash = training_hash(examples)
+    store = LocalModelStore()
+    art = pipeline_to_artifact(train_pipeline(examples), content_hash)
+    store.save_artifact(art)
+    acc = accuracy(SklearnEmailClassifier.from_artifact(store, art), HOLDOUT)
+    print(json.dumps({"version": content_hash[:16], "samples": len(examples), "holdout_accuracy": acc}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,28 @@
+import asyncio
 from dataclasses import dataclass
-from src.adapters.nlp.preprocessing import is_toxic
+from src.adapters.nlp.cascade_classifier import keep_local
+from src.adapters.nlp.keywords import KeywordMatches, scan_keywords
+from src.adapters.reply.templates import TemplateReplyGenerator, reply_subtype
+from src.adapters.observability.log import get_logger
+from src.adapters.observability.metrics import CLASSIFICATIONS, REPLIES, stage_timer
+from src.adapters.runtime.micro_batch import MicroBatcher
+from src.adapters.runtime.result_cache import ResultCache, text_digest
+from src.adapters.runtime.stages import StageExecutor
+from src.config.settings import settings
 from src.core.enums.category import Category
 from src.core.entities.email import Email
 from src.core.protocols.classifier import EmailClassifier
 from src.core.protocols.reply_generator import ReplyGenerator
 
+log = get_logger(__name__)
+
+# reply_source das respostas degradadas por falta de vaga no estágio LLM
+SHED_SOURCE = "shed:template"
+# classify_source quando a escalação ao LLM falhou ou foi descartada e ficou a predição local
+LOCAL_FALLBACK_SOURCE = "fallback:local"
+# saídas degradadas (sobrecarga ou falha do provedor) não entram no cache de resultados
+DEGRADED_PREFIXES = ("shed:", "fallback:")
+
 @dataclass
 class ClassifyEmailInput:
     text: str
@@ -16,46 +34,215 @@ class ClassifyEmailOutput:
     suggested_reply: str
     classify_source: str
     reply_source: str | None = None
+    subtype: str | None = None
 
 
 class ClassifyEmailUseCase:
-    def __init__(self, classifier: EmailClassifier, reply: ReplyGenerator):
+    def __init__(
+        self,
+        classifier: EmailClassifier,
+        reply: ReplyGenerator,
+        stages: StageExecutor | None = None,
+        results: ResultCache | None = None,
+    ):
         self.classifier = classifier
         self.reply = reply
+        self.stages = stages or StageExecutor()
+        self.results = results
+        self.shed_reply = TemplateReplyGenerator()
+        # requisições concorrentes de um email viram um único lote no estágio ml
+        self.batcher: MicroBatcher | None = None
+        if settings.MICRO_BATCH_MAX_ITEMS > 1:
+            self.batcher = MicroBatcher(self._classify_items, self._run_ml)
 
-    def execute(self, inp: ClassifyEmailInput) -> ClassifyEmailOutput:
-        text = inp.text
-        print(f"Processando email: {text[:50]}...")
-        
-        # 1 guarda-chuva de segurança
-        if is_toxic(text):
-            print("Email detectado como tóxico")
-            category = Category.IMPRODUTIVO
-            confidence = 0.99
-            suggested = self.reply.generate("Improdutivo", text)
-            if hasattr(self.reply, "generate_subtype"):
-                suggested = self.reply.generate_subtype("toxico", text)
-            return ClassifyEmailOutput(
-                category=category.value,
-                confidence=confidence,
-                suggested_reply=suggested,
-                classify_source="rule:toxicity",
-                reply_source=type(self.reply).__name__,
-            )
-
-        # 2 fluxo normal
-        print("Classificando email com ML...")
-        email = Email(text=text)
-        category, confidence = self.classifier.predict(email)
-        print(f"Classificação: {category.value} ({confidence:.3f})")
-        
-        suggested = self.reply.generate(category.value, text)
-        print("Resposta gerada com sucesso")
-        
-        return ClassifyEmailOutput(
+    def cache_key(self, kind: str, digest: str) -> str | None:
+        """Chave do cache de resultados, amarrada à versão do modelo e ao gerador de
+        respostas: um modelo retreinado não reaproveita resultados antigos."""
+        if self.results is None:
+            return None
+        version = getattr(self.classifier, "version", None) or "-"
+        return f"{version}:{type(self.reply).__name__}:{kind}:{digest}"
+
+    def cached(self, key: str | None) -> ClassifyEmailOutput | None:
+        return self.results.get(key) if key is not None else None
+
+    @staticmethod
+    def degraded(out: ClassifyEmailOutput) -> bool:
+        return out.classify_source.startswith(DEGRADED_PREFIXES) or (
+            out.reply_source or ""
+        ).startswith(DEGRADED_PREFIXES)
+
+    def _remember(self, key: str | None, out: ClassifyEmailOutput) -> None:
+        # uma saída degradada ficaria no cache mesmo depois de o provedor voltar
+        if key is not None and not self.degraded(out):
+            self.results.set(key, out)
+
+    async def _generate_reply(
+        self, category: Category, text: str, matches: KeywordMatches, subtype: str
+    ) -> tuple[str, str]:
+        """(resposta, reply_source)."""
+        with stage_timer("reply_generation"):
+            return await self._generate_reply_inner(category, text, matches, subtype)
+
+    async def _generate_reply_inner(
+        self, category: Category, text: str, matches: KeywordMatches, subtype: str
+    ) -> tuple[str, str]:
+        source = getattr(self.reply, "source", None) or type(self.reply).__name__
+        # geradores baseados em template usam o subtipo já decidido (modelo ou varredura)
+        if hasattr(self.reply, "generate_subtype"):
+            return self.reply.generate_subtype(subtype, text), source
+        if self.stages.should_shed("llm", settings.LLM_SHED_QUEUE):
+            # LLM saturado: template na hora em vez de esperar na fila, latência limitada
+            return self.shed_reply.generate_subtype(subtype, text), SHED_SOURCE
+        # geradores com fallback informam a origem de cada resposta (ver FallbackReplyGenerator)
+        if hasattr(self.reply, "agenerate_sourced"):
+            async with self.stages.limit("llm"):
+                return await self.reply.agenerate_sourced(category.value, text)
+        if hasattr(self.reply, "agenerate"):
+            async with self.stages.limit("llm"):
+                return await self.reply.agenerate(category.value, text), source
+        if hasattr(self.reply, "generate_sourced"):
+            return await self.stages.run("llm", self.reply.generate_sourced, category.value, text)
+        return await self.stages.run("llm", self.reply.generate, category.value, text), source
+
+    def _classify(self, text: str) -> tuple[KeywordMatches, tuple[Category, float] | None]:
+        with stage_timer("toxicity_rule"):
+            matches = scan_keywords(text)
+        if matches.has("toxic"):
+            return matches, None
+        # classificadores em cascata: só a fase local roda aqui; a escalação é async
+        predict = getattr(self.classifier, "predict_local", self.classifier.predict)
+        return matches, predict(Email(text=text))
+
+    def _classify_batch(
+        self, texts: list[str]
+    ) -> tuple[list[KeywordMatches], list[tuple[Category, float] | None]]:
+        with stage_timer("toxicity_rule"):
+            scans = [scan_keywords(t) for t in texts]
+        # a regra de toxicidade decide por item; o restante vai para o ML em um único lote
+        pending = [i for i, m in enumerate(scans) if not m.has("toxic")]
+        preds: list[tuple[Category, float] | None] = [None] * len(texts)
+        predict_batch = getattr(self.classifier, "predict_local_batch", self.classifier.predict_batch)
+        for i, pred in zip(pending, predict_batch([Email(text=texts[i]) for i in pending])):
+            preds[i] = pred
+        return scans, preds
+
+    def _classify_items(self, texts: list[str]) -> list[tuple[KeywordMatches, tuple[Category, float] | None]]:
+        return list(zip(*self._classify_batch(texts)))
+
+    async def _run_ml(self, fn, texts: list[str]):
+        return await self.stages.run("ml", fn, texts)
+
+    async def _classify_one(self, text: str) -> tuple[KeywordMatches, tuple[Category, float] | None]:
+        if self.batcher is not None:
+            return await self.batcher.submit(text)
+        return await self.stages.run("ml", self._classify, text)
+
+    def _record(self, out: ClassifyEmailOutput) -> ClassifyEmailOutput:
+        CLASSIFICATIONS.inc(classify_source=out.classify_source)
+        REPLIES.inc(reply_source=out.reply_source or "")
+        return out
+
+    async def _toxic_output(self, text: str, matches: KeywordMatches) -> ClassifyEmailOutput:
+        category = Category.IMPRODUTIVO
+        confidence = 0.99
+        subtype = reply_subtype(category.value, matches)
+        suggested, reply_source = await self._generate_reply(category, text, matches, subtype)
+        return self._record(ClassifyEmailOutput(
+            category=category.value,
+            confidence=confidence,
+            suggested_reply=suggested,
+            classify_source="rule:toxicity",
+            reply_source=reply_source,
+            subtype=subtype,
+        ))
+
+    async def _ml_output(
+        self, text: str, matches: KeywordMatches, category: Category, confidence: float,
+        subtype: str | None = None, degraded: bool = False, source: str | None = None,
+    ) -> ClassifyEmailOutput:
+        # classificadores multi-rótulo já trazem o subtipo; senão, vem da varredura de palavras-chave
+        subtype = subtype or reply_subtype(category.value, matches)
+        suggested, reply_source = await self._generate_reply(category, text, matches, subtype)
+        return self._record(ClassifyEmailOutput(
             category=category.value,
             confidence=round(confidence, 4),
             suggested_reply=suggested,
-            classify_source=type(self.classifier).__name__,
-            reply_source=type(self.reply).__name__,
+            # a cascata e o ModelRegistry marcam na predição a camada que de fato respondeu
+            classify_source=LOCAL_FALLBACK_SOURCE if degraded else (
+                source or getattr(self.classifier, "source", None) or type(self.classifier).__name__
+            ),
+            reply_source=reply_source,
+            subtype=subtype,
+        ))
+
+    async def _escalate(self, text: str, pred: tuple[Category, float]) -> tuple[Category, float]:
+        if not hasattr(self.classifier, "aescalate") or not self.classifier.should_escalate(pred):
+            return pred
+        if self.stages.should_shed("llm", settings.LLM_SHED_QUEUE):
+            return keep_local(pred)  # sob sobrecarga, fica a predição local
+        async with self.stages.limit("llm"):
+            return await self.classifier.aescalate(Email(text=text), pred)
+
+    async def _output(
+        self, text: str, matches: KeywordMatches, pred: tuple[Category, float] | None
+    ) -> ClassifyEmailOutput:
+        if pred is None:
+            return await self._toxic_output(text, matches)
+        pred = await self._escalate(text, pred)
+        # a resposta do LLM não traz subtipo: ele só vale se a predição local ficou
+        return await self._ml_output(
+            text, matches, *pred,
+            subtype=getattr(pred, "subtype", None), degraded=getattr(pred, "degraded", False),
+            source=getattr(pred, "source", None),
+        )
+
+    async def execute(self, inp: ClassifyEmailInput, cache_key: str | None = None) -> ClassifyEmailOutput:
+        """cache_key: chave já calculada pelo chamador (ex.: hash dos bytes do arquivo);
+        sem ela, o texto normalizado é a chave."""
+        text = inp.text
+        if cache_key is None and self.results is not None:
+            cache_key = self.cache_key("text", text_digest(text))
+        hit = self.cached(cache_key)
+        if hit is not None:
+            return hit
+
+        # 1 regra de toxicidade + 2 ML, fora do event loop (em lote com as requisições concorrentes)
+        matches, pred = await self._classify_one(text)
+        out = await self._output(text, matches, pred)
+        log.debug(
+            "email_classified",
+            chars=len(text),
+            category=out.category,
+            confidence=out.confidence,
+            classify_source=out.classify_source,
         )
+        self._remember(cache_key, out)
+        return out
+
+    async def execute_batch(self, inputs: list[ClassifyEmailInput]) -> list[ClassifyEmailOutput]:
+        keys = [
+            self.cache_key("text", text_digest(inp.text)) if self.results is not None else None
+            for inp in inputs
+        ]
+        outs: list[ClassifyEmailOutput | None] = [self.cached(k) for k in keys]
+        # só os itens fora do cache passam pelo modelo; duplicatas no lote rodam uma vez
+        first: dict[str, int] = {}
+        pending: list[int] = []
+        for i, out in enumerate(outs):
+            if out is None and (keys[i] is None or first.setdefault(keys[i], i) == i):
+                pending.append(i)
+        if pending:
+            texts = [inputs[i].text for i in pending]
+            scans, preds = await self.stages.run("ml", self._classify_batch, texts)
+            # respostas em paralelo (limitadas pelo estágio llm), preservando a ordem de entrada
+            results = await asyncio.gather(*(
+                self._output(t, m, p) for t, m, p in zip(texts, scans, preds)
+            ))
+            for i, out in zip(pending, results):
+                outs[i] = out
+                self._remember(keys[i], out)
+        for i, out in enumerate(outs):
+            if out is None:
+                outs[i] = outs[first[keys[i]]]
+        return outs
@@ -0,0 +1,221 @@
+import asyncio
+import random
+import shutil
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Callable
+
+from src.adapters.observability.log import get_logger
+from src.adapters.observability.metrics import stage_timer
+from src.adapters.parsers.ingestion import InvalidDocument, UnsupportedFormat, UploadTooLarge, read_upload_text
+from src.adapters.persistence.job_store import Job, SqliteJobStore
+from src.config.settings import settings
+from src.use_cases.classify_email import ClassifyEmailInput, ClassifyEmailUseCase
+
+log = get_logger(__name__)
+
+# erros do próprio documento: tentar de novo não muda o resultado
+PERMANENT_ERRORS = (UnsupportedFormat, UploadTooLarge, InvalidDocument)
+
+
+class JobRunner:
+    """Workers assíncronos, no event loop da aplicação, que consomem a fila persistente e
+    executam o ClassifyEmailUseCase. Jobs que falham voltam à fila com backoff até
+    max_attempts; mudanças de status são publicadas para quem acompanha o job (SSE).
+    Enquanto um job roda, o lease é renovado a cada terço do seu prazo, para que um job
+    longo não seja retomado por outro worker."""
+
+    def __init__(
+        self,
+        store: SqliteJobStore,
+        get_use_case: Callable[[], ClassifyEmailUseCase | None],
+        workers: int | None = None,
+        poll_seconds: float | None = None,
+        retry_base: float | None = None,
+    ):
+        self.store = store
+        self.get_use_case = get_use_case
+        self.workers = workers or settings.JOBS_WORKERS
+        self.poll = poll_seconds if poll_seconds is not None else settings.JOBS_POLL_SECONDS
+        self.retry_base = retry_base if retry_base is not None else settings.JOBS_RETRY_BASE_SECONDS
+        self.uploads_dir = store.path.parent / "uploads"
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = False
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        # contagem por status, atualizada em segundo plano: stats() não consulta o SQLite
+        self._counts: dict[str, int] = {}
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+
+    # -- submissão ------------------------------------------------------------
+
+    def spool_upload(self, fileobj: BinaryIO, filename: str) -> Path:
+        """Copia o upload para o diretório da fila: o job pode rodar depois do fim da requisição."""
+        self.uploads_dir.mkdir(parents=True, exist_ok=True)
+        path = self.uploads_dir / f"{uuid.uuid4().hex}{Path(filename).suffix.lower()}"
+        fileobj.seek(0)
+        with open(path, "wb") as out:
+            shutil.copyfileobj(fileobj, out, settings.UPLOAD_CHUNK_BYTES)
+        return path
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # -- ciclo de vida --------------------------------------------------------
+
+    async def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._refresh_counts(), name="job-counts"))
+
+    async def stop(self, grace: float = 10.0) -> None:
+        # workers ociosos saem na hora; jobs em andamento têm `grace` segundos para terminar
+        # e, se interrompidos, voltam à fila (ver _worker)
+        if not self._tasks:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        _, pending = await asyncio.wait(self._tasks, timeout=grace)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    async def _idle(self) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.poll)
+        except asyncio.TimeoutError:
+            pass
+        if not self._stopping:
+            self._wakeup.clear()
+
+    async def _refresh_counts(self) -> None:
+        while not self._stopping:
+            try:
+                self._counts = await asyncio.to_thread(self.store.counts)
+            except Exception:
+                log.exception("job_counts_failed")
+            await asyncio.sleep(self.poll)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.store.lease / 3)
+            if not await asyncio.to_thread(self.store.renew, job_id):
+                log.warning("job_lease_lost", job_id=job_id)
+                return
+
+    async def _worker(self) -> None:
+        while not self._stopping:
+            uc = self.get_use_case()
+            if uc is None:
+                # modelo ainda carregando (MODEL_LOAD_MODE=background)
+                await self._idle()
+                continue
+            job = await asyncio.to_thread(self.store.claim)
+            if job is None:
+                await self._idle()
+                continue
+            self._publish(job)
+            heartbeat = asyncio.create_task(self._heartbeat(job.id))
+            try:
+                await self._run(uc, job)
+            except asyncio.CancelledError:
+                await asyncio.to_thread(self.store.release, job.id)
+                raise
+            except Exception:
+                log.exception("job_worker_error", job_id=job.id)
+            finally:
+                heartbeat.cancel()
+
+    # -- execução -------------------------------------------------------------
+
+    @staticmethod
+    def _read_file(path: str, filename: str) -> str:
+        stage = "pdf_extract" if filename.lower().endswith(".pdf") else "upload_read"
+        with stage_timer(stage), open(path, "rb") as f:
+            return read_upload_text(f, filename, Path(path).stat().st_size)
+
+    async def _load_text(self, uc: ClassifyEmailUseCase, payload: dict) -> str:
+        if "text" in payload:
+            return payload["text"]
+        return await uc.stages.run("pdf", self._read_file, payload["file"], payload["filename"])
+
+    def _retry_delay(self, attempts: int) -> float:
+        return self.retry_base * 2 ** (attempts - 1) * random.uniform(0.5, 1.0)
+
+    async def _run(self, uc: ClassifyEmailUseCase, job: Job) -> None:
+        try:
+            text = await self._load_text(uc, job.payload)
+            out = await uc.execute(ClassifyEmailInput(text=text))
+        except PERMANENT_ERRORS as e:
+            await asyncio.to_thread(self.store.fail, job.id, str(e))
+            self.failed += 1
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if job.attempts < job.max_attempts:
+                await asyncio.to_thread(self.store.fail, job.id, error, self._retry_delay(job.attempts))
+                self.retried += 1
+            else:
+                await asyncio.to_thread(self.store.fail, job.id, error)
+                self.failed += 1
+            log.warning("job_failed", job_id=job.id, attempt=job.attempts, error=error)
+        else:
+            await asyncio.to_thread(self.store.complete, job.id, out.__dict__)
+            self.processed += 1
+
+        updated = await asyncio.to_thread(self.store.get, job.id)
+        if updated.terminal and "file" in job.payload:
+            Path(job.payload["file"]).unlink(missing_ok=True)
+        self._publish(updated)
+
+    # -- acompanhamento (SSE) -------------------------------------------------
+
+    def _publish(self, job: Job) -> None:
+        for queue in self._subscribers.get(job.id, ()):
+            queue.put_nowait(job)
+
+    async def watch(self, job_id: str, heartbeat: float = 15.0) -> AsyncIterator[Job | None]:
+        """Emite o job a cada mudança de status até um estado final; None a cada
+        `heartbeat` segundos sem mudança. Consulta a fila também por polling, já que
+        o job pode estar rodando em outro processo."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            job = await asyncio.to_thread(self.store.get, job_id)
+            last = (job.status, job.attempts)
+            yield job
+            idle = 0.0
+            while not job.terminal:
+                try:
+                    job = await asyncio.wait_for(queue.get(), self.poll)
+                except asyncio.TimeoutError:
+                    job = await asyncio.to_thread(self.store.get, job_id)
+                if (job.status, job.attempts) != last:
+                    last = (job.status, job.attempts)
+                    idle = 0.0
+                    yield job
+                    continue
+                idle += self.poll
+                if idle >= heartbeat:
+                    idle = 0.0
+                    yield None
+        finally:
+            subs = self._subscribers.get(job_id)
+            if subs is not None:
+                subs.discard(queue)
+                if not subs:
+                    del self._subscribers[job_id]
+
+    def stats(self) -> dict:
+        return {
+            "queued": 0, "running": 0, "done": 0, "failed": 0,
+            **self._counts,
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed_final": self.failed,
+            "retried": self.retried,
+        }
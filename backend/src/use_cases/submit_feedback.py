@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import Protocol, Sequence
+
+from src.adapters.runtime.stages import StageExecutor
+from src.core.enums.category import Category
+
+
+class OnlineLearner(Protocol):
+    version: str
+    n_samples: int
+
+    def learn(self, examples: Sequence[tuple[str, Category]]) -> str: ...
+
+
+@dataclass
+class FeedbackInput:
+    text: str
+    category: Category
+
+@dataclass
+class FeedbackOutput:
+    version: str
+    learned: int
+    samples: int
+
+
+class SubmitFeedbackUseCase:
+    def __init__(self, learner: OnlineLearner, stages: StageExecutor):
+        self.learner = learner
+        self.stages = stages
+
+    async def execute(self, items: list[FeedbackInput]) -> FeedbackOutput:
+        # partial_fit + gravação do artefato no pool de CPU, fora do event loop
+        version = await self.stages.run("ml", self.learner.learn, [(i.text, i.category) for i in items])
+        return FeedbackOutput(version=version, learned=len(items), samples=self.learner.n_samples)
@@ -0,0 +1,8 @@
+import os
+import sys
+from pathlib import Path
+
+# os testes rodam a partir de backend/ (imports "from src....") e sem rede nem provedor real
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("AI_PROVIDER", "template")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.adapters.nlp.cascade_classifier import CascadeEmailClassifier
+from src.adapters.reply.llm_reply import FallbackReplyGenerator
+from src.adapters.runtime.result_cache import ResultCache
+from src.adapters.runtime.stages import StageExecutor, StageSaturated
+from src.config.settings import settings
+from src.core.enums.category import Category
+from src.interfaces.api.app_factory import create_app
+from src.use_cases.classify_email import (
+    LOCAL_FALLBACK_SOURCE, SHED_SOURCE, ClassifyEmailInput, ClassifyEmailUseCase,
+)
+
+LIMITS = {"pdf": 1, "ml": 1, "llm": 1}
+
+
+class AmbiguousLocal:
+    def predict_batch(self, emails):
+        return [(Category.PRODUTIVO, 0.5) for _ in emails]
+
+
+class CountingLLM:
+    calls = 0
+
+    async def aclassify(self, raw_text):
+        self.calls += 1
+        return "Improdutivo", 0.9
+
+    async def agenerate(self, category, original_text):
+        self.calls += 1
+        return "Resposta do LLM."
+
+
+async def _holding(stages: StageExecutor, stage: str, fn):
+    """Roda fn() com a única vaga do estágio ocupada."""
+    held, release = asyncio.Event(), asyncio.Event()
+
+    async def hold():
+        async with stages.limit(stage):
+            held.set()
+            await release.wait()
+
+    task = asyncio.create_task(hold())
+    await held.wait()
+    try:
+        return await fn()
+    finally:
+        release.set()
+        await task
+
+
+def test_saturated_stage_rejects_immediately():
+    stages = StageExecutor(max_workers=1, limits=LIMITS, queue_limits={"pdf": 0, "ml": 0, "llm": 0})
+
+    async def enter():
+        async with stages.limit("ml"):
+            pass
+
+    with pytest.raises(StageSaturated):
+        asyncio.run(_holding(stages, "ml", enter))
+    assert stages.stats()["ml"]["rejected"] == 1
+
+
+def test_saturated_stage_becomes_503_with_retry_after(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_DIR", str(tmp_path / "models"))
+    monkeypatch.setattr(settings, "JOBS_DIR", str(tmp_path / "jobs"))
+    monkeypatch.setattr(settings, "STAGE_LIMIT_ML", 1)
+    monkeypatch.setattr(settings, "STAGE_QUEUE_ML", 0)
+    monkeypatch.setattr(settings, "STAGE_RETRY_AFTER_SECONDS", 2.4)
+    app = create_app(load_mode="eager")
+
+    async def post():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/api/process_email", data={"text": "Qual o status do chamado 4821?"})
+
+    async def run():
+        return await _holding(app.state.stages, "ml", post)
+
+    r = asyncio.run(run())
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "2"
+    assert r.json()["stage"] == "ml"
+    # com a vaga livre, a mesma requisição passa
+    assert asyncio.run(post()).status_code == 200
+
+
+def test_llm_backlog_sheds_to_template_and_local_prediction(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_SHED_QUEUE", 0)
+    llm = CountingLLM()
+    stages = StageExecutor(max_workers=2, limits=LIMITS)
+    uc = ClassifyEmailUseCase(
+        CascadeEmailClassifier(AmbiguousLocal(), llm, threshold=0.65),
+        FallbackReplyGenerator(llm),
+        stages,
+        ResultCache(),
+    )
+
+    async def execute():
+        return await uc.execute(ClassifyEmailInput(text="Qual o status do chamado 4821?"))
+
+    async def run():
+        return await _holding(stages, "llm", execute)
+
+    out = asyncio.run(run())
+    assert (out.category, out.classify_source) == (Category.PRODUTIVO.value, LOCAL_FALLBACK_SOURCE)
+    assert out.reply_source == SHED_SOURCE and out.suggested_reply
+    assert llm.calls == 0 and stages.stats()["llm"]["shed"] == 2
+    # degradada: não fica no cache, e sem sobrecarga o LLM volta a responder
+    assert len(uc.results) == 0
+    out = asyncio.run(execute())
+    assert (out.classify_source, out.reply_source) == ("llm:CountingLLM", "CountingLLM")
+    assert llm.calls == 2
@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.adapters.reply.templates import TemplateReplyGenerator
+from src.adapters.runtime.stages import StageExecutor
+from src.core.enums.category import Category
+from src.interfaces.api.routes.email_routes import router
+from src.use_cases.classify_email import ClassifyEmailUseCase
+
+TEXTS = [
+    "Qual o status do chamado 4821?",
+    "Feliz natal a toda a equipe!",
+    "Seu idiota, resolvam isso logo",
+    "Preciso da segunda via do boleto",
+]
+
+
+class KeywordStub:
+    """Produtivo quando o texto pede algo; registra os lotes recebidos."""
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    def predict(self, email):
+        return self.predict_batch([email])[0]
+
+    def predict_batch(self, emails):
+        self.batches.append([e.text for e in emails])
+        return [
+            (Category.PRODUTIVO, 0.9) if ("chamado" in e.text or "boleto" in e.text) else (Category.IMPRODUTIVO, 0.8)
+            for e in emails
+        ]
+
+
+@pytest.fixture
+def classifier():
+    return KeywordStub()
+
+
+@pytest.fixture
+def post(classifier):
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.state.uc = ClassifyEmailUseCase(classifier, TemplateReplyGenerator(), StageExecutor())
+
+    def send(content, content_type="application/json"):
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                return await client.post(
+                    "/api/process_email_batch", content=content, headers={"Content-Type": content_type}
+                )
+        return asyncio.run(run())
+
+    return send
+
+
+def _expected(r):
+    assert r.status_code == 200, r.text
+    return [(o["category"], o["classify_source"]) for o in r.json()]
+
+
+EXPECTED = [
+    ("Produtivo", "KeywordStub"),
+    ("Improdutivo", "KeywordStub"),
+    ("Improdutivo", "rule:toxicity"),
+    ("Produtivo", "KeywordStub"),
+]
+
+
+def test_json_array_keeps_input_order_and_mixes_toxic_items(post, classifier):
+    r = post(json.dumps([{"text": t} for t in TEXTS]))
+    assert _expected(r) == EXPECTED
+    # o item tóxico é decidido pela regra e não vai ao modelo; o resto vai num lote só
+    assert classifier.batches == [[TEXTS[0], TEXTS[1], TEXTS[3]]]
+
+
+def test_ndjson_body_matches_json_array(post):
+    body = "\n".join(json.dumps({"text": t}) for t in TEXTS) + "\n\n"
+    assert _expected(post(body, "application/x-ndjson")) == EXPECTED
+
+
+def test_reversed_batch_comes_back_reversed(post):
+    r = post(json.dumps([{"text": t} for t in reversed(TEXTS)]))
+    assert _expected(r) == EXPECTED[::-1]
+
+
+@pytest.mark.parametrize("content, content_type, status", [
+    ("não é json", "application/json", 422),
+    ('{"text": "um objeto, não um array"}', "application/json", 422),
+    ('[{"texto": "campo errado"}]', "application/json", 422),
+    ('{"text": "ok"}\n{quebrado', "application/x-ndjson", 422),
+    ("[]", "application/json", 400),
+])
+def test_malformed_batches_are_rejected(post, classifier, content, content_type, status):
+    assert post(content, content_type).status_code == status
+    assert classifier.batches == []
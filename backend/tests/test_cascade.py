@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.adapters.nlp.cascade_classifier import CascadeEmailClassifier
+from src.adapters.reply.llm_reply import LLMReplyGenerator
+from src.core.entities.email import Email
+from src.core.enums.category import Category
+
+
+class StubClient:
+    max_concurrency = 4
+    provider = SimpleNamespace(name="stub")
+
+    def __init__(self, out: str):
+        self.out = out
+
+    async def complete(self, prompt: str) -> str:
+        return self.out
+
+    def complete_blocking(self, prompt: str) -> str:
+        return self.out
+
+    def stats(self) -> dict:
+        return {}
+
+
+class StubLocal:
+    def predict_batch(self, emails):
+        return [(Category.PRODUTIVO, 0.55) for _ in emails]
+
+
+@pytest.mark.parametrize("out", [
+    "não é json",
+    '{"category": "Talvez", "confidence": 0.9}',
+    '["Produtivo"]',
+    '{"category": "Produtivo", "confidence": "alta"}',
+])
+def test_invalid_llm_output_raises(out):
+    with pytest.raises(ValueError):
+        LLMReplyGenerator(StubClient(out)).classify("status do chamado")
+
+
+def test_fenced_json_is_parsed():
+    llm = LLMReplyGenerator(StubClient('```json\n{"category": "Improdutivo", "confidence": 1.7}\n```'))
+    assert llm.classify("feliz natal") == ("Improdutivo", 1.0)
+
+
+def test_cascade_keeps_local_prediction_on_invalid_output():
+    cascade = CascadeEmailClassifier(StubLocal(), LLMReplyGenerator(StubClient("lixo")), threshold=0.65)
+    email = Email(text="status do chamado")
+    pred = cascade.predict_local(email)
+    kept = asyncio.run(cascade.aescalate(email, pred))
+    assert kept == pred and kept.degraded
+    assert cascade.predict(email) == pred
+    assert cascade.stats()["errors"] == 2
+
+
+def test_cascade_accepts_valid_output():
+    out = '{"category": "Improdutivo", "confidence": 0.9}'
+    cascade = CascadeEmailClassifier(StubLocal(), LLMReplyGenerator(StubClient(out)), threshold=0.65)
+    email = Email(text="bom dia")
+    assert asyncio.run(cascade.aescalate(email, cascade.predict_local(email))) == (Category.IMPRODUTIVO, 0.9)
+
+
+class MixedLocal:
+    def predict_batch(self, emails):
+        return [(Category.PRODUTIVO, 0.9 if "chamado" in e.text else 0.5) for e in emails]
+
+
+def test_each_prediction_reports_the_tier_that_answered():
+    out = '{"category": "Improdutivo", "confidence": 0.9}'
+    cascade = CascadeEmailClassifier(MixedLocal(), LLMReplyGenerator(StubClient(out)), threshold=0.65)
+    emails = [Email(text="status do chamado"), Email(text="bom dia")]
+    local = cascade.predict_local_batch(emails)
+    assert [p.source for p in local] == ["MixedLocal", "MixedLocal"]
+    escalated = asyncio.run(cascade.aescalate(emails[1], local[1]))
+    assert escalated.source == "llm:stub"
+    assert [p.source for p in cascade.predict_batch(emails)] == ["MixedLocal", "llm:stub"]
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from src.adapters.reply.client import CircuitBreaker, CircuitOpenError, ProviderClient, ProviderError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StubProvider:
+    name = "stub"
+
+    def __init__(self, latency: float = 0.0, failures: int = 0):
+        self.latency = latency
+        self.failures = failures
+        self.calls = 0
+
+    async def complete(self, prompt: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.calls <= self.failures:
+            raise ConnectionError("falha simulada")
+        return f"resposta:{prompt}"
+
+
+def _client(provider, **kw) -> ProviderClient:
+    kw.setdefault("retries", 0)
+    kw.setdefault("timeout", 5.0)
+    return ProviderClient(provider, max_concurrency=4, backoff_base=0.0, backoff_max=0.0, **kw)
+
+
+def test_breaker_opens_after_threshold_and_blocks_until_reset():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=10, clock=clock)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.opens == 1
+    clock.now = 9.9
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_lets_a_single_probe_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10.0
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()  # a sonda ainda está em andamento
+
+
+def test_breaker_probe_success_closes_failure_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10.0
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.opens == 2
+    assert not breaker.allow()
+    clock.now = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.consecutive_failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_identical_prompts_in_flight_share_one_upstream_call():
+    provider = StubProvider(latency=0.05)
+    client = _client(provider)
+
+    async def run():
+        return await asyncio.gather(*(client.complete("mesmo prompt") for _ in range(5)))
+
+    try:
+        outs = asyncio.run(run())
+    finally:
+        client.close()
+    assert outs == ["resposta:mesmo prompt"] * 5
+    assert provider.calls == 1
+    stats = client.stats()
+    assert stats["calls"] == 5 and stats["coalesced"] == 4 and stats["in_flight"] == 0
+
+
+def test_distinct_prompts_are_not_coalesced():
+    provider = StubProvider(latency=0.01)
+    client = _client(provider)
+
+    async def run():
+        return await asyncio.gather(client.complete("a"), client.complete("b"))
+
+    try:
+        assert asyncio.run(run()) == ["resposta:a", "resposta:b"]
+    finally:
+        client.close()
+    assert provider.calls == 2 and client.coalesced == 0
+
+
+def test_coalesced_callers_all_see_the_failure():
+    provider = StubProvider(latency=0.05, failures=10)
+    client = _client(provider, breaker=CircuitBreaker(failure_threshold=10))
+
+    async def run():
+        return await asyncio.gather(*(client.complete("p") for _ in range(3)), return_exceptions=True)
+
+    try:
+        outs = asyncio.run(run())
+    finally:
+        client.close()
+    assert all(isinstance(o, ProviderError) for o in outs)
+    assert provider.calls == 1 and client.failures == 1
+
+
+def test_retry_recovers_from_transient_failure():
+    provider = StubProvider(failures=1)
+    client = _client(provider, retries=2)
+    try:
+        assert client.complete_blocking("x") == "resposta:x"
+    finally:
+        client.close()
+    assert provider.calls == 2 and client.retried == 1 and client.breaker.state == "closed"
+
+
+def test_open_circuit_rejects_without_calling_provider():
+    provider = StubProvider(failures=100)
+    client = _client(provider, breaker=CircuitBreaker(failure_threshold=1, reset_seconds=60))
+    try:
+        with pytest.raises(ProviderError):
+            client.complete_blocking("x")
+        with pytest.raises(CircuitOpenError):
+            client.complete_blocking("y")
+    finally:
+        client.close()
+    assert provider.calls == 1 and client.rejected == 1
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from src.adapters.nlp.compiled_nb import CompiledNB
+from src.adapters.nlp.holdout import HOLDOUT
+from src.adapters.nlp.sklearn_classifier import (
+    SEED, SklearnEmailClassifier, pipeline_from_artifact, pipeline_to_artifact, train_pipeline, training_hash,
+)
+from src.adapters.persistence.local_model_store import LocalModelStore
+from src.core.entities.email import Email
+
+EMPTY_AND_OOV = ["", "   ", "!!! ???", "zzzqx wqxyz kkkkj", "12345 67890"]
+TEXTS = [t for t, _ in SEED + HOLDOUT] + EMPTY_AND_OOV + [
+    "Qual o status do chamado 4821? " * 40,
+    "não, isso é ótimo! Obrigado pelo retorno sobre a fatura e o boleto.",
+]
+
+
+@pytest.fixture(scope="module")
+def pipe():
+    return train_pipeline()
+
+
+def _assert_same(pipe, compiled, texts):
+    ref = pipe.predict_proba(texts)
+    got = compiled.predict_proba(compiled.transform(texts))
+    # bit a bit, não aproximado: o caminho rápido não pode mudar nenhuma decisão
+    np.testing.assert_array_equal(got, ref)
+    assert [compiled.classes[i] for i in got.argmax(axis=1)] == list(pipe.predict(texts))
+
+
+def test_batch_matches_pipeline_exactly(pipe):
+    _assert_same(pipe, CompiledNB.from_pipeline(pipe), TEXTS)
+
+
+@pytest.mark.parametrize("text", EMPTY_AND_OOV)
+def test_empty_and_out_of_vocabulary_inputs_fall_back_to_prior(pipe, text):
+    compiled = CompiledNB.from_pipeline(pipe)
+    assert len(compiled.transform_one(text)[0]) == 0
+    _assert_same(pipe, compiled, [text])
+
+
+def test_single_calls_match_batch(pipe):
+    compiled = CompiledNB.from_pipeline(pipe)
+    batch = compiled.predict_proba(compiled.transform(TEXTS))
+    for k, text in enumerate(TEXTS):
+        np.testing.assert_array_equal(compiled.predict_proba([compiled.transform_one(text)])[0], batch[k])
+
+
+def test_artifact_arrays_stay_memory_mapped(tmp_path):
+    store = LocalModelStore(str(tmp_path))
+    content_hash = training_hash()
+    store.save_artifact(pipeline_to_artifact(train_pipeline(), content_hash))
+    art = store.load_artifact(content_hash)
+    compiled = CompiledNB.from_pipeline(pipeline_from_artifact(art))
+    # nada copiado para a memória do processo: os workers dividem as páginas do arquivo
+    assert np.shares_memory(compiled.idf, art.arrays["idf"])
+    assert all(isinstance(b, np.memmap) for b in compiled.blocks + [compiled.idf])
+    assert np.shares_memory(compiled.blocks[0], art.arrays["feature_log_prob"])
+
+    clf = SklearnEmailClassifier(store)
+    emails = [Email(text=t) for t in TEXTS]
+    ref = clf.pipe.predict_proba(TEXTS)
+    assert clf.predict_batch(emails) == [
+        (c, float(p)) for c, p in zip((clf.pipe.classes_[i] for i in ref.argmax(axis=1)), ref.max(axis=1))
+    ]
@@ -0,0 +1,56 @@
+import pytest
+
+gemini_reply = pytest.importorskip("src.adapters.reply.gemini_reply")
+
+
+class Model:
+    def __init__(self, name):
+        self.name = f"models/{name}"
+        self.supported_generation_methods = ["generateContent"]
+
+
+@pytest.fixture
+def resolver(monkeypatch, tmp_path):
+    monkeypatch.setattr(gemini_reply, "_resolution", None)
+    monkeypatch.setattr(gemini_reply, "_retry_at", 0.0)
+    monkeypatch.setattr(gemini_reply.settings, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(gemini_reply.settings, "GEMINI_MODEL_RETRY_SECONDS", 60.0)
+    monkeypatch.setenv("GEMINI_MODEL", "gemini-2.5-flash")
+    monkeypatch.setattr(gemini_reply, "_configure_gemini", lambda: None)
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(gemini_reply.time, "monotonic", lambda: clock["now"])
+    calls = {"n": 0, "fail": True}
+
+    def list_models():
+        calls["n"] += 1
+        if calls["fail"]:
+            raise ConnectionError("rede fora")
+        return [Model("gemini-2.5-flash")]
+
+    monkeypatch.setattr(gemini_reply.genai, "list_models", list_models)
+    return clock, calls
+
+
+def test_failed_resolution_is_retried_after_window(resolver):
+    clock, calls = resolver
+    res = gemini_reply.resolve_gemini_model()
+    assert res.source == "fallback" and res.error
+    # dentro da janela: reaproveita, sem nova consulta
+    assert gemini_reply.resolve_gemini_model() is res
+    assert calls["n"] == 1 and not gemini_reply.resolution_pending()
+
+    calls["fail"] = False
+    clock["now"] += 61
+    assert gemini_reply.resolution_pending()
+    res = gemini_reply.resolve_gemini_model()
+    assert (res.model, res.source, res.error) == ("gemini-2.5-flash", "list_models", None)
+    assert calls["n"] == 2
+
+
+def test_successful_resolution_is_memoized(resolver):
+    clock, calls = resolver
+    calls["fail"] = False
+    res = gemini_reply.resolve_gemini_model()
+    clock["now"] += 10_000
+    assert gemini_reply.resolve_gemini_model() is res
+    assert calls["n"] == 1 and not gemini_reply.resolution_pending()
@@ -0,0 +1,147 @@
+import asyncio
+import io
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.adapters.parsers.ingestion import InvalidDocument, UploadTooLarge, read_upload_text
+from src.adapters.reply.templates import TemplateReplyGenerator
+from src.adapters.runtime.stages import StageExecutor
+from src.config.settings import settings
+from src.core.enums.category import Category
+from src.interfaces.api.middleware import MaxBodySizeMiddleware
+from src.interfaces.api.routes.email_routes import router
+from src.use_cases.classify_email import ClassifyEmailUseCase
+
+MAX_BODY = 4096
+
+
+def _pdf(pages: list[str]) -> bytes:
+    """PDF mínimo com uma linha de texto por página."""
+    objs = ["<< /Type /Catalog /Pages 2 0 R >>", "", "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objs.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objs)} 0 R >>"
+        )
+        kids.append(f"{len(objs)} 0 R")
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, body in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+PAGES = [f"Pagina {i} sobre o chamado" for i in range(10)]
+
+
+class RecordingClassifier:
+    def __init__(self):
+        self.texts: list[str] = []
+
+    def predict(self, email):
+        return self.predict_batch([email])[0]
+
+    def predict_batch(self, emails):
+        self.texts.extend(e.text for e in emails)
+        return [(Category.PRODUTIVO, 0.9) for _ in emails]
+
+
+@pytest.fixture
+def classifier():
+    return RecordingClassifier()
+
+
+@pytest.fixture
+def client(classifier):
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.add_middleware(MaxBodySizeMiddleware, max_bytes=MAX_BODY)
+    app.state.uc = ClassifyEmailUseCase(classifier, TemplateReplyGenerator(), StageExecutor())
+
+    def send(content=None, headers=None, **kwargs):
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+                return await c.post("/api/process_email", content=content, headers=headers, **kwargs)
+        return asyncio.run(run())
+
+    return send
+
+
+def _upload(name: str, data: bytes) -> dict:
+    return {"files": {"file": (name, data)}}
+
+
+def test_content_length_over_limit_is_rejected_before_parsing(client, classifier):
+    r = client(**_upload("email.txt", b"x" * (MAX_BODY + 1)))
+    assert r.status_code == 413
+    assert classifier.texts == []
+
+
+def test_chunked_body_over_limit_is_rejected(client, classifier):
+    request = httpx.Request("POST", "http://test", **_upload("email.txt", b"x" * (MAX_BODY * 2)))
+    body = request.read()
+
+    async def chunks():
+        # sem Content-Length: o limite vale para os bytes conforme chegam
+        for i in range(0, len(body), 1024):
+            yield body[i:i + 1024]
+
+    r = client(chunks(), headers={"Content-Type": request.headers["Content-Type"]})
+    assert r.status_code == 413
+    assert classifier.texts == []
+
+
+def test_declared_upload_size_over_limit(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 10)
+    with pytest.raises(UploadTooLarge):
+        read_upload_text(io.BytesIO(b"x" * 11), "email.txt", size=11)
+
+
+def test_pdf_pages_after_cap_are_not_read(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_PDF_PAGES", 3)
+    text = read_upload_text(io.BytesIO(_pdf(PAGES)), "email.pdf")
+    assert text.splitlines() == PAGES[:3]
+
+
+def test_pdf_stops_at_char_budget(monkeypatch):
+    monkeypatch.setattr(settings, "TEXT_CHAR_BUDGET", 40)
+    text = read_upload_text(io.BytesIO(_pdf(PAGES)), "email.pdf")
+    assert text == "\n".join(PAGES)[:40]
+
+
+def test_txt_stops_at_char_budget(monkeypatch):
+    monkeypatch.setattr(settings, "TEXT_CHAR_BUDGET", 100)
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_BYTES", 16)
+    data = "ação ".encode() * 1000
+    fileobj = io.BytesIO(data)
+    text = read_upload_text(fileobj, "email.txt")
+    assert text == ("ação " * 1000)[:100]
+    # lê só o necessário do spool, não o arquivo inteiro
+    assert fileobj.tell() < len(data)
+
+
+def test_budgets_apply_through_the_endpoint(client, classifier, monkeypatch):
+    monkeypatch.setattr(settings, "TEXT_CHAR_BUDGET", 30)
+    assert client(**_upload("email.pdf", _pdf(PAGES))).status_code == 200
+    assert client(**_upload("email.txt", b"y" * 1000)).status_code == 200
+    assert classifier.texts == ["\n".join(PAGES)[:30], "y" * 30]
+
+
+@pytest.mark.parametrize("data", [b"%PDF-1.4\nisto nao e um pdf", _pdf(PAGES)[:200]])
+def test_corrupt_pdf_is_a_client_error(client, classifier, data):
+    with pytest.raises(InvalidDocument):
+        read_upload_text(io.BytesIO(data), "email.pdf")
+    r = client(**_upload("email.pdf", data))
+    assert r.status_code == 400
+    assert classifier.texts == []
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.adapters.persistence.job_store import SqliteJobStore
+from src.use_cases.process_jobs import JobRunner
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SqliteJobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=60)
+
+
+def test_claim_takes_highest_priority_then_oldest(store):
+    low, _ = store.submit({"text": "a"}, priority=0)
+    old, _ = store.submit({"text": "b"}, priority=5)
+    new, _ = store.submit({"text": "c"}, priority=5)
+    assert [store.claim().id for _ in range(3)] == [old.id, new.id, low.id]
+    assert store.claim() is None
+
+
+def test_claim_marks_running_and_counts_attempt(store):
+    job, _ = store.submit({"text": "a"})
+    claimed = store.claim()
+    assert (claimed.id, claimed.status, claimed.attempts) == (job.id, "running", 1)
+    assert store.get(job.id).status == "running"
+    assert store.counts()["running"] == 1
+
+
+def test_running_job_is_not_reclaimed_while_lease_holds(store):
+    store.submit({"text": "a"})
+    assert store.claim() is not None
+    assert store.claim() is None
+
+
+def test_expired_lease_makes_job_claimable_again(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=0.05)
+    job, _ = store.submit({"text": "a"})
+    store.claim()
+    time.sleep(0.06)
+    again = store.claim()
+    assert again.id == job.id and again.attempts == 2
+
+
+def test_renew_extends_lease_only_while_running(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=0.2)
+    job, _ = store.submit({"text": "a"})
+    store.claim()
+    time.sleep(0.12)
+    assert store.renew(job.id)
+    time.sleep(0.12)
+    assert store.claim() is None  # sem a renovação, o lease já teria vencido
+    store.complete(job.id, {"ok": True})
+    assert not store.renew(job.id)
+
+
+def test_fail_with_retry_requeues_after_delay(store):
+    job, _ = store.submit({"text": "a"})
+    store.claim()
+    store.fail(job.id, "erro", retry_in=60)
+    assert store.get(job.id).status == "queued"
+    assert store.claim() is None
+    store.fail(job.id, "erro")
+    assert store.get(job.id).terminal
+
+
+def test_release_returns_job_without_spending_attempt(store):
+    job, _ = store.submit({"text": "a"})
+    store.claim()
+    store.release(job.id)
+    assert (store.get(job.id).status, store.get(job.id).attempts) == ("queued", 0)
+
+
+def test_idempotency_key_returns_existing_job(store):
+    first, created = store.submit({"text": "a"}, idempotency_key="k")
+    again, created_again = store.submit({"text": "b"}, idempotency_key="k")
+    assert created and not created_again and again.id == first.id
+
+
+class SlowUseCase:
+    stages = None
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    async def execute(self, inp):
+        await asyncio.sleep(self.seconds)
+        return SimpleNamespace(category="Produtivo", text=inp.text)
+
+
+def test_runner_renews_lease_of_long_job(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=0.15)
+    job, _ = store.submit({"text": "a"})
+    runner = JobRunner(store, lambda: SlowUseCase(0.5), workers=1, poll_seconds=0.01)
+
+    async def run():
+        await runner.start()
+        await asyncio.sleep(0.35)  # mais que o lease: só não vence porque é renovado
+        stolen = await asyncio.to_thread(store.claim)
+        while not store.get(job.id).terminal:
+            await asyncio.sleep(0.02)
+        await asyncio.sleep(0.05)
+        stats = runner.stats()
+        await runner.stop()
+        return stolen, stats
+
+    stolen, stats = asyncio.run(run())
+    assert stolen is None
+    done = store.get(job.id)
+    assert (done.status, done.attempts) == ("done", 1)
+    assert stats["processed"] == 1 and stats["done"] == 1
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from benchmarks.corpus import EDGE_CASES, SENTENCES, make_corpus
+from src.adapters.nlp.keywords import DEFAULT_LEXICONS, KeywordAutomaton, KeywordMatch, scan_keywords
+
+
+def naive_scan(lexicons, text, whole_word=()):
+    t = text.lower()
+    found = set()
+    for lexicon, keywords in lexicons.items():
+        for kw in keywords:
+            kw = kw.lower()
+            start = t.find(kw)
+            while start != -1:
+                end = start + len(kw)
+                boundary = (start == 0 or not t[start - 1].isalnum()) and (end == len(t) or not t[end].isalnum())
+                if lexicon not in whole_word or boundary:
+                    found.add(KeywordMatch(lexicon, kw, start, end))
+                start = t.find(kw, start + 1)
+    return found
+
+
+TEXTS = EDGE_CASES + SENTENCES + make_corpus(100, 6) + [
+    "SENHA senha Senha", "statusstatus", "boleto-boleto", "segunda viagem", "2ª via da fatura",
+    "vai se ferrar", "idiotaidiota", "chamado\nticket\tandamento",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_default_automaton_matches_naive_scan(text):
+    assert set(scan_keywords(text).matches) == naive_scan(DEFAULT_LEXICONS, text)
+
+
+def test_overlapping_keywords_and_whole_word_lexicons():
+    lexicons = {"a": ["he", "she", "his", "hers"], "b": ["ushers", "s"]}
+    auto = KeywordAutomaton(lexicons, whole_word=["a"])
+    rng = random.Random(0)
+    for _ in range(300):
+        text = "".join(rng.choice("hesur ") for _ in range(rng.randint(0, 30)))
+        assert set(auto.scan(text).matches) == naive_scan(lexicons, text, whole_word=["a"])
+
+
+def test_matches_helpers():
+    m = scan_keywords("Erro no boleto, segue o arquivo")
+    assert m.lexicons() == {"erro", "fatura", "anexo"}
+    assert m.first_of(["status", "fatura", "erro"]) == "fatura"
+    assert not m.has("toxic")
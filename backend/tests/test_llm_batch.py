@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+import pytest
+
+from src.adapters.reply.client import ProviderClient, ProviderError
+from src.adapters.reply.llm_reply import LLMReplyGenerator
+from src.config.settings import settings
+
+ITEMS = [("Produtivo", "status do chamado 1"), ("Improdutivo", "feliz natal"), ("Produtivo", "boleto 3")]
+
+
+class ScriptedProvider:
+    """Devolve `batch_out` para o prompt em lote e uma resposta por email nos refeitos."""
+
+    name = "scripted"
+
+    def __init__(self, batch_out: str = "", batch_latency: float = 0.0):
+        self.batch_out = batch_out
+        self.batch_latency = batch_latency
+        self.prompts: list[str] = []
+
+    async def complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        if "\nEmails (JSON):\n" in prompt:
+            await asyncio.sleep(self.batch_latency)
+            return self.batch_out
+        return f"individual:{prompt.rsplit(chr(10), 1)[-1]}"
+
+
+def _generator(provider, timeout: float = 5.0) -> LLMReplyGenerator:
+    client = ProviderClient(provider, max_concurrency=4, timeout=timeout, retries=0)
+    return LLMReplyGenerator(client)
+
+
+def _run(gen, items=ITEMS):
+    try:
+        return asyncio.run(gen.agenerate_batch(items))
+    finally:
+        gen.client.close()
+
+
+def _batch(*pairs) -> str:
+    return "```json\n" + json.dumps([{"id": i, "reply": r} for i, r in pairs]) + "\n```"
+
+
+def test_parse_maps_replies_by_id_regardless_of_order():
+    out = _batch(("3", "c"), ("1", "a"), ("2", "b"))
+    assert LLMReplyGenerator._parse_batch_replies(out, 3) == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize("out, expected", [
+    ("não é json", [None, None, None]),
+    (_batch(("1", "a"), ("9", "fora"), ("0", "fora")), ["a", None, None]),
+    (_batch(("1", "a"), ("2", "   "), ("x", "c")), ["a", None, None]),
+    # id repetido: ambíguo, o item é refeito
+    (_batch(("1", "a"), ("2", "b"), ("2", "b2"), ("3", "c")), ["a", None, "c"]),
+])
+def test_parse_rejects_invalid_entries(out, expected):
+    assert LLMReplyGenerator._parse_batch_replies(out, 3) == expected
+
+
+def test_batch_demuxes_in_input_order_with_one_call():
+    provider = ScriptedProvider(_batch(("2", "b"), ("1", "a"), ("3", "c")))
+    gen = _generator(provider)
+    assert _run(gen) == ["a", "b", "c"]
+    assert len(provider.prompts) == 1 and gen.batch_retried == 0
+
+
+def test_missing_and_duplicated_items_are_retried_one_by_one():
+    provider = ScriptedProvider(_batch(("1", "a"), ("1", "a2"), ("3", "c")))
+    gen = _generator(provider)
+    out = _run(gen)
+    assert out[2] == "c"
+    assert out[0].startswith("individual:") and "status do chamado 1" in out[0]
+    assert out[1].startswith("individual:") and "feliz natal" in out[1]
+    assert len(provider.prompts) == 3 and gen.batch_retried == 2
+
+
+def test_failed_retry_surfaces_as_exception_in_its_position():
+    class FailingSingles(ScriptedProvider):
+        async def complete(self, prompt):
+            if "\nEmails (JSON):\n" not in prompt:
+                raise ConnectionError("falha")
+            return await super().complete(prompt)
+
+    gen = _generator(FailingSingles(_batch(("1", "a"), ("3", "c"))))
+    out = _run(gen)
+    assert out[0] == "a" and out[2] == "c" and isinstance(out[1], ProviderError)
+
+
+def test_batch_timeout_scales_with_batch_size(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BATCH_TIMEOUT_PER_ITEM_SECONDS", 0.2)
+    provider = ScriptedProvider(_batch(("1", "a"), ("2", "b"), ("3", "c")), batch_latency=0.2)
+    gen = _generator(provider, timeout=0.1)
+    assert gen._batch_timeout(3) == pytest.approx(0.5)
+    assert _run(gen) == ["a", "b", "c"]
+
+
+def test_batch_without_extra_time_times_out(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BATCH_TIMEOUT_PER_ITEM_SECONDS", 0.0)
+    provider = ScriptedProvider(_batch(("1", "a"), ("2", "b"), ("3", "c")), batch_latency=0.2)
+    gen = _generator(provider, timeout=0.1)
+    with pytest.raises(ProviderError):
+        _run(gen)
@@ -0,0 +1,108 @@
+import asyncio
+import math
+import re
+
+import httpx
+import pytest
+
+from src.adapters.observability.metrics import Registry, stats_samples
+from src.config.settings import settings
+from src.interfaces.api.app_factory import create_app
+
+NAME = r"[a-zA-Z_:][a-zA-Z0-9_:]*"
+LABEL = rf'[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\\n]|\\[\\n"])*"'
+SAMPLE = re.compile(rf"^({NAME})(\{{(?:{LABEL}(?:,{LABEL})*)?\}})? (\S+)$")
+TYPE = re.compile(rf"^# TYPE ({NAME}) (counter|gauge|histogram|summary|untyped)$")
+HELP = re.compile(rf"^# HELP ({NAME}) .*$")
+
+
+def parse_exposition(text: str) -> dict[str, list[tuple[dict, float]]]:
+    """Validação do formato de texto do Prometheus (0.0.4): cada família declarada uma vez,
+    antes das amostras, e histogramas com buckets cumulativos terminando em +Inf == _count."""
+    assert text.endswith("\n")
+    types: dict[str, str] = {}
+    samples: dict[str, list[tuple[dict, float]]] = {}
+    for line in text.splitlines():
+        if not line:
+            continue
+        if line.startswith("# HELP"):
+            assert HELP.match(line), line
+            continue
+        m = TYPE.match(line)
+        if line.startswith("# TYPE"):
+            assert m, line
+            assert m.group(1) not in types, f"TYPE repetido: {line}"
+            types[m.group(1)] = m.group(2)
+            continue
+        assert not line.startswith("#"), line
+        m = SAMPLE.match(line)
+        assert m, f"amostra inválida: {line!r}"
+        name, labels, value = m.group(1), m.group(2) or "", m.group(3)
+        family = name
+        if name not in types:
+            family = re.sub(r"_(bucket|sum|count)$", "", name)
+            assert types.get(family) == "histogram", f"amostra sem TYPE: {line}"
+        float(value)  # NaN/+Inf também são válidos
+        parsed = dict(re.findall(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"', labels))
+        samples.setdefault(name, []).append((parsed, float(value)))
+
+    for family, kind in types.items():
+        if kind != "histogram":
+            continue
+        for labels, count in samples.get(f"{family}_count", []):
+            buckets = [
+                (float(le), v) for lb, v in samples[f"{family}_bucket"]
+                if {k: x for k, x in lb.items() if k != "le"} == labels
+                for le in [lb["le"].replace("+Inf", "inf")]
+            ]
+            values = [v for _, v in sorted(buckets)]
+            assert values == sorted(values) and math.isinf(max(b for b, _ in buckets))
+            assert values[-1] == count
+    return samples
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_DIR", str(tmp_path / "models"))
+    monkeypatch.setattr(settings, "JOBS_DIR", str(tmp_path / "jobs"))
+    return create_app(load_mode="eager")
+
+
+def test_metrics_are_valid_exposition_after_one_request(app):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            r = await client.post("/api/process_email", data={"text": "Qual o status do chamado 4821?"})
+            assert r.status_code == 200, r.text
+            return r.json(), await client.get("/metrics")
+
+    out, r = asyncio.run(run())
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/plain")
+    samples = parse_exposition(r.text)
+
+    stages = {labels["stage"] for labels, _ in samples["email_stage_seconds_count"]}
+    assert {"toxicity_rule", "vectorize", "predict", "reply_generation"} <= stages
+    classified = {labels["classify_source"]: v for labels, v in samples["email_classifications_total"]}
+    replied = {labels["reply_source"]: v for labels, v in samples["email_replies_total"]}
+    assert classified.get(out["classify_source"], 0) >= 1
+    assert replied.get(out["reply_source"], 0) >= 1
+    assert "http_requests_in_flight" in samples
+
+
+def test_component_stats_become_valid_gauges():
+    registry = Registry()
+    registry.add_collector("x", lambda: stats_samples("email_x", {
+        "hits": 3, "ratio": 0.5, "enabled": True, "name": "texto", "latency": {"p50-ms": 1.5},
+    }))
+    samples = parse_exposition(registry.render())
+    assert set(samples) == {"email_x_hits", "email_x_ratio", "email_x_latency_p50_ms"}
+
+
+def test_model_versions_become_labels_not_metric_names():
+    stats = {"swaps": 2, "versions": {f"{i:016x}": {"latency": {"count": i}} for i in range(3)}}
+    registry = Registry()
+    registry.add_collector("x", lambda: stats_samples("email_models", stats, labels={"versions": "version"}))
+    samples = parse_exposition(registry.render())
+    assert set(samples) == {"email_models_swaps", "email_models_versions_latency_count"}
+    assert {lb["version"] for lb, _ in samples["email_models_versions_latency_count"]} == {
+        f"{i:016x}" for i in range(3)
+    }
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from src.adapters.runtime.micro_batch import MicroBatcher
+
+
+async def _direct(fn, items):
+    return fn(items)
+
+
+class Recorder:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.batches: list[list[int]] = []
+
+    def __call__(self, items: list[int]) -> list[int]:
+        self.batches.append(list(items))
+        if self.fail:
+            raise ValueError("lote inválido")
+        return [i * 10 for i in items]
+
+
+def test_concurrent_submits_share_one_batch_in_order():
+    fn = Recorder()
+    batcher = MicroBatcher(fn, _direct, max_items=8, max_wait_ms=5)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(run()) == [0, 10, 20, 30, 40]
+    assert fn.batches == [[0, 1, 2, 3, 4]]
+    assert batcher.stats()["max_wait_ms"] == 5
+
+
+def test_max_items_splits_batches():
+    fn = Recorder()
+    batcher = MicroBatcher(fn, _direct, max_items=2, max_wait_ms=1)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(run()) == [0, 10, 20, 30, 40]
+    assert all(len(b) <= 2 for b in fn.batches) and sum(map(len, fn.batches)) == 5
+
+
+def test_exception_fans_out_to_every_caller():
+    batcher = MicroBatcher(Recorder(fail=True), _direct, max_items=8, max_wait_ms=1)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    outs = asyncio.run(run())
+    assert len(outs) == 3 and all(isinstance(o, ValueError) for o in outs)
+
+
+def test_cancelled_caller_leaves_batch_without_affecting_others():
+    fn = Recorder()
+    batcher = MicroBatcher(fn, _direct, max_items=8, max_wait_ms=1)
+
+    async def run():
+        tasks = [asyncio.create_task(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0)  # os três já estão no lote pendente
+        tasks[1].cancel()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    outs = asyncio.run(run())
+    assert outs[0] == 0 and outs[2] == 20
+    assert isinstance(outs[1], asyncio.CancelledError)
+    assert fn.batches == [[0, 2]]
+
+
+def test_items_arriving_during_a_batch_wait_for_it_and_go_together():
+    fn = Recorder()
+
+    async def slow(fn_, items):
+        await asyncio.sleep(0.05)
+        return fn_(items)
+
+    batcher = MicroBatcher(fn, slow, max_items=8, max_wait_ms=1000)
+
+    async def run():
+        first = asyncio.create_task(batcher.submit(0))
+        await asyncio.sleep(0.01)  # o primeiro lote está rodando
+        rest = [asyncio.create_task(batcher.submit(i)) for i in (1, 2, 3)]
+        return await asyncio.gather(first, *rest)
+
+    assert asyncio.run(run()) == [0, 10, 20, 30]
+    # saem quando o lote anterior termina, não após max_wait_ms
+    assert fn.batches == [[0], [1, 2, 3]]
+
+
+def test_cancelled_run_cancels_waiting_callers():
+    async def hang(fn_, items):
+        await asyncio.sleep(3600)
+
+    batcher = MicroBatcher(Recorder(), hang, max_items=8, max_wait_ms=1)
+
+    async def run():
+        callers = [asyncio.create_task(batcher.submit(i)) for i in range(2)]
+        await asyncio.sleep(0.01)
+        for task in asyncio.all_tasks():
+            if task not in callers and task is not asyncio.current_task():
+                task.cancel()  # a tarefa do lote, como num shutdown
+        return await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), 1)
+
+    outs = asyncio.run(run())
+    assert all(isinstance(o, asyncio.CancelledError) for o in outs)
+
+
+def test_max_wait_is_in_milliseconds():
+    batcher = MicroBatcher(Recorder(), _direct, max_items=8, max_wait_ms=250)
+    assert batcher.max_wait == pytest.approx(0.25)
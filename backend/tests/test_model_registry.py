@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+from src.adapters.nlp.model_registry import INITIAL, REGISTRY_POINTER, ModelRegistry, RegistryError
+from src.adapters.nlp.sklearn_classifier import (
+    SEED, SklearnEmailClassifier, pipeline_to_artifact, train_pipeline, training_hash,
+)
+from src.adapters.persistence.local_model_store import LocalModelStore
+from src.core.entities.email import Email
+from src.core.enums.category import Category
+
+EXTRA = [("Solicito a segunda via do boleto do contrato 9921", Category.PRODUTIVO)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalModelStore(str(tmp_path))
+
+
+@pytest.fixture
+def candidate(store) -> str:
+    examples = list(SEED) + EXTRA
+    content_hash = training_hash(examples)
+    store.save_artifact(pipeline_to_artifact(train_pipeline(examples), content_hash))
+    return content_hash
+
+
+def _worker(store) -> ModelRegistry:
+    # cada registro faz o papel de um processo do gunicorn sobre o mesmo MODEL_DIR
+    return ModelRegistry(SklearnEmailClassifier(store), store, min_accuracy=0.0, max_regression=1.0)
+
+
+def _load(registry: ModelRegistry, version: str, mode: str) -> None:
+    registry.load_candidate(version[:16], mode)
+    deadline = time.monotonic() + 30
+    while registry.candidate["state"] in ("loading", "validating"):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert registry.candidate["state"] == "ready", registry.candidate
+
+
+def test_promotion_is_adopted_by_other_workers(store, candidate):
+    a, b = _worker(store), _worker(store)
+    _load(a, candidate, "promote")
+    assert a.version == candidate
+    assert store.load_pointer(REGISTRY_POINTER)["active"] == candidate
+
+    b.sync(force=True, wait=True)
+    assert b.version == candidate and b.syncs == 1
+    assert b.predict(Email(text="status do chamado")).source == "SklearnEmailClassifier"
+    # um worker que sobe depois já começa na versão publicada
+    assert _worker(store).version == candidate
+
+
+def test_rollback_returns_every_worker_to_initial_model(store, candidate):
+    a, b = _worker(store), _worker(store)
+    initial = b.version
+    _load(a, candidate, "promote")
+    b.sync(force=True, wait=True)
+
+    a.rollback()
+    assert store.load_pointer(REGISTRY_POINTER)["active"] == INITIAL
+    b.sync(force=True, wait=True)
+    assert b.version == initial and b.active is b._initial
+
+
+def test_shadow_and_promote_propagate(store, candidate):
+    a, b = _worker(store), _worker(store)
+    _load(a, candidate, "shadow")
+    b.sync(force=True, wait=True)
+    assert b.stats()["shadow"] == candidate[:16]
+
+    a.promote()
+    b.sync(force=True, wait=True)
+    assert (b.version, b.stats()["shadow"]) == (candidate, None)
+
+    a.rollback()
+    a.stop_shadow()
+    b.sync(force=True, wait=True)
+    assert b.stats()["shadow"] is None
+
+
+def test_sync_is_rate_limited(store, candidate):
+    a, b = _worker(store), _worker(store)
+    _load(a, candidate, "promote")
+    b.sync()  # dentro do intervalo: nem lê o ponteiro
+    assert b.version != candidate
+
+
+def test_failed_publish_changes_nothing(store, candidate, monkeypatch):
+    a = _worker(store)
+    _load(a, candidate, "shadow")
+    active = a.version
+
+    def broken(name, data):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(store, "save_pointer", broken)
+    with pytest.raises(RegistryError):
+        a.promote()
+    assert a.version == active and a.stats()["shadow"] == candidate[:16]
+
+
+def test_stats_keep_only_active_shadow_and_previous(store, candidate):
+    examples = list(SEED) + EXTRA + [("Feliz aniversário, equipe!", Category.IMPRODUTIVO)]
+    other = training_hash(examples)
+    store.save_artifact(pipeline_to_artifact(train_pipeline(examples), other))
+    a = _worker(store)
+    initial = a.version
+    email = Email(text="status do chamado")
+    _load(a, candidate, "promote")
+    a.predict(email)
+    _load(a, other, "shadow")
+    a.stop_shadow()
+    _load(a, other, "promote")
+    a.predict(email)
+    # a versão inicial saiu de ativa, sombra e anterior: as estatísticas dela não crescem para sempre
+    assert set(a.stats()["versions"]) == {other[:16], candidate[:16]}
+    assert initial[:16] not in a.stats()["versions"]
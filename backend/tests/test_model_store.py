@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from src.adapters.nlp import sklearn_classifier
+from src.adapters.nlp.sklearn_classifier import (
+    SklearnEmailClassifier, pipeline_from_artifact, pipeline_to_artifact, train_pipeline, training_hash,
+)
+from src.adapters.persistence.local_model_store import LocalModelStore, ModelArtifact
+from src.core.entities.email import Email
+
+TEXTS = ["Qual o status do chamado 4821?", "Feliz natal a todos", "Preciso da segunda via do boleto", ""]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalModelStore(str(tmp_path))
+
+
+def _artifact_dirs(store) -> list[str]:
+    return sorted(p.name for p in store.artifacts_dir.iterdir() if p.is_dir())
+
+
+def test_publish_load_round_trip_is_exact(store):
+    pipe = train_pipeline()
+    content_hash = training_hash()
+    art = pipeline_to_artifact(pipe, content_hash)
+    store.save_artifact(art)
+
+    loaded = store.load_artifact(content_hash)
+    assert loaded.content_hash == content_hash and loaded.meta == art.meta
+    for name, arr in art.arrays.items():
+        assert isinstance(loaded.arrays[name], np.memmap)
+        np.testing.assert_array_equal(loaded.arrays[name], arr)
+    restored = pipeline_from_artifact(loaded)
+    np.testing.assert_array_equal(restored.predict_proba(TEXTS), pipe.predict_proba(TEXTS))
+
+
+def test_unchanged_hash_reuses_artifact_without_training(store, monkeypatch):
+    first = SklearnEmailClassifier(store)
+
+    def no_training(*args, **kwargs):
+        raise AssertionError("retreinou com o mesmo hash")
+
+    monkeypatch.setattr(sklearn_classifier, "train_pipeline", no_training)
+    second = SklearnEmailClassifier(store)
+    assert second.version == first.version
+    assert _artifact_dirs(store) == [store.artifact_path(first.version).name]
+    emails = [Email(text=t) for t in TEXTS]
+    assert second.predict_batch(emails) == first.predict_batch(emails)
+
+
+def test_changed_hash_retrains_and_publishes_new_version(store, monkeypatch):
+    first = SklearnEmailClassifier(store)
+    # hiperparâmetro novo: outro hash, o artefato antigo não serve
+    monkeypatch.setitem(sklearn_classifier.NB_PARAMS, "alpha", 0.5)
+    second = SklearnEmailClassifier(store)
+    assert second.version != first.version
+    assert store.load_artifact(second.version).arrays["feature_log_prob"].shape == (
+        second.pipe[-1].feature_log_prob_.shape
+    )
+    assert len(_artifact_dirs(store)) == 2
+
+
+def test_failed_publish_leaves_no_visible_artifact(store, monkeypatch):
+    art = ModelArtifact("abc123", {"a": np.arange(3), "b": np.arange(4)})
+    calls = []
+
+    def failing_save(path, arr, allow_pickle):
+        calls.append(path)
+        if len(calls) == 2:
+            raise OSError("disco cheio")
+        with open(path, "wb") as f:
+            np.lib.format.write_array(f, arr)
+
+    monkeypatch.setattr(np, "save", failing_save)
+    with pytest.raises(OSError):
+        store.save_artifact(art)
+    # só o diretório temporário (oculto) existe; quem lê não vê versão parcial
+    assert not store.artifact_path("abc123").exists()
+    assert store.load_artifact("abc123") is None and store.list_artifacts() == []
+    assert all(name.startswith(".") for name in _artifact_dirs(store))
+
+    monkeypatch.undo()
+    store.save_artifact(art)
+    np.testing.assert_array_equal(store.load_artifact("abc123").arrays["b"], np.arange(4))
+    assert [m["content_hash"] for m in store.list_artifacts()] == ["abc123"]
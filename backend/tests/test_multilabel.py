@@ -0,0 +1,98 @@
+import asyncio
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+from src.adapters.nlp.multilabel_classifier import SUBTYPES, MultiLabelEmailClassifier, train_artifact
+from src.adapters.nlp.sklearn_classifier import NB_PARAMS, TFIDF_PARAMS
+from src.adapters.persistence.local_model_store import LocalModelStore
+from src.adapters.reply.templates import TemplateReplyGenerator
+from src.adapters.runtime.stages import StageExecutor
+from src.core.entities.email import Email
+from src.core.enums.category import Category
+from src.use_cases.classify_email import ClassifyEmailInput, ClassifyEmailUseCase
+
+P, I = Category.PRODUTIVO, Category.IMPRODUTIVO
+DATA = [
+    ("Qual o status do chamado 4821?", P, "status"),
+    ("Andamento do ticket aberto ontem", P, "status"),
+    ("Esqueci minha senha e não consigo fazer login", P, "senha"),
+    ("Preciso resetar a senha de acesso", P, "senha"),
+    ("Segunda via do boleto da fatura de março", P, "fatura"),
+    ("Cobrança duplicada no pagamento", P, "fatura"),
+    ("Feliz natal a toda a equipe", I, "improdutivo"),
+    ("Obrigado pelo ótimo atendimento", I, "improdutivo"),
+    ("Feliz natal e próspero ano novo", I, "improdutivo"),
+    ("Boas festas, feliz ano novo a todos", I, "improdutivo"),
+]
+TEXTS = ["status do meu chamado", "não lembro a senha do login", "boleto da fatura", "feliz natal", "", "zzzqx"]
+
+
+@pytest.fixture(scope="module")
+def model(tmp_path_factory):
+    store = LocalModelStore(str(tmp_path_factory.mktemp("ml")))
+    art = train_artifact(DATA, content_hash="teste")
+    store.save_artifact(art)
+    return MultiLabelEmailClassifier.from_artifact(store, store.load_artifact("teste"))
+
+
+def _reference():
+    tfidf = TfidfVectorizer(**TFIDF_PARAMS)
+    X = tfidf.fit_transform([t for t, _, _ in DATA])
+    category = MultinomialNB(**NB_PARAMS).fit(X, [c.value for _, c, _ in DATA])
+    subtype = MultinomialNB(**NB_PARAMS).fit(X, [s for _, _, s in DATA])
+    Xt = tfidf.transform(TEXTS)
+    return category, category.predict_proba(Xt), subtype, subtype.predict_proba(Xt)
+
+
+def test_per_label_probabilities_match_separate_heads(model):
+    category, p_cat, subtype, p_sub = _reference()
+    preds = model.predict_batch([Email(text=t) for t in TEXTS])
+    for k, pred in enumerate(preds):
+        got_cat = [pred.probabilities[c] for c in category.classes_]
+        got_sub = [pred.probabilities[s] for s in subtype.classes_]
+        # heads empilhadas na mesma acumulação: cada cabeça bate com o seu MultinomialNB
+        np.testing.assert_array_equal(got_cat, p_cat[k])
+        np.testing.assert_array_equal(got_sub, p_sub[k])
+        assert pred[0].value == category.classes_[p_cat[k].argmax()]
+        assert pred[1] == pred.probabilities[pred[0].value]
+
+
+def test_subtype_is_the_best_compatible_with_the_category(model):
+    preds = model.predict_batch([Email(text=t) for t in TEXTS])
+    assert [(p[0], p.subtype) for p in preds[:4]] == [(P, "status"), (P, "senha"), (P, "fatura"), (I, "improdutivo")]
+    for pred in preds:
+        assert pred.subtype in SUBTYPES[pred[0]]
+        allowed = {s: pred.probabilities[s] for s in SUBTYPES[pred[0]] if s in pred.probabilities}
+        assert pred.probabilities[pred.subtype] == max(allowed.values())  # empates: qualquer um
+
+
+def test_predict_matches_batch(model):
+    batch = model.predict_batch([Email(text=t) for t in TEXTS])
+    for text, pred in zip(TEXTS, batch):
+        single = model.predict(Email(text=text))
+        assert single == pred and single.subtype == pred.subtype and single.probabilities == pred.probabilities
+
+
+class SingleLabel:
+    def predict_batch(self, emails):
+        return [(P, 0.9) for _ in emails]
+
+
+def _execute(classifier, text):
+    uc = ClassifyEmailUseCase(classifier, TemplateReplyGenerator(), StageExecutor())
+    return asyncio.run(uc.execute(ClassifyEmailInput(text=text)))
+
+
+def test_use_case_takes_subtype_from_multilabel_prediction(model):
+    # nenhuma palavra-chave de subtipo no texto: a varredura daria "geral", o modelo sabe que é fatura
+    out = _execute(model, "duplicada em março")
+    assert (out.category, out.subtype) == (P.value, "fatura")
+
+
+def test_single_label_path_still_uses_keyword_subtype():
+    out = _execute(SingleLabel(), "Segue o anexo com o documento pedido")
+    assert (out.category, out.subtype, out.classify_source) == (P.value, "anexo", "SingleLabel")
+    assert out.suggested_reply == TemplateReplyGenerator().generate_subtype("anexo", "")
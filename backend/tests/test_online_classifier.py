@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.adapters.nlp.online_classifier import OnlineEmailClassifier
+from src.adapters.persistence.local_model_store import LocalModelStore
+from src.adapters.runtime.stages import StageExecutor
+from src.core.enums.category import Category
+from src.config.settings import settings
+from src.core.entities.email import Email
+from src.core.protocols.model_store import ModelStoreError
+from src.interfaces.api.routes.email_routes import router
+
+EXAMPLES = [("Preciso do status do chamado 4821", Category.PRODUTIVO)]
+
+
+class FlakyStore(LocalModelStore):
+    fail = False
+
+    def save_pointer(self, name: str, data: dict) -> None:
+        if self.fail:
+            raise OSError("disco cheio")
+        super().save_pointer(name, data)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FlakyStore(str(tmp_path))
+
+
+def test_learn_publishes_new_version(store):
+    clf = OnlineEmailClassifier(store, n_features=2 ** 12)
+    before = clf.version
+    version = clf.learn(EXAMPLES)
+    assert version != before and clf.version == version
+    assert store.load_pointer("online-head")["head"] == version
+
+
+def test_failed_persist_raises_and_keeps_serving_snapshot(store):
+    clf = OnlineEmailClassifier(store, n_features=2 ** 12)
+    before, samples = clf.version, clf.n_samples
+    store.fail = True
+    with pytest.raises(ModelStoreError):
+        clf.learn(EXAMPLES)
+    assert (clf.version, clf.n_samples, clf.updates) == (before, samples, 0)
+
+
+def test_other_worker_adopts_new_version(store):
+    a = OnlineEmailClassifier(store, n_features=2 ** 12)
+    b = OnlineEmailClassifier(store, n_features=2 ** 12)
+    version = a.learn(EXAMPLES)
+    b.sync(force=True, wait=True)
+    assert b.version == version and b.syncs == 1
+    # aprender em b parte da versão de a, não do snapshot antigo
+    assert b.learn(EXAMPLES) != version and b.n_samples == a.n_samples + 1
+
+
+def test_sync_loads_off_the_prediction_path(store, monkeypatch):
+    a = OnlineEmailClassifier(store, n_features=2 ** 12)
+    b = OnlineEmailClassifier(store, n_features=2 ** 12)
+    before = b.version
+    version = a.learn(EXAMPLES)
+
+    release = threading.Event()
+    load = b._load
+
+    def slow_load(content_hash):
+        release.wait(5)
+        return load(content_hash)
+
+    monkeypatch.setattr(b, "_load", slow_load)
+    monkeypatch.setattr(settings, "ONLINE_SYNC_SECONDS", 0)
+    emails = [Email(text="status do chamado")]
+    start = time.monotonic()
+    b.predict_batch(emails)
+    b.predict_batch(emails)  # carga em andamento: não dispara outra
+    assert time.monotonic() - start < 1 and b.version == before
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while b.version != version:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert b.syncs == 1
+
+
+@pytest.fixture
+def feedback(store, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "segredo")
+    clf = OnlineEmailClassifier(store, n_features=2 ** 12)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.state.uc = SimpleNamespace(classifier=clf, stages=StageExecutor())
+    body = {"text": "Preciso do status do chamado 4821", "category": "Produtivo"}
+
+    def post(token: str | None = "segredo"):
+        headers = {"X-Admin-Token": token} if token is not None else {}
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                return await client.post("/api/feedback", json=body, headers=headers)
+        return asyncio.run(run())
+
+    return clf, post
+
+
+def test_feedback_requires_admin_token(feedback, monkeypatch):
+    clf, post = feedback
+    assert post(None).status_code == 401
+    assert post("errado").status_code == 401
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", None)
+    assert post().status_code == 404
+    assert clf.updates == 0
+
+
+def test_feedback_route_returns_503_when_model_is_not_saved(store, feedback):
+    clf, post = feedback
+    store.fail = True
+    r = post()
+    assert r.status_code == 503
+    assert clf.updates == 0
+
+    store.fail = False
+    r = post()
+    assert r.status_code == 200 and r.json()["version"] == clf.version
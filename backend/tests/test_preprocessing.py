@@ -0,0 +1,35 @@
+import re
+
+import pytest
+
+from benchmarks.corpus import EDGE_CASES, SENTENCES, make_corpus
+from src.adapters.nlp.preprocessing import preprocess, tokenize
+
+# token_pattern padrão do TfidfVectorizer, aplicado ao texto já pré-processado
+SKLEARN_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+
+def legacy_tokenize(text: str) -> list[str]:
+    return SKLEARN_TOKEN_RE.findall(preprocess(text))
+
+
+@pytest.mark.parametrize("text", EDGE_CASES + SENTENCES)
+def test_tokenize_matches_preprocess_and_token_pattern(text):
+    assert tokenize(text) == legacy_tokenize(text)
+
+
+def test_tokenize_matches_on_generated_corpus():
+    for text in make_corpus(200, 5) + make_corpus(3, 400, seed=7):
+        assert tokenize(text) == legacy_tokenize(text)
+
+
+@pytest.mark.parametrize("text", [
+    "http://a.com/x?y=1 depois",
+    "antes www.site.com.br/abc",
+    "SENHA!!!bloqueada...hoje",
+    "R$ 1.234,56 em 10/04/2025",
+    "não—consigo…acessar",
+    "  espaços​estranhos",
+])
+def test_tokenize_matches_on_tricky_separators(text):
+    assert tokenize(text) == legacy_tokenize(text)
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.adapters.nlp.prompt_compression import GAP, PromptCompressor, strip_quoted
+from src.adapters.reply.llm_reply import LLMReplyGenerator
+from src.adapters.runtime.stages import StageExecutor
+
+
+@pytest.mark.parametrize("text", [
+    "Olá\nDe: 10/03 até hoje estou sem acesso ao aplicativo do banco.",
+    "Bom dia,\nEm março meu gerente escreveu\nque a fatura viria corrigida, mas não veio.",
+    "Oi,\nDe: hoje em diante quero receber o extrato por email.\nObrigado pela ajuda com o cadastro.",
+    "Prezados,\nOn the other hand, nothing was said about it.",
+])
+def test_body_lines_that_look_like_headers_are_kept(text):
+    body, history, _ = strip_quoted(text)
+    assert not history
+    assert body == text
+
+
+@pytest.mark.parametrize("header", [
+    "Em seg., 12 de mai. de 2025 às 10:00, Suporte <suporte@exemplo.com> escreveu:",
+    "Em 10/03/2025 14:32, fulano@exemplo.com escreveu:",
+    "On Mon, Mar 10, 2025 at 2:32 PM John <john@example.com> wrote:",
+    "-----Mensagem original-----",
+    "---------- Forwarded message ---------",
+    "De: Fulano <fulano@exemplo.com>\nEnviado: segunda-feira, 10 de março de 2025 14:32\nPara: suporte",
+    "From: John <john@example.com>\n\nSubject: Re: fatura",
+])
+def test_real_reply_headers_start_history(header):
+    body, history, _ = strip_quoted(f"Segue o pedido.\n\n{header}\n> mensagem antiga\nmais histórico")
+    assert history
+    assert body.strip() == "Segue o pedido."
+
+
+def test_reviewer_cases_keep_the_request():
+    c = PromptCompressor()
+    assert "sem acesso" in c.compress("Olá\nDe: 10/03 até hoje estou sem acesso…", 300)
+    assert "fatura" in c.compress("Bom dia,\nEm março meu gerente escreveu\nque a fatura…", 300)
+
+
+def test_input_is_capped_before_processing():
+    c = PromptCompressor(max_chars=1000)
+    text = "Preciso do boleto atualizado. " * 30_000
+    out = c.compress(text, 50)
+    assert len(out) <= 50 * 4
+    stats = c.stats()
+    assert stats["chars_in"] == len(text)  # a razão reflete o texto recebido
+
+
+def test_ranked_output_marks_gaps_and_keeps_order():
+    c = PromptCompressor()
+    text = " ".join(f"Frase número {i} sobre assuntos diversos." for i in range(60))
+    out = c.compress(text + " Qual o status do chamado 4821?", 40)
+    assert len(out) <= 160 and GAP in out
+
+
+class FakeModel:
+    def __init__(self, idf):
+        self.vocabulary = {"boleto": 0, "status": 1}
+        self.idf = idf
+
+
+class FakeClassifier:
+    def __init__(self, idf):
+        self.compiled = FakeModel(idf)
+
+
+class CountingIdf(list):
+    iterations = 0
+
+    def __iter__(self):
+        CountingIdf.iterations += 1
+        return super().__iter__()
+
+
+def test_unknown_term_weight_is_computed_once_per_model():
+    idf = CountingIdf([3.0, 5.0])
+    classifier = FakeClassifier(idf)
+    c = PromptCompressor(classifier)
+    for _ in range(5):
+        c._weights(["boleto atrasado", "status do pedido"])
+    assert CountingIdf.iterations == 1
+    # troca de modelo: novo idf, novo peso
+    classifier.compiled = FakeModel([1.0, 2.0])
+    c._weights(["boleto atrasado"])
+    assert c._unknown[1] == 0.5
+
+
+class ThreadRecordingCompressor(PromptCompressor):
+    threads: list[str] = []
+
+    def compress(self, text, max_tokens):
+        self.threads.append(threading.current_thread().name)
+        return super().compress(text, max_tokens)
+
+
+class EchoClient:
+    max_concurrency = 1
+    timeout = 5.0
+
+    def __init__(self):
+        self.prompts = []
+
+    async def complete(self, prompt, timeout=None):
+        self.prompts.append(prompt)
+        return '{"category": "Produtivo", "confidence": 0.9}'
+
+
+def test_async_paths_compress_off_the_event_loop():
+    compressor = ThreadRecordingCompressor()
+    client = EchoClient()
+    gen = LLMReplyGenerator(client, compressor=compressor, stages=StageExecutor())
+
+    async def run():
+        await gen.aclassify("Qual o status do chamado?")
+        await gen.agenerate("Produtivo", "Qual o status do chamado?")
+        return threading.current_thread().name
+
+    loop_thread = asyncio.run(run())
+    assert len(compressor.threads) == 2
+    assert all(name != loop_thread for name in compressor.threads)
+    assert all("status do chamado" in p for p in client.prompts)
@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.adapters.runtime.rate_limit import TokenBucketLimiter
+from src.interfaces.api.middleware import RateLimitMiddleware
+
+
+def _scope(xff: str | None = None, client: str = "10.0.0.1") -> dict:
+    headers = [(b"x-forwarded-for", xff.encode())] if xff is not None else []
+    return {"type": "http", "path": "/api/x", "headers": headers, "client": (client, 1234)}
+
+
+def _middleware(trusted_hops: int = 1, key_header: str | None = "X-Forwarded-For") -> RateLimitMiddleware:
+    return RateLimitMiddleware(None, TokenBucketLimiter(), key_header=key_header, trusted_hops=trusted_hops)
+
+
+@pytest.mark.parametrize("xff, hops, expected", [
+    ("203.0.113.7", 1, "203.0.113.7"),
+    # o cliente forja a entrada da esquerda; o proxy acrescenta o endereço real à direita
+    ("1.2.3.4, 203.0.113.7", 1, "203.0.113.7"),
+    ("1.2.3.4, 203.0.113.7, 10.1.0.5", 2, "203.0.113.7"),
+    ("203.0.113.7", 3, "203.0.113.7"),
+])
+def test_client_key_uses_entry_written_by_trusted_proxy(xff, hops, expected):
+    assert _middleware(hops)._client_key(_scope(xff)) == expected
+
+
+def test_client_key_falls_back_to_connection_address():
+    assert _middleware()._client_key(_scope()) == "10.0.0.1"
+    assert _middleware(key_header=None)._client_key(_scope("1.2.3.4")) == "10.0.0.1"
+
+
+def test_spoofed_entries_do_not_escape_the_limit():
+    app = FastAPI()
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(
+        RateLimitMiddleware, limiter=TokenBucketLimiter(rate=0.001, burst=2), key_header="X-Forwarded-For"
+    )
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return [
+                (await client.get("/api/ping", headers={"X-Forwarded-For": f"9.9.9.{i}, 203.0.113.7"})).status_code
+                for i in range(3)
+            ]
+
+    assert asyncio.run(run()) == [200, 200, 429]
@@ -0,0 +1,84 @@
+import asyncio
+
+from src.adapters.reply.cache import CachedReplyGenerator, LRUTTLCache, SqliteReplyCache, reply_cache_key
+from src.adapters.reply.client import ProviderError
+from src.adapters.reply.llm_reply import FALLBACK_SOURCE, FallbackReplyGenerator
+
+
+class CountingGenerator:
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, category: str, original_text: str) -> str:
+        self.calls += 1
+        return f"resposta {self.calls} para {original_text}"
+
+    async def agenerate(self, category: str, original_text: str) -> str:
+        return self.generate(category, original_text)
+
+
+def test_key_keeps_negation_and_stopwords():
+    assert reply_cache_key("Produtivo", "Não consigo acessar minha conta") != reply_cache_key(
+        "Produtivo", "Consigo acessar minha conta"
+    )
+    assert reply_cache_key("Produtivo", "o boleto") != reply_cache_key("Produtivo", "boleto")
+
+
+def test_key_ignores_case_and_whitespace_only():
+    assert reply_cache_key("Produtivo", "Não  consigo\nACESSAR") == reply_cache_key("Produtivo", " não consigo acessar ")
+    assert reply_cache_key("Produtivo", "x") != reply_cache_key("Improdutivo", "x")
+
+
+def test_negated_email_is_not_served_the_opposite_reply():
+    inner = CountingGenerator()
+    gen = CachedReplyGenerator(inner, memory=LRUTTLCache(16, 60))
+    a = asyncio.run(gen.agenerate("Produtivo", "Não consigo acessar minha conta"))
+    b = asyncio.run(gen.agenerate("Produtivo", "Consigo acessar minha conta"))
+    assert a != b and inner.calls == 2
+
+
+def test_sqlite_cache_is_bounded(tmp_path):
+    disk = SqliteReplyCache(str(tmp_path / "replies.db"), ttl_seconds=60, max_rows=10, prune_every=5)
+    for i in range(50):
+        disk.set(f"k{i}", f"v{i}")
+    (rows,) = disk._conn().execute("SELECT COUNT(*) FROM replies").fetchone()
+    assert rows <= 10 + disk.prune_every
+    assert disk.get("k49") == "v49"
+    assert disk.get("k0") is None
+
+
+def test_sqlite_cache_prunes_expired(tmp_path):
+    disk = SqliteReplyCache(str(tmp_path / "replies.db"), ttl_seconds=-1, max_rows=100)
+    disk.set("k", "v")
+    assert disk.get("k") is None
+    assert disk.prune() == 1
+
+
+def test_sqlite_cache_reconnects_after_fork(tmp_path, monkeypatch):
+    disk = SqliteReplyCache(str(tmp_path / "replies.db"), ttl_seconds=60)
+    disk.set("k", "v")
+    inherited = disk._conn()
+    # o worker herda o objeto do master (preload) mas roda com outro pid
+    monkeypatch.setattr("src.adapters.reply.cache.os.getpid", lambda: -1)
+    assert disk._conn() is not inherited
+    assert disk.get("k") == "v"
+
+
+class SourcedGenerator(CountingGenerator):
+    source = "llm:stub"
+    fail = False
+
+    def generate(self, category: str, original_text: str) -> str:
+        if self.fail:
+            raise ProviderError("provedor fora")
+        return super().generate(category, original_text)
+
+
+def test_reply_source_names_the_generator_that_answered():
+    inner = SourcedGenerator()
+    gen = FallbackReplyGenerator(CachedReplyGenerator(inner))
+    assert asyncio.run(gen.agenerate_sourced("Produtivo", "status do chamado"))[1] == "llm:stub"
+    # do cache: a resposta ainda é a que o LLM gerou
+    assert gen.generate_sourced("Produtivo", "status do chamado")[1] == "llm:stub"
+    inner.fail = True
+    assert gen.generate_sourced("Produtivo", "outro email")[1] == FALLBACK_SOURCE
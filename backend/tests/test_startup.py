@@ -0,0 +1,15 @@
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def test_app_import_does_not_pull_heavy_dependencies():
+    # o modelo carrega depois do /health; importar o app não pode custar o sklearn
+    code = (
+        "import sys, src.interfaces.api.app_factory; "
+        "print(sorted({m.split('.')[0] for m in sys.modules} & {'sklearn', 'scipy', 'pypdf'}))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"